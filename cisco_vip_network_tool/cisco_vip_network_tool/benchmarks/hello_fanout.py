@@ -0,0 +1,65 @@
+"""HELLO fan-out scaling: one hello round over N devices, edge scan vs per-device port table.
+
+Run from the repository root: PYTHONPATH=. python cisco_vip_network_tool/benchmarks/hello_fanout.py
+"""
+import sys
+import time
+from cisco_vip_network_tool.src.model.devices import Device, Interface
+from cisco_vip_network_tool.src.model.link import Link
+from cisco_vip_network_tool.src.topology.builder import Topology
+from cisco_vip_network_tool.src.simulation.node import Node
+
+class NullBroker:
+    def __init__(self):
+        self.sent = 0
+
+    def register(self, key):
+        pass
+
+    def send(self, dst, msg):
+        self.sent += 1
+
+def ring_topology(n: int) -> Topology:
+    """n routers in a ring, each with two point-to-point links."""
+    topo = Topology()
+    for i in range(n):
+        dev = Device(hostname=f'R{i}', type='router')
+        dev.interfaces = {f'Gi0/{j}': Interface(name=f'Gi0/{j}', mtu=1500) for j in range(2)}
+        topo.devices[dev.hostname] = dev
+        topo.add_device(dev)
+    for i in range(n):
+        topo.add_link(Link(f'R{i}', 'Gi0/1', f'R{(i + 1) % n}', 'Gi0/0', 1_000_000, 1.0, 1500, True))
+    return topo
+
+def legacy_send_hello(node: Node):
+    """The pre-index fan-out: scan every edge of the graph for this device's interfaces."""
+    host = node.device.hostname
+    for (a, b, data) in node.topo.graph.edges(data=True):
+        if not data.get('up', True):
+            continue
+        if a[0] == host:
+            node.broker.send(b, {'type': 'HELLO', 'from': {'dev': host, 'if': a[1]}})
+        elif b[0] == host:
+            node.broker.send(a, {'type': 'HELLO', 'from': {'dev': host, 'if': b[1]}})
+
+def hello_round(topo: Topology, fn) -> float:
+    broker = NullBroker()
+    nodes = [Node(dev, topo, broker) for dev in topo.devices.values()]
+    t0 = time.perf_counter()
+    for node in nodes:
+        fn(node)
+    elapsed = time.perf_counter() - t0
+    assert broker.sent == 2 * topo.graph.number_of_edges()
+    return elapsed
+
+def main(sizes):
+    print(f"{'devices':>8} {'edge-scan s':>12} {'port-table s':>13} {'speedup':>8}")
+    for n in sizes:
+        topo = ring_topology(n)
+        topo.ports('R0')  # build the table outside the timed round
+        legacy = hello_round(topo, legacy_send_hello) if n <= 2000 else float('nan')
+        indexed = hello_round(topo, lambda node: node._send_hello())
+        print(f"{n:>8} {legacy:>12.4f} {indexed:>13.4f} {legacy / indexed:>8.1f}")
+
+if __name__ == '__main__':
+    main([int(a) for a in sys.argv[1:]] or [250, 500, 1000, 2000, 4000, 16000])
@@ -0,0 +1,215 @@
+"""Time and memory-profile every pipeline stage on synthetic inventories of several sizes.
+
+    PYTHONPATH=. python cisco_vip_network_tool/benchmarks/run.py --sizes tiny,small
+    PYTHONPATH=. python cisco_vip_network_tool/benchmarks/run.py --sizes small --compare OLD.json
+
+Each size is generated with synth.generate(), then the stages run in order twice: once for
+wall/CPU time and once under tracemalloc for peak memory (tracemalloc slows Python down, so the
+timings come from the first pass). Results go to a JSON file named after the time and commit.
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from cisco_vip_network_tool.src.parsers.endpoints import load_endpoints
+from cisco_vip_network_tool.src.parsers.cisco_parser import parse_config
+from cisco_vip_network_tool.src.topology.builder import build_from_devices
+from cisco_vip_network_tool.src.validation.validators import config_issues_report
+from cisco_vip_network_tool.src.load.load_manager import compute_link_loads
+from cisco_vip_network_tool.src.simulation.node import run_day1_simulation
+from cisco_vip_network_tool.src.simulation.des import run_des_simulation
+from cisco_vip_network_tool.src.simulation.dataplane import run_dataplane
+from cisco_vip_network_tool.src.control.ospf import OspfDomain
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from synth import generate  # noqa: E402
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SIZES = {
+    'tiny': dict(routers=4, switches=8, links_per_device=3, vlans=8, endpoints=100),
+    'small': dict(routers=20, switches=80, links_per_device=4, vlans=40, endpoints=2000),
+    'medium': dict(routers=100, switches=400, links_per_device=4, vlans=200, endpoints=20000),
+    'large': dict(routers=500, switches=2000, links_per_device=4, vlans=1000, endpoints=100000),
+}
+MAX_THREAD_DEVICES = 600   # run_day1_simulation starts one OS thread per device
+NOISE_FLOOR = {'wall_s': 0.01, 'peak_mb': 1.0}   # below these, ratios are timer/allocator noise
+
+def stage_parse(ctx: Dict) -> Dict:
+    devices = {}
+    for path in sorted(glob.glob(os.path.join(ctx['dir'], '*.config.dump'))):
+        with open(path) as fh:
+            dev = parse_config(fh.read())
+        devices[dev.hostname] = dev
+    ctx['devices'] = devices
+    return {'devices': len(devices), 'interfaces': sum(len(d.interfaces) for d in devices.values())}
+
+def stage_build(ctx: Dict) -> Dict:
+    ctx['topo'] = build_from_devices(ctx['devices'])
+    return {'links': ctx['topo'].graph.number_of_edges()}
+
+def stage_validate(ctx: Dict) -> Dict:
+    report = config_issues_report(ctx['devices'], ctx['topo'])
+    return {k: len(v) for k, v in report.items()}
+
+def stage_endpoints(ctx: Dict) -> Dict:
+    ctx['endpoints'] = load_endpoints(ctx['dir'])
+    return {'endpoints': len(ctx['endpoints'])}
+
+def stage_load(ctx: Dict) -> Dict:
+    loads = compute_link_loads(ctx['topo'], ctx['endpoints'], peak=True)
+    return {'loaded_edges': len(loads)}
+
+def stage_simulate(ctx: Dict) -> Dict:
+    if len(ctx['devices']) > MAX_THREAD_DEVICES:
+        return {'skipped': f'more than {MAX_THREAD_DEVICES} devices'}
+    stats = run_day1_simulation(ctx['devices'], ctx['topo'], duration_s=ctx['sim_duration'])
+    return {'messages': sum(s['sent'] for s in stats.values())}
+
+def stage_simulate_des(ctx: Dict) -> Dict:
+    stats = run_des_simulation(ctx['devices'], ctx['topo'], duration_s=ctx['sim_duration'])
+    return {'messages': sum(s['sent'] for s in stats.values())}
+
+def stage_dataplane(ctx: Dict) -> Dict:
+    _, summary = run_dataplane(ctx['topo'], ctx['endpoints'], packets=1_000_000)
+    return {k: summary[k] for k in ('packets_per_sec', 'delivered', 'fragmented')}
+
+def stage_ospf(ctx: Dict) -> Dict:
+    dom = ctx['ospf'] = OspfDomain(ctx['topo'])
+    return {'trees': dom.compute_all(), 'adjacencies': dom.adjacency_count()}
+
+def stage_ospf_fault(ctx: Dict) -> Dict:
+    """Incremental SPF after one adjacency goes down (it is restored afterwards)."""
+    dom = ctx.get('ospf') or OspfDomain(ctx['topo'])
+    links = [k for a in dom.areas.values() for m in a.members.values() for k in m]
+    if not links:
+        return {'skipped': 'no OSPF adjacencies'}
+    link = links[len(links) // 2]
+    ctx['topo'].set_link_state(*link, up=False)
+    stats = dom.sync()
+    ctx['topo'].set_link_state(*link, up=True)
+    dom.sync()
+    return {k: stats[k] for k in ('trees_updated', 'trees_untouched', 'resettled')}
+
+STAGES: Dict[str, Callable[[Dict], Dict]] = {
+    'parse': stage_parse,
+    'build': stage_build,
+    'validate': stage_validate,
+    'endpoints': stage_endpoints,
+    'load': stage_load,
+    'simulate': stage_simulate,
+    'simulate_des': stage_simulate_des,
+    'dataplane': stage_dataplane,
+    'ospf': stage_ospf,
+    'ospf_fault': stage_ospf_fault,
+}
+
+def run_pipeline(conf_dir: str, stages: List[str], sim_duration: float, memory: bool) -> Dict[str, Dict]:
+    """Run stages in order on fresh state; returns stage -> metrics."""
+    ctx = {'dir': conf_dir, 'sim_duration': sim_duration}
+    out = {}
+    if memory:
+        tracemalloc.start()
+    try:
+        for name in stages:
+            if memory:
+                tracemalloc.reset_peak()
+                base = tracemalloc.get_traced_memory()[0]
+            w0, c0 = time.perf_counter(), time.process_time()
+            info = STAGES[name](ctx)
+            m = {'wall_s': round(time.perf_counter() - w0, 4), 'cpu_s': round(time.process_time() - c0, 4)}
+            if memory:
+                cur, peak = tracemalloc.get_traced_memory()
+                m = {'peak_mb': round((peak - base) / 2 ** 20, 2), 'retained_mb': round((cur - base) / 2 ** 20, 2)}
+            m.update(info)
+            out[name] = m
+    finally:
+        if memory:
+            tracemalloc.stop()
+    return out
+
+def bench_size(name: str, params: Dict, stages: List[str], sim_duration: float, memory: bool,
+               repeat: int, workdir: str) -> Dict:
+    conf_dir = os.path.join(workdir, name)
+    info = generate(conf_dir, **params)
+    timed = [run_pipeline(conf_dir, stages, sim_duration, memory=False) for _ in range(repeat)]
+    result = {}
+    for stage in stages:
+        best = min(timed, key=lambda r: r[stage]['wall_s'])[stage]
+        result[stage] = dict(best)
+    if memory:
+        for stage, m in run_pipeline(conf_dir, stages, sim_duration, memory=True).items():
+            result[stage]['peak_mb'] = m['peak_mb']
+            result[stage]['retained_mb'] = m['retained_mb']
+    return {'size': name, 'params': info, 'stages': result}
+
+def _commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return 'unknown'
+
+def compare(old: Dict, new: Dict, threshold: float) -> List[str]:
+    """Lines describing per-stage wall time and peak memory ratios (new / old)."""
+    prev = {(r['size'], s): m for r in old['results'] for s, m in r['stages'].items()}
+    lines = []
+    for r in new['results']:
+        for stage, m in r['stages'].items():
+            o = prev.get((r['size'], stage))
+            if not o:
+                continue
+            for key in ('wall_s', 'peak_mb'):
+                if o.get(key) and m.get(key) is not None:
+                    ratio = m[key] / o[key]
+                    flag = '  REGRESSION' if ratio > threshold and m[key] >= NOISE_FLOOR[key] else ''
+                    lines.append(f"{r['size']:>8} {stage:>13} {key:>8} {o[key]:>10} -> {m[key]:>10} x{ratio:.2f}{flag}")
+    return lines
+
+def main():
+    ap = argparse.ArgumentParser(description='Benchmark every pipeline stage on synthetic inventories')
+    ap.add_argument('--sizes', default='tiny,small', help=f"Comma list of {', '.join(SIZES)}")
+    ap.add_argument('--stages', default=','.join(STAGES), help='Comma list of stages to run (in pipeline order)')
+    ap.add_argument('--sim-duration', type=float, default=2.0)
+    ap.add_argument('--repeat', type=int, default=1, help='Timing passes per size; the fastest is kept')
+    ap.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc pass')
+    ap.add_argument('--out', default=None, help='Results JSON (default benchmarks/results/<time>_<commit>.json)')
+    ap.add_argument('--workdir', default=None, help='Where to generate inventories (default: temp dir)')
+    ap.add_argument('--compare', default=None, help='Previous results JSON to compare against')
+    ap.add_argument('--threshold', type=float, default=1.2, help='Ratio above which a stage is flagged')
+    args = ap.parse_args()
+
+    stages = [s for s in STAGES if s in args.stages.split(',')]
+    commit = _commit()
+    doc = {'meta': {'commit': commit, 'python': platform.python_version(), 'platform': platform.platform(),
+                    'cpus': os.cpu_count(), 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                    'sim_duration': args.sim_duration},
+           'results': []}
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = args.workdir or tmp
+        for size in args.sizes.split(','):
+            res = bench_size(size, SIZES[size], stages, args.sim_duration, not args.no_memory, args.repeat, workdir)
+            doc['results'].append(res)
+            for stage, m in res['stages'].items():
+                mem = f"{m['peak_mb']:>9.1f} MB" if 'peak_mb' in m else ''
+                print(f"[bench] {size:>8} {stage:>13} {m['wall_s']:>9.3f}s wall {m['cpu_s']:>9.3f}s cpu{mem}", flush=True)
+
+    out = args.out or os.path.join(HERE, 'results', time.strftime('%Y%m%dT%H%M%S', time.gmtime()) + f'_{commit}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w') as fh:
+        json.dump(doc, fh, indent=2)
+    print('[bench] wrote', out)
+    if args.compare:
+        with open(args.compare) as fh:
+            for line in compare(json.load(fh), doc, args.threshold):
+                print('[bench]', line)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Measure CLI startup: wall time of short commands in fresh interpreters and what they import.
+
+    PYTHONPATH=. python cisco_vip_network_tool/benchmarks/startup.py --repeat 5
+
+Each command runs in its own `python -X importtime` process; the fastest of --repeat runs is
+kept, with the number of modules imported and whether the heavy ones (matplotlib, networkx,
+NumPy, yaml) were loaded.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CLI = os.path.join(os.path.dirname(HERE), 'src', 'cli.py')
+SAMPLE = os.path.join(os.path.dirname(HERE), 'configs', 'sample')
+HEAVY = ('matplotlib', 'networkx', 'numpy', 'yaml')
+COMMANDS = {
+    'help': ['--help'],
+    'topology': ['topology', '--configs', '{configs}'],
+    'validate': ['validate', '--configs', '{configs}', '--report', os.devnull],
+    'load': ['load', '--configs', '{configs}', '--report', os.devnull],
+    'viz-html': ['viz', '--configs', '{configs}', '--viz-format', 'html', '--viz-out', '{tmp}/t.html',
+                 '--viz-layout-cache', ''],
+    'legacy-all': ['--configs', '{configs}', '--build-topology', '--validate', '--analyze-load', '--viz',
+                   '--viz-out', '{tmp}/t.png', '--report', os.devnull],
+}
+
+def run_once(argv: List[str], env: Dict[str, str]) -> Dict:
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-X', 'importtime', CLI] + argv, env=env,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    wall = time.perf_counter() - t0
+    mods = [line.rsplit('|', 1)[-1].strip() for line in proc.stderr.splitlines() if line.startswith('import time:')]
+    return {'wall_s': round(wall, 3), 'modules': len(mods), 'returncode': proc.returncode,
+            'heavy': [h for h in HEAVY if h in mods]}
+
+def main():
+    ap = argparse.ArgumentParser(description='Benchmark CLI startup per command')
+    ap.add_argument('--configs', default=SAMPLE)
+    ap.add_argument('--commands', default=','.join(COMMANDS), help=f"Comma list of {', '.join(COMMANDS)}")
+    ap.add_argument('--repeat', type=int, default=3)
+    ap.add_argument('--out', default=None, help='Write results as JSON')
+    args = ap.parse_args()
+
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [os.path.dirname(os.path.dirname(HERE)), env.get('PYTHONPATH')]))
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in args.commands.split(','):
+            argv = [a.format(configs=args.configs, tmp=tmp) for a in COMMANDS[name]]
+            runs = [run_once(argv, env) for _ in range(args.repeat)]
+            best = min(runs, key=lambda r: r['wall_s'])
+            results[name] = best
+            print(f"[startup] {name:>10} {best['wall_s']:>7.3f}s {best['modules']:>5} modules "
+                  f"heavy={','.join(best['heavy']) or '-'}{'' if best['returncode'] == 0 else '  FAILED'}", flush=True)
+    if args.out:
+        with open(args.out, 'w') as fh:
+            json.dump({'python': sys.version.split()[0], 'results': results}, fh, indent=2)
+        print('[startup] wrote', args.out)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""Synthetic Cisco-style inventory generator for benchmarks and scale tests.
+
+Writes <hostname>.config.dump files and endpoints.yaml in the layout of configs/sample:
+routers form a ring plus random chords (point-to-point /30s, OSPF area 0, one SVI gateway per
+VLAN), switches are dual-homed to routers and carry the access ports of their VLANs.
+
+    PYTHONPATH=. python cisco_vip_network_tool/benchmarks/synth.py OUT_DIR --routers 20 --switches 80
+"""
+import argparse
+import ipaddress
+import json
+import os
+import random
+from typing import Dict, List
+
+APPS = ['HTTP', 'VoIP', 'Video', 'DB']
+P2P_BASE = int(ipaddress.IPv4Address('172.16.0.0'))
+
+class _Dev:
+    def __init__(self, hostname: str, router: bool):
+        self.hostname = hostname
+        self.router = router
+        self.ports = 0
+        self.access = 0
+        self.blocks: List[str] = []
+        self.vlans: List[int] = []
+        self.ospf: List[str] = []
+
+    def next_port(self) -> int:
+        self.ports += 1
+        return self.ports - 1
+
+    def render(self) -> str:
+        out = [f"hostname {self.hostname}", "!"]
+        for v in self.vlans:
+            out += [f"vlan {v}", f" name VLAN{v}_Users", "!"]
+        out += self.blocks
+        if self.ospf:
+            out.append("router ospf 1")
+            out += [f" network {n} area 0" for n in self.ospf]
+            out.append("!")
+        return "\n".join(out) + "\n"
+
+def _wildcard(prefix: int) -> str:
+    return str(ipaddress.IPv4Address((1 << (32 - prefix)) - 1))
+
+def _mask(prefix: int) -> str:
+    return str(ipaddress.IPv4Network(f"0.0.0.0/{prefix}").netmask)
+
+def _vlan_net(v: int) -> str:
+    """10.x.y.0/24 block of VLAN v (VLAN ids start at 10)."""
+    k = v - 10
+    return f"10.{100 + k // 256}.{k % 256}"
+
+def generate(out_dir: str, routers: int = 4, switches: int = 8, links_per_device: int = 3, vlans: int = 8,
+             endpoints: int = 100, mtu_mismatch: float = 0.02, seed: int = 1, endpoint_format: str = 'yaml') -> Dict:
+    """Write a synthetic inventory to out_dir and return its parameters plus counts.
+
+    endpoint_format picks endpoints.yaml, endpoints.csv or endpoints.jsonl.
+    """
+    rnd = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    rs = [_Dev(f"R{i + 1}", True) for i in range(routers)]
+    sws = [_Dev(f"SW{i + 1}", False) for i in range(switches)]
+    links = 0
+
+    def link(a: _Dev, b: _Dev, bw: int):
+        nonlocal links
+        pa, pb = a.next_port(), b.next_port()
+        tag = f"LINK:{a.hostname}:Gi0/{pa}-{b.hostname}:Gi0/{pb}"
+        base = P2P_BASE + 4 * links
+        net = str(ipaddress.IPv4Address(base))
+        for dev, port, host in ((a, pa, base + 1), (b, pb, base + 2)):
+            mtu = 1400 if rnd.random() < mtu_mismatch else 1500
+            lines = [f"interface GigabitEthernet0/{port}", f" description {tag}"]
+            if dev.router:
+                lines.append(f" ip address {ipaddress.IPv4Address(host)} {_mask(30)}")
+                dev.ospf.append(f"{net} {_wildcard(30)}")
+            lines += [f" mtu {mtu}", f" bandwidth {bw}", "!"]
+            dev.blocks += lines
+        links += 1
+
+    # Backbone: ring, then random chords up to links_per_device per router
+    if routers > 1:
+        for i in range(routers if routers > 2 else 1):
+            link(rs[i], rs[(i + 1) % routers], 1000000)
+        want = max(0, routers * (links_per_device - 2) // 2)
+        seen = set()
+        for _ in range(want * 4):
+            if want <= 0:
+                break
+            a, b = rnd.sample(range(routers), 2)
+            key = (min(a, b), max(a, b))
+            if key in seen or abs(a - b) in (1, routers - 1):
+                continue
+            seen.add(key)
+            link(rs[a], rs[b], 1000000)
+            want -= 1
+    # Access layer: every switch dual-homed (when possible) to routers
+    for i, sw in enumerate(sws):
+        for r in (sorted({i % routers, (i + 1) % routers}) if routers else ()):
+            link(sw, rs[r], 100000)
+    # VLANs: gateway SVI on one router, access ports on one switch
+    for k in range(vlans):
+        v = 10 + k
+        gw = rs[k % routers] if routers else None
+        if gw is not None:
+            gw.blocks += [f"interface Vlan{v}", f" ip address {_vlan_net(v)}.1 {_mask(24)}", "!"]
+            gw.ospf.append(f"{_vlan_net(v)}.0 {_wildcard(24)}")
+        if sws:
+            sw = sws[k % switches]
+            sw.vlans.append(v)
+            sw.blocks += [f"interface FastEthernet0/{sw.access}", f" switchport access vlan {v}", " mtu 1500", "!"]
+            sw.access += 1
+    for dev in rs + sws:
+        with open(os.path.join(out_dir, f"{dev.hostname}.config.dump"), 'w') as fh:
+            fh.write(dev.render())
+    # Endpoints spread round-robin over VLANs; written directly since safe_dump is slow at 100k+
+    with open(os.path.join(out_dir, f'endpoints.{endpoint_format}'), 'w') as fh:
+        if endpoint_format == 'yaml':
+            fh.write("endpoints:\n")
+        elif endpoint_format == 'csv':
+            fh.write("name,vlan,ip,gw,app_profile\n")
+        for e in range(endpoints if vlans else 0):
+            v = 10 + e % vlans
+            host = 10 + e // vlans
+            ip = f"10.{100 + (v - 10) // 256}.{(v - 10) % 256}.{host % 240 + 10}/24"
+            gw = f"{_vlan_net(v)}.1/24"
+            app = APPS[rnd.randrange(len(APPS))]
+            if endpoint_format == 'yaml':
+                fh.write(f"  ep{e}:\n    vlan: {v}\n    ip: {ip}\n    gw: {gw}\n    app_profile: {app}\n")
+            elif endpoint_format == 'csv':
+                fh.write(f"ep{e},{v},{ip},{gw},{app}\n")
+            else:
+                fh.write(json.dumps({'name': f'ep{e}', 'vlan': v, 'ip': ip, 'gw': gw, 'app_profile': app}) + "\n")
+    return {'routers': routers, 'switches': switches, 'links_per_device': links_per_device, 'vlans': vlans,
+            'endpoints': endpoints if vlans else 0, 'links': links, 'seed': seed}
+
+def main():
+    ap = argparse.ArgumentParser(description='Generate a synthetic config inventory')
+    ap.add_argument('out_dir')
+    ap.add_argument('--routers', type=int, default=4)
+    ap.add_argument('--switches', type=int, default=8)
+    ap.add_argument('--links-per-device', type=int, default=3)
+    ap.add_argument('--vlans', type=int, default=8)
+    ap.add_argument('--endpoints', type=int, default=100)
+    ap.add_argument('--mtu-mismatch', type=float, default=0.02)
+    ap.add_argument('--seed', type=int, default=1)
+    ap.add_argument('--endpoint-format', choices=['yaml', 'csv', 'jsonl'], default='yaml')
+    args = ap.parse_args()
+    info = generate(args.out_dir, args.routers, args.switches, args.links_per_device, args.vlans,
+                    args.endpoints, args.mtu_mismatch, args.seed, args.endpoint_format)
+    print('[synth] wrote', args.out_dir, info)
+
+if __name__ == '__main__':
+    main()
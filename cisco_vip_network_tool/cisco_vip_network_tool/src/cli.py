@@ -1,86 +1,621 @@
+"""Command-line entry point.
+
+    python src/cli.py validate --configs DIR             # subcommands: topology, validate, load,
+    python src/cli.py load --configs DIR --load-series   #   what-if, simulate, dataplane, viz, ospf
+    python src/cli.py --configs DIR --validate --viz     # legacy flags, any combination
+    python src/cli.py serve --configs DIR --http 127.0.0.1:8765 --socket /tmp/vipnet.sock
+
+Requested outputs map to stages in STAGES; only those stages and their dependencies run, and
+every subsystem (networkx, NumPy, matplotlib, the simulation runtimes) is imported inside the
+stage that uses it, so e.g. a validate run never loads endpoints or matplotlib.
+"""
 import argparse
+import json
 import os
-import glob
-import yaml
-from typing import Dict
-from cisco_vip_network_tool.src.parsers.cisco_parser import parse_config, extract_link_hints
-from cisco_vip_network_tool.src.model.devices import Device, Endpoint
-from cisco_vip_network_tool.src.topology.builder import build_from_devices, Topology
-from cisco_vip_network_tool.src.validation.validators import config_issues_report
-from cisco_vip_network_tool.src.load.load_manager import compute_link_loads, capacity_analysis
-from cisco_vip_network_tool.src.simulation.node import run_day1_simulation
-from cisco_vip_network_tool.src.simulation.events import inject_link_fault
-from cisco_vip_network_tool.src.visualize.plot import draw_topology
-
-def read_device_configs(conf_dir: str) -> Dict[str, Device]:
-    """Read *.config.dump files and parse into Device objects keyed by hostname."""
-    devices: Dict[str, Device] = {}
-    for path in glob.glob(os.path.join(conf_dir, '*.config.dump')):
-        text = open(path).read()
-        dev = parse_config(text)
-        devices[dev.hostname] = dev
-    return devices
-
-def load_endpoints(conf_dir: str) -> Dict[str, Endpoint]:
-    """Load endpoints.yaml mapping hosts to VLANs and profiles."""
-    ep_path = os.path.join(conf_dir, 'endpoints.yaml')
-    eps: Dict[str, Endpoint] = {}
-    if os.path.exists(ep_path):
-        data = yaml.safe_load(open(ep_path))
-        for name, spec in data.get('endpoints', {}).items():
-            eps[name] = Endpoint(name=name, vlan=int(spec['vlan']), ip=spec['ip'],
-                                 gw=spec['gw'], app_profile=spec['app_profile'])
-    return eps
-
-def main():
-    ap = argparse.ArgumentParser(description='Cisco VIP 2025 – Net Config Validation & Simulation Tool')
-    ap.add_argument('--configs', required=True, help='Directory containing *.config.dump and YAML files')
-    ap.add_argument('--build-topology', action='store_true')
-    ap.add_argument('--validate', action='store_true')
-    ap.add_argument('--analyze-load', action='store_true')
-    ap.add_argument('--simulate', action='store_true')
-    ap.add_argument('--viz', action='store_true')
-    ap.add_argument('--inject-fault', default=None, help='e.g., link:R1-Gi0/0-R2-Gi0/0')
-    ap.add_argument('--ipc', choices=['inproc', 'tcp'], default='inproc')
-    ap.add_argument('--packet-size', type=int, default=1500)
-    args = ap.parse_args()
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+from cisco_vip_network_tool.src.parsers.cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES
+from cisco_vip_network_tool.src.profiling.profiler import StageProfiler, to_prometheus
+from cisco_vip_network_tool.src.report.writer import ReportWriter, edge_label, open_report
+
+def read_device_configs(conf_dir: str, workers: int = 1, batch_size: int = 64,
+                        cache_dir: Optional[str] = None, cache_max_bytes: int = DEFAULT_MAX_BYTES) -> Dict:
+    """Read *.config.dump files and parse into Device objects keyed by hostname.
+
+    Duplicate hostnames and unparsable files are reported instead of silently overwriting.
+    With cache_dir set, unchanged files are loaded from the on-disk parse cache.
+    """
+    from cisco_vip_network_tool.src.parsers.ingest import ingest_configs
+    result = ingest_configs(conf_dir, workers=workers, batch_size=batch_size,
+                            cache_dir=cache_dir, cache_max_bytes=cache_max_bytes)
+    for hostname, kept, skipped in result.duplicates:
+        print(f"[ingest] duplicate hostname {hostname}: kept {kept}, skipped {skipped}")
+    for path, err in result.errors:
+        print(f"[ingest] failed to parse {path}: {err}")
+    return result.devices
+
+class Pipeline:
+    """Runs stages on demand, each once and after its required dependencies; results are kept in ctx.
+
+    Optional ('?') dependencies are not run here: main() follows plan(), which orders them.
+    """
+    def __init__(self, args, prof: StageProfiler, out: Optional[ReportWriter]):
+        self.args = args
+        self.prof = prof
+        self.out = out
+        self.ctx: Dict = {}
+        self.ran: List[str] = []
+
+    def need(self, name: str):
+        if name in self.ran:
+            return
+        deps, fn = STAGES[name]
+        for dep in deps:
+            if not dep.endswith('?'):
+                self.need(dep)
+        fn(self)
+        self.ran.append(name)
+
+def _parse(p: Pipeline):
+    a = p.args
+    with p.prof.stage('parse'):
+        p.ctx['devices'] = read_device_configs(a.configs, workers=a.workers, batch_size=a.batch_size,
+                                               cache_dir=None if a.no_cache else a.cache_dir,
+                                               cache_max_bytes=a.cache_max_mb * 1024 * 1024)
 
-    devices = read_device_configs(args.configs)
-    topo = build_from_devices(devices)
-    endpoints = load_endpoints(args.configs)
+def _build(p: Pipeline):
+    from cisco_vip_network_tool.src.topology.builder import build_from_devices
+    with p.prof.stage('build'):
+        topo = p.ctx['topo'] = build_from_devices(p.ctx['devices'])
+    if p.args.inject_fault and p.args.inject_fault.startswith('link:'):
+        from cisco_vip_network_tool.src.simulation.events import inject_link_fault
+        ok = inject_link_fault(topo, p.args.inject_fault.split('link:')[1])
+        print(f"[fault] link {p.args.inject_fault} {'DOWN' if ok else 'NOT FOUND'}")
 
-    if args.inject_fault:
-        if args.inject_fault.startswith('link:'):
-            ok = inject_link_fault(topo, args.inject_fault.split('link:')[1])
-            print(f"[fault] link {args.inject_fault} {'DOWN' if ok else 'NOT FOUND'}")
+def _endpoints(p: Pipeline):
+    from cisco_vip_network_tool.src.parsers.endpoints import load_endpoints
+    from cisco_vip_network_tool.src.load.profiles import load_traffic_profiles
+    with p.prof.stage('endpoints'):
+        p.ctx['endpoints'] = load_endpoints(p.args.configs)
+        p.ctx['profiles'] = load_traffic_profiles(p.args.configs)
 
-    if args.build_topology:
-        print('[topology] built with', topo.graph.number_of_nodes(), 'nodes and', topo.graph.number_of_edges(), 'links')
+def _topology(p: Pipeline):
+    a = p.args
+    if 'topo' in p.ctx:
+        graph = p.ctx['topo'].graph
+    else:
+        # Only counts are printed: the array store skips the networkx graph on large inventories
+        from cisco_vip_network_tool.src.simulation.events import inject_link_fault
+        from cisco_vip_network_tool.src.topology.compact import CompactTopology
+        with p.prof.stage('build'):
+            ct = CompactTopology.from_devices(p.ctx['devices'])
+        if a.inject_fault and a.inject_fault.startswith('link:'):
+            ok = inject_link_fault(ct, a.inject_fault.split('link:')[1])
+            print(f"[fault] link {a.inject_fault} {'DOWN' if ok else 'NOT FOUND'}")
+        graph = ct.graph
+    print('[topology] built with', graph.number_of_nodes(), 'nodes and', graph.number_of_edges(), 'links')
 
-    if args.validate:
-        report = config_issues_report(devices, topo)
+def _validate(p: Pipeline):
+    from cisco_vip_network_tool.src.validation.validators import config_issues_report, iter_config_issues
+    a, devices, topo, prof = p.args, p.ctx['devices'], p.ctx['topo'], p.prof
+    rules = _rule_names(a)
+    if p.out is not None:
+        with prof.stage('validate'):
+            n = p.out.write_findings(iter_config_issues(devices, topo, profiler=prof, rules=rules,
+                                                        workers=a.workers, batch_size=a.batch_size), 'validate')
+        print(f"[validate] {n} issues")
+    else:
+        import yaml
+        with prof.stage('validate'):
+            report = config_issues_report(devices, topo, profiler=prof, rules=rules, workers=a.workers,
+                                          batch_size=a.batch_size)
         print('[validate] issues report:')
         print(yaml.safe_dump(report, sort_keys=False))
 
-    if args.analyze_load:
-        link_loads = compute_link_loads(topo, endpoints, peak=True)
-        print('[load] per-link kbps:', link_loads)
-        findings = capacity_analysis(topo, link_loads)
+def _link_loads(p: Pipeline) -> Dict:
+    if 'link_loads' not in p.ctx:
+        from cisco_vip_network_tool.src.load.load_manager import compute_link_loads
+        p.ctx['link_loads'] = compute_link_loads(p.ctx['topo'], p.ctx['endpoints'], peak=True,
+                                                 profiles=p.ctx['profiles'])
+    return p.ctx['link_loads']
+
+def _load(p: Pipeline):
+    from cisco_vip_network_tool.src.load.load_manager import (capacity_analysis, iter_capacity_findings,
+                                                              unrouted_demand)
+    a, topo, out, prof = p.args, p.ctx['topo'], p.out, p.prof
+    with prof.stage('load'):
+        link_loads = _link_loads(p)
+        unrouted = unrouted_demand(topo, p.ctx['endpoints'], peak=True, profiles=p.ctx['profiles'])
+    if unrouted:
+        print(f"[load] {len(unrouted)} endpoints ({int(round(sum(unrouted.values())))} kbps) have no path to "
+              f"their gateway; their demand is not in the link loads")
+    if out is not None:
+        for (u, v), kbps in link_loads.items():
+            out.write('load', edge_label(u, v), kbps)
+        for name, kbps in unrouted.items():
+            out.write('unrouted', name, int(round(kbps)))
+        with prof.stage('capacity'):
+            n = 0
+            for f in iter_capacity_findings(topo, link_loads, k=a.reroute_k, max_rerouted=a.reroute_max):
+                out.write('capacity', edge_label(*f['edge']), f['load_kbps'], capacity_kbps=f['capacity_kbps'],
+                          excess_kbps=f['excess_kbps'], alternatives=f['alternatives'],
+                          recommendation=f['recommendation'])
+                n += 1
+        print(f"[load] {len(link_loads)} links loaded, {n} over capacity")
+    else:
+        import yaml
+        print('[load] per-link kbps:')
+        for (u, v), kbps in link_loads.items():
+            print(f"  {edge_label(u, v)}: {kbps}")
+        with prof.stage('capacity'):
+            findings = capacity_analysis(topo, link_loads, k=a.reroute_k, max_rerouted=a.reroute_max)
         if findings:
             print('[load] recommendations:')
             print(yaml.safe_dump(findings, sort_keys=False))
         else:
             print('[load] no capacity issues detected')
 
-    if args.simulate:
-        stats = run_day1_simulation(devices, topo, log_cb=lambda m: print('[sim]', m))
+def _load_series(p: Pipeline):
+    from cisco_vip_network_tool.src.load.load_manager import compute_load_series
+    out = p.out
+    with p.prof.stage('load_series'):
+        ls = compute_load_series(p.ctx['topo'], p.ctx['endpoints'], p.ctx['profiles'],
+                                 bucket_minutes=p.args.bucket_minutes)
+    hour, kbps = ls.busiest_hour()
+    peaks = list(ls.link_peaks())
+    if out is not None:
+        out.write('load_series.busiest_hour', f"{hour:02d}:00", round(kbps), hourly_kbps=[round(x) for x in ls.hourly_total()])
+        series = {e: i for i, e in enumerate(ls.links)}
+        for edge, peak, minute in peaks:
+            out.write('load_series', edge_label(*edge), peak, peak_at=f"{minute // 60:02d}:{minute % 60:02d}",
+                      bucket_minutes=ls.bucket_minutes, kbps=[round(x) for x in ls.series[series[edge]].tolist()])
+    print(f"[load] busiest hour {hour:02d}:00-{hour + 1:02d}:00, mean backbone load {kbps:.0f} kbps "
+          f"({len(ls.links)} links, {ls.series.shape[1]} buckets of {ls.bucket_minutes} min)")
+    if out is None:
+        for edge, peak, minute in peaks[:10]:
+            print(f"  {edge_label(*edge)}: peak {peak} kbps at {minute // 60:02d}:{minute % 60:02d}")
+
+def _what_if(p: Pipeline):
+    from cisco_vip_network_tool.src.simulation.failures import what_if
+    a, out = p.args, p.out
+    with p.prof.stage('what_if'):
+        results = what_if(p.ctx['topo'], a.what_if, p.ctx['endpoints'], profiles=p.ctx['profiles'])
+    cut = sum(1 for r in results if r.get('isolated_count'))
+    if out is not None:
+        for r in results:
+            detail = {k: v for k, v in r.items() if k not in ('scenario', 'unserved_kbps')}
+            out.write('what_if', r['scenario'], r.get('unserved_kbps'), **detail)
+        print(f"[what-if] {len(results)} scenarios, {cut} partition the network")
+    else:
+        import yaml
+        print(f"[what-if] {len(results)} scenarios, {cut} partition the network; worst {min(a.what_if_top, len(results))}:")
+        print(yaml.safe_dump(results[:a.what_if_top], sort_keys=False))
+
+def _simulate(p: Pipeline):
+    from cisco_vip_network_tool.src.profiling.profiler import SimMetrics
+    a, prof, out = p.args, p.prof, p.out
+    devices, topo = p.ctx['devices'], p.ctx['topo']
+    log = lambda m: print('[sim]', m)
+    faults = a.sim_fault            # (time, spec) pairs, see _timed_fault
+    # Handling latency and queue depth are recorded in-process (threads, asyncio, des)
+    metrics = SimMetrics() if prof.enabled else None
+    t0 = time.perf_counter()
+    with prof.stage('simulate'):
+        if a.runtime == 'des':
+            from cisco_vip_network_tool.src.simulation.des import run_des_simulation
+            stats = run_des_simulation(devices, topo, log_cb=log, duration_s=a.sim_duration, faults=faults,
+                                       metrics=metrics, packet_size=a.packet_size)
+        elif a.runtime == 'sharded':
+            from cisco_vip_network_tool.src.simulation.sharded import run_sharded_simulation
+            stats = run_sharded_simulation(devices, topo, log_cb=log, duration_s=a.sim_duration,
+                                           faults=faults, shards=a.shards, packet_size=a.packet_size)
+        elif a.ipc == 'tcp':
+            from cisco_vip_network_tool.src.simulation.ipc_tcp import run_tcp_simulation
+            host, port = a.ipc_addr.rsplit(':', 1)
+            stats = run_tcp_simulation(devices, topo, log_cb=log, duration_s=a.sim_duration,
+                                       processes=a.ipc_procs, host=host, port=int(port), packet_size=a.packet_size)
+        elif a.runtime == 'asyncio':
+            from cisco_vip_network_tool.src.simulation.aio import run_asyncio_simulation
+            stats = run_asyncio_simulation(devices, topo, log_cb=log, duration_s=a.sim_duration, metrics=metrics,
+                                           packet_size=a.packet_size)
+        else:
+            from cisco_vip_network_tool.src.simulation.node import run_day1_simulation
+            stats = run_day1_simulation(devices, topo, log_cb=log, duration_s=a.sim_duration, metrics=metrics,
+                                        packet_size=a.packet_size)
+    if metrics is not None:
+        virtual = a.runtime in ('des', 'sharded')
+        prof.simulation = metrics.summary(stats, time.perf_counter() - t0, a.sim_duration if virtual else None)
+        prof.simulation['runtime'] = 'tcp' if a.ipc == 'tcp' else a.runtime
+    if out is not None:
+        for host, st in stats.items():
+            out.write('sim', host, st.get('sent'), **st)
+    else:
         print('[sim] node stats:', stats)
 
-    if args.viz:
-        out = os.path.join('visualizations', 'topology.png')
-        os.makedirs('visualizations', exist_ok=True)
-        draw_topology(topo, out)
-        print('[viz] wrote', out)
+def _dataplane(p: Pipeline):
+    from cisco_vip_network_tool.src.simulation.dataplane import run_dataplane
+    a, out = p.args, p.out
+    with p.prof.stage('dataplane'):
+        dp, summary = run_dataplane(p.ctx['topo'], p.ctx['endpoints'], packets=a.dataplane_packets,
+                                    batch_size=a.dataplane_batch, packet_size=a.packet_size, df=a.dont_fragment,
+                                    profiles=p.ctx['profiles'], faults=a.dataplane_fault)
+    for spec in summary['faults_not_found']:
+        print(f"[dataplane] fault {spec}: NOT FOUND")
+    print(f"[dataplane] {summary['packets']} packets of {a.packet_size} bytes from {len(dp.flows)} endpoints in "
+          f"{summary['seconds']}s ({summary['packets_per_sec']} pkt/s): {summary['delivered']} delivered, "
+          f"{summary['no_route']} no route, {summary['link_down']} on down links, {summary['mtu']} over MTU, "
+          f"{summary['fragmented']} fragmented")
+    links = dp.link_counters()
+    if out is not None:
+        out.write('dataplane', 'summary', summary['delivered'], **summary)
+        for link, nbytes, packets in links:
+            out.write('dataplane.link', edge_label(*link), nbytes, packets=packets)
+    else:
+        for link, nbytes, packets in list(links)[:a.dataplane_top]:
+            print(f"  {edge_label(*link)}: {nbytes} bytes in {packets} packets")
+
+def _viz(p: Pipeline):
+    a, topo = p.args, p.ctx['topo']
+    path = a.viz_out or os.path.join('visualizations', f'topology.{a.viz_format}')
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if a.viz_format == 'png':
+        from cisco_vip_network_tool.src.visualize.plot import draw_topology   # the only matplotlib user
+        with p.prof.stage('viz'):
+            draw_topology(topo, path)
+    else:
+        from cisco_vip_network_tool.src.visualize.layout import layout_cache_path
+        from cisco_vip_network_tool.src.visualize.web import render_topology
+        p.need('endpoints')
+        cache = layout_cache_path(a.configs) if a.viz_layout_cache is None else a.viz_layout_cache or None
+        with p.prof.stage('viz'):
+            link_loads = _link_loads(p) if p.ctx['endpoints'] else None
+            info = render_topology(topo, path, fmt=a.viz_format, link_loads=link_loads, layout_cache=cache)
+        print(f"[viz] {info['devices']} devices, {info['links']} device links in {info['seconds']}s")
+    print('[viz] wrote', path)
+
+def _ospf(p: Pipeline):
+    from cisco_vip_network_tool.src.control.ospf import OspfDomain, route_changes
+    a, out, prof = p.args, p.out, p.prof
+    with prof.stage('ospf'):
+        dom = OspfDomain(p.ctx['topo'], check_mtu=not a.ospf_ignore_mtu)
+        trees = dom.compute_all()
+        tables = {r: dom.routes(r) for r in dom.router_areas} if a.ospf_fault else None
+    print(f"[ospf] {len(dom.router_areas)} routers in {len(dom.areas)} areas, {dom.adjacency_count()} adjacencies, "
+          f"{trees} SPF trees")
+    for issue in dom.issues:
+        if out is not None:
+            out.write('ospf.adjacency', edge_label(*issue['link']), 'down', reason=issue['reason'])
+        else:
+            print(f"  adjacency {edge_label(*issue['link'])} not formed: {issue['reason']}")
+    for router in a.ospf_routes:
+        routes = sorted(dom.routes(router).values(), key=lambda r: r.prefix)
+        if out is not None:
+            for r in routes:
+                out.write('ospf.route', router, r.cost, prefix=r.prefix, area=r.area, kind=r.kind,
+                          next_hops=[f"{n} {ifn}" for n, ifn in r.next_hops])
+            continue
+        print(f"[ospf] {router}: {len(routes)} routes")
+        for r in routes:
+            via = ', '.join(f"{n} via {ifn}" for n, ifn in r.next_hops) or 'directly connected'
+            print(f"  {r.prefix:<18} {r.kind:<9} area {r.area:<4} cost {r.cost:<5} {via}")
+    for spec in a.ospf_fault:
+        with prof.stage('ospf_fault'):
+            stats = dom.fail_link(spec)
+        if stats is None:
+            print(f"[ospf] fault {spec}: NOT FOUND")
+            continue
+        after = {r: dom.routes(r) for r in dom.router_areas}
+        changes = route_changes(tables, after)
+        tables = after
+        print(f"[ospf] fault {spec}: {len(stats['changed'])} adjacencies changed, {stats['trees_updated']} trees "
+              f"updated incrementally ({stats['trees_untouched']} untouched, {stats['resettled']} routers re-settled) "
+              f"in {stats['seconds']}s; routes changed on {len(changes)} routers")
+        if out is not None:
+            out.write('ospf.fault', spec, len(changes), trees_updated=stats['trees_updated'],
+                      trees_untouched=stats['trees_untouched'], resettled=stats['resettled'], routers=changes)
+        else:
+            for router, diff in list(changes.items())[:10]:
+                print(f"  {router}: " + ', '.join(f"{len(v)} {k}" for k, v in diff.items() if v))
+
+# stage -> (dependencies, function); requested outputs run in OUTPUTS order
+STAGES: Dict[str, Tuple[Tuple[str, ...], Callable[[Pipeline], None]]] = {
+    'parse': ((), _parse),
+    'build': (('parse',), _build),
+    'endpoints': ((), _endpoints),
+    'topology': (('parse', 'build?'), _topology),
+    'validate': (('parse', 'build'), _validate),
+    'load': (('build', 'endpoints'), _load),
+    'load_series': (('build', 'endpoints'), _load_series),
+    'what_if': (('build', 'endpoints'), _what_if),
+    'simulate': (('parse', 'build'), _simulate),
+    'dataplane': (('build', 'endpoints'), _dataplane),
+    'viz': (('build',), _viz),
+    'ospf': (('build',), _ospf),
+}
+# A dependency ending in '?' runs first only when another planned stage requires it
+# (topology reuses the networkx build then, and builds the compact store otherwise).
+# ospf runs last: its --ospf-fault links stay down
+OUTPUTS = ('topology', 'validate', 'load', 'load_series', 'what_if', 'simulate', 'dataplane', 'viz', 'ospf')
+
+def plan(outputs: Sequence[str]) -> List[str]:
+    """Stages run to produce outputs, in order (svg/html viz also pulls in endpoints when it runs)."""
+    required: Set[str] = set()
+
+    def require(name):
+        if name not in required:
+            required.add(name)
+            for dep in STAGES[name][0]:
+                if not dep.endswith('?'):
+                    require(dep)
+
+    for name in outputs:
+        require(name)
+    order: List[str] = []
+
+    def visit(name):
+        if name in order:
+            return
+        for dep in STAGES[name][0]:
+            if dep.rstrip('?') in required:
+                visit(dep.rstrip('?'))
+        order.append(name)
+
+    for name in OUTPUTS:
+        if name in outputs:
+            visit(name)
+    return order
+
+def requested_outputs(args) -> List[str]:
+    """Outputs selected by the action flags (subcommands set the same flags)."""
+    wanted = {'topology': args.build_topology, 'validate': args.validate, 'load': args.analyze_load,
+              'load_series': args.analyze_load and args.load_series, 'what_if': bool(args.what_if),
+              'simulate': args.simulate, 'dataplane': args.dataplane, 'viz': args.viz, 'ospf': args.ospf}
+    return [name for name in OUTPUTS if wanted[name]]
+
+IP_HEADER = 20    # smallest packet: a bare IPv4 header (simulation.dataplane.IP_HEADER, not imported here)
+
+def _int_at_least(low: int):
+    """argparse type for an int >= low, so bad values are usage errors rather than crashes in a stage."""
+    def parse(text: str) -> int:
+        value = int(text)
+        if value < low:
+            raise argparse.ArgumentTypeError(f"must be at least {low}, got {value}")
+        return value
+    parse.__name__ = 'int'
+    return parse
+
+def _bucket_minutes(text: str) -> int:
+    """argparse type for --bucket-minutes: a positive divisor of the 1440 minutes in a day."""
+    value = _int_at_least(1)(text)
+    if 1440 % value:
+        raise argparse.ArgumentTypeError(f"must divide 1440 (minutes per day), got {value}")
+    return value
+
+def _timed_fault(text: str) -> Tuple[float, str]:
+    """argparse type for --sim-fault T:SPEC, e.g. 2.5:R1-Gi0/0-R2-Gi0/0."""
+    t, sep, spec = text.partition(':')
+    try:
+        when = float(t)
+    except ValueError:
+        when = None
+    if not sep or not spec or when is None or when < 0:
+        raise argparse.ArgumentTypeError(f"expected T:SPEC with T in seconds >= 0, e.g. 2.5:R1-Gi0/0-R2-Gi0/0; "
+                                         f"got {text!r}")
+    return when, spec
+
+def _common_args(ap: argparse.ArgumentParser):
+    ap.add_argument('--configs', required=True, help='Directory containing *.config.dump and YAML files')
+    ap.add_argument('--inject-fault', default=None, help='e.g., link:R1-Gi0/0-R2-Gi0/0')
+    ap.add_argument('--workers', type=int, default=1,
+                    help='Processes for config ingestion and per-device validation rules (0 = one per CPU)')
+    ap.add_argument('--batch-size', type=int, default=64, help='Config files (or devices) handed to a process at a time')
+    ap.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='Directory of the content-addressed parse cache')
+    ap.add_argument('--cache-max-mb', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024))
+    ap.add_argument('--no-cache', action='store_true', help='Always reparse config dumps')
+    ap.add_argument('--report', default=None, metavar='PATH',
+                    help="Stream findings, link loads, what-if and simulation results to PATH ('-' = stdout) "
+                         "instead of printing YAML")
+    ap.add_argument('--report-format', choices=['jsonl', 'csv'], default=None,
+                    help='Report format (default: csv for *.csv paths, else jsonl)')
+    ap.add_argument('--profile', default=None, metavar='PATH',
+                    help="Write per-stage/per-validator time and memory plus simulation metrics to PATH ('-' = stdout)")
+    ap.add_argument('--profile-format', choices=['json', 'prometheus'], default='json')
+    ap.add_argument('--profile-no-memory', action='store_true', help='Skip tracemalloc (it slows Python code down)')
+    ap.add_argument('--cprofile', default=None, metavar='STAGE',
+                    help="Run one stage under cProfile, e.g., parse, load or validate.mtu_mismatches")
+    ap.add_argument('--cprofile-out', default=None, help='cProfile stats file (default STAGE.prof)')
+
+def _validate_args(ap: argparse.ArgumentParser):
+    ap.add_argument('--rules', default=None, metavar='NAME[,NAME]',
+                    help='(validate) only run these registered rules, e.g., bgp_neighbor_symmetry,mtu_mismatches')
+
+def _load_args(ap: argparse.ArgumentParser):
+    ap.add_argument('--load-series', action='store_true',
+                    help='(analyze-load) per-link load through one day from traffic_profiles.yaml hourly curves')
+    ap.add_argument('--bucket-minutes', type=_bucket_minutes, default=5, help='(load-series) time bucket size; must divide 1440')
+    ap.add_argument('--reroute-k', type=int, default=3,
+                    help='(analyze-load) detours per overloaded link, from k shortest device paths')
+    ap.add_argument('--reroute-max', type=int, default=None,
+                    help='(analyze-load) only search detours for this many of the most overloaded links')
+
+def _what_if_args(ap: argparse.ArgumentParser, positional: bool = False):
+    spec_help = ("Failure scenario to analyze without changing the topology: 'all' for every single link "
+                 "(N-1), or links joined by '+', e.g., R1-Gi0/0-R2-Gi0/0+R2-Gi0/1-SW1-Gi0/1")
+    if positional:
+        ap.add_argument('what_if', nargs='+', metavar='SPEC', help=spec_help)
+    else:
+        ap.add_argument('--what-if', action='append', default=[], metavar='SPEC', help=spec_help)
+    ap.add_argument('--what-if-top', type=int, default=10, help='Scenarios to print, worst first')
+
+def _sim_args(ap: argparse.ArgumentParser):
+    ap.add_argument('--ipc', choices=['inproc', 'tcp'], default='inproc',
+                    help='tcp: run device threads in worker processes linked by a TCP broker hub')
+    ap.add_argument('--ipc-procs', type=int, default=2, help='(tcp) worker processes')
+    ap.add_argument('--ipc-addr', default='127.0.0.1:0', help='(tcp) hub bind address host:port')
+    ap.add_argument('--runtime', choices=['threads', 'asyncio', 'des', 'sharded'], default='threads',
+                    help='Simulation runtime: thread per device, coroutine per device, discrete-event virtual clock, '
+                         'or discrete-event shards in parallel processes')
+    ap.add_argument('--shards', type=int, default=0, help='(sharded) number of shards/processes; 0 = one per CPU')
+    ap.add_argument('--sim-duration', type=float, default=5.0, help='Simulated seconds of protocol time')
+    ap.add_argument('--sim-fault', action='append', default=[], metavar='T:SPEC', type=_timed_fault,
+                    help='(des, sharded) take a link down at virtual time T, e.g., 2.5:R1-Gi0/0-R2-Gi0/0')
+
+def _packet_args(ap: argparse.ArgumentParser):
+    ap.add_argument('--packet-size', type=_int_at_least(IP_HEADER), default=1500,
+                    help='(simulate) HELLO size, (dataplane) endpoint packet size, in bytes of IP total length; '
+                         'packets larger than a link MTU are dropped or fragmented')
+
+def _dataplane_args(ap: argparse.ArgumentParser):
+    ap.add_argument('--dataplane-packets', type=_int_at_least(0), default=1000000,
+                    help='(dataplane) packets to send, spread over endpoints by their traffic profile rates')
+    ap.add_argument('--dataplane-batch', type=_int_at_least(1), default=1 << 18, help='(dataplane) packets forwarded per batch')
+    ap.add_argument('--dont-fragment', action='store_true',
+                    help='(dataplane) set DF: drop packets larger than a link MTU instead of fragmenting them')
+    ap.add_argument('--dataplane-fault', action='append', default=[], metavar='SPEC',
+                    help='(dataplane) take link SPEC down after routing, so flows over it are dropped; repeatable')
+    ap.add_argument('--dataplane-top', type=int, default=10, help='(dataplane) busiest links to print')
+
+def _viz_args(ap: argparse.ArgumentParser):
+    ap.add_argument('--viz-format', choices=['png', 'svg', 'html'], default='png',
+                    help='png: interface-level spring layout (small inventories); svg/html: device-level '
+                         'hierarchical layout, html with zoom and level-of-detail')
+    ap.add_argument('--viz-out', default=None, help='Output file (default visualizations/topology.<format>)')
+    ap.add_argument('--viz-layout-cache', default=None, metavar='PATH',
+                    help="(svg, html) device positions kept between runs (default: one file per --configs "
+                         "directory under ~/.cache/cisco_vip_network_tool/layout); '' disables")
+
+def _ospf_args(ap: argparse.ArgumentParser):
+    ap.add_argument('--ospf-routes', action='append', default=[], metavar='ROUTER',
+                    help='(ospf) print the OSPF routing table of ROUTER')
+    ap.add_argument('--ospf-fault', action='append', default=[], metavar='SPEC',
+                    help='(ospf) take link SPEC (R1-Gi0/0-R2-Gi0/0) down after the initial SPF, update the '
+                         'trees incrementally and report which routers changed routes; repeatable, cumulative')
+    ap.add_argument('--ospf-ignore-mtu', action='store_true',
+                    help='(ospf) form adjacencies between interfaces with different MTUs')
+
+def _serve_args(ap: argparse.ArgumentParser):
+    ap.add_argument('--http', default='127.0.0.1:8765', help="HTTP listen address host:port ('' disables)")
+    ap.add_argument('--socket', default=None, metavar='PATH', help='Also answer JSON-lines queries on this Unix socket')
+    ap.add_argument('--poll', type=float, default=1.0, help='Seconds between config directory scans (0 = never)')
+
+# subcommand -> (description, action flags it sets, option groups it takes besides _common_args)
+COMMANDS = {
+    'topology': ('Build the topology and print its size', ('build_topology',), ()),
+    'validate': ('Run the configuration checks', ('validate',), (_validate_args,)),
+    'load': ('Compute link loads and capacity recommendations', ('analyze_load',), (_load_args,)),
+    'what-if': ('Analyze link failure scenarios', (), (lambda ap: _what_if_args(ap, positional=True),)),
+    'simulate': ('Run the Day-1 protocol simulation', ('simulate',), (_sim_args, _packet_args)),
+    'dataplane': ('Forward endpoint packets through the topology and count per-link bytes, drops and fragments',
+                  ('dataplane',), (_dataplane_args, _packet_args)),
+    'viz': ('Draw the topology', ('viz',), (_viz_args,)),
+    'ospf': ('Compute OSPF SPF trees and routing tables from the router configs', ('ospf',), (_ospf_args,)),
+    'serve': ('Keep the inventory in memory, re-read changed files and answer queries over HTTP '
+              'or a Unix socket', ('serve',), (_serve_args,)),
+}
+
+def legacy_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(
+        description='Cisco VIP 2025 – Net Config Validation & Simulation Tool',
+        epilog=f"Subcommands, which take only their own options: {', '.join(COMMANDS)} (see '<subcommand> --help').")
+    ap.add_argument('--build-topology', action='store_true')
+    ap.add_argument('--validate', action='store_true')
+    ap.add_argument('--analyze-load', action='store_true')
+    ap.add_argument('--simulate', action='store_true')
+    ap.add_argument('--dataplane', action='store_true')
+    ap.add_argument('--viz', action='store_true')
+    ap.add_argument('--ospf', action='store_true')
+    _common_args(ap)
+    _validate_args(ap)
+    _viz_args(ap)
+    _load_args(ap)
+    _what_if_args(ap)
+    _sim_args(ap)
+    _packet_args(ap)
+    _dataplane_args(ap)
+    _ospf_args(ap)
+    return ap
+
+def _rule_names(args: argparse.Namespace) -> Optional[List[str]]:
+    """--rules as a list in the given order without repeats, or None for every registered rule."""
+    names = list(dict.fromkeys(r for r in (args.rules or '').split(',') if r))
+    return names or None
+
+def _check_args(ap: argparse.ArgumentParser, args: argparse.Namespace):
+    """Reject option combinations no stage can honor (ap.error exits with status 2)."""
+    rules = _rule_names(args)
+    if rules:
+        from cisco_vip_network_tool.src.validation.validators import CHECKS
+        unknown = [r for r in rules if r not in CHECKS]
+        if unknown:
+            ap.error(f"--rules: unknown rules {', '.join(unknown)}; registered: {', '.join(CHECKS)}")
+    if args.ipc == 'tcp' and args.runtime != 'threads':
+        ap.error(f"--ipc tcp runs device threads in worker processes; it cannot be combined with "
+                 f"--runtime {args.runtime}")
+    if args.sim_fault and args.runtime not in ('des', 'sharded'):
+        ap.error(f"--sim-fault needs the virtual clock of --runtime des or sharded, not {args.runtime}")
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Subcommand (first argument) or legacy flags; either way every legacy option has a value."""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    legacy = legacy_parser()
+    if not argv or argv[0] not in COMMANDS:
+        args = legacy.parse_args(argv)
+        _check_args(legacy, args)
+        return args
+    name = argv[0]
+    description, actions, groups = COMMANDS[name]
+    ap = argparse.ArgumentParser(prog=f"{os.path.basename(sys.argv[0])} {name}", description=description)
+    _common_args(ap)
+    for group in groups:
+        group(ap)
+    sub = ap.parse_args(argv[1:])
+    args = legacy.parse_args(['--configs', sub.configs])
+    vars(args).update(vars(sub))
+    for action in actions:
+        setattr(args, action, True)
+    _check_args(ap, args)
+    return args
+
+def serve(args):
+    from cisco_vip_network_tool.src.daemon.server import Daemon
+    Daemon(args.configs, http=args.http or None, unix_path=args.socket, poll_interval=args.poll,
+           cache_dir=None if args.no_cache else args.cache_dir, workers=args.workers).serve_forever()
+
+def main(argv: Optional[Sequence[str]] = None):
+    args = parse_args(argv)
+    if getattr(args, 'serve', False):
+        serve(args)
+        return
+    outputs = requested_outputs(args)
+    if not outputs:
+        print(f"[cli] nothing to do: give a subcommand ({', '.join(COMMANDS)}) or an action flag")
+        return
+    prof = StageProfiler(enabled=bool(args.profile or args.cprofile), memory=not args.profile_no_memory,
+                         cprofile_stage=args.cprofile, cprofile_out=args.cprofile_out)
+    prof.start()
+    out = open_report(args.report, args.report_format)
+    try:
+        pipeline = Pipeline(args, prof, out)
+        for name in plan(outputs):
+            pipeline.need(name)
+    finally:
+        prof.stop()
+        if out is not None:
+            out.close()
+            if args.report != '-':
+                print('[report] wrote', sum(out.counts.values()), 'records to', args.report)
+    if args.profile:
+        report = prof.report()
+        text = to_prometheus(report) if args.profile_format == 'prometheus' else json.dumps(report, indent=2)
+        if args.profile == '-':
+            print(text)
+        else:
+            with open(args.profile, 'w') as fh:
+                fh.write(text)
+            print('[profile] wrote', args.profile)
+    if args.cprofile and args.cprofile in prof.stages:
+        print('[profile] cProfile stats of', args.cprofile, 'in', prof.stages[args.cprofile]['cprofile'])
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,560 @@
+import heapq
+import time
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+from cisco_vip_network_tool.src.model.devices import Device, Interface
+from cisco_vip_network_tool.src.topology.builder import EdgeKey, Topology
+from cisco_vip_network_tool.src.validation.addr_index import format_address, parse_address
+from cisco_vip_network_tool.src.validation.routing import ospf_network_statements
+from cisco_vip_network_tool.src.simulation.events import inject_link_fault
+
+REFERENCE_BW_KBPS = 100000   # IOS default auto-cost reference bandwidth (100 Mbps)
+DEFAULT_MTU = 1500
+BACKBONE = '0'
+UNREACHABLE = 1 << 62        # distance of routers a tree cannot reach
+
+def normalize_area(area) -> str:
+    """'0', '0.0.0.0' and 0 name the same area; returned as a decimal string."""
+    text = str(area).strip()
+    if text.count('.') == 3:
+        parsed = parse_address(text)
+        if parsed is not None:
+            return str(parsed[1])
+    return str(int(text)) if text.isdigit() else text
+
+def interface_cost(iface: Interface) -> int:
+    """OSPF cost: reference bandwidth / interface bandwidth, at least 1."""
+    return max(1, REFERENCE_BW_KBPS // iface.bandwidth_kbps) if iface.bandwidth_kbps else 1
+
+def ospf_interfaces(dev: Device) -> Dict[str, Tuple[str, str, int]]:
+    """ifname -> (area, prefix, cost) for interfaces enabled by a `network <ip> <wildcard> area <a>` line.
+
+    As on IOS, the most specific statement covering an interface address wins.
+    """
+    if not dev.routing.get('ospf'):
+        return {}
+    stmts = [(care, net, normalize_area(area)) for care, net, area, _ in ospf_network_statements(dev)[0]]
+    out = {}
+    for ifn, iface in dev.interfaces.items():
+        addr = parse_address(iface.ip) if iface.ip else None
+        if addr is None or addr[0] != 4:
+            continue
+        for care, net, area in stmts:
+            if addr[1] & care == net:
+                mask = (0xFFFFFFFF << (32 - addr[2])) & 0xFFFFFFFF
+                out[ifn] = (area, f"{format_address(4, addr[1] & mask)}/{addr[2]}", interface_cost(iface))
+                break
+    return out
+
+@dataclass(slots=True)
+class RouterLSA:
+    """One router's description of itself in an area: adjacent routers with the cost towards them,
+    and the prefixes of its OSPF interfaces that are up."""
+    router: str
+    area: str
+    links: List[Tuple[str, int]]
+    stubs: List[Tuple[str, int]]
+
+@dataclass(slots=True)
+class Route:
+    """Best route to a prefix; next_hops are (neighbor router, local interface) pairs."""
+    prefix: str
+    cost: int
+    area: str
+    kind: str                      # 'connected' | 'intra' | 'inter'
+    next_hops: Tuple[Tuple[str, str], ...] = ()
+
+class _Tree:
+    """Shortest-path tree of one root: distances and primary parents in compact arrays,
+    plus the full parent tuple of routers reached over several equal-cost paths."""
+    __slots__ = ('dist', 'parent', 'ecmp')
+
+    def __init__(self, n: int):
+        self.dist = array('q', [UNREACHABLE]) * n
+        self.parent = array('i', [-1]) * n
+        self.ecmp: Dict[int, Tuple[int, ...]] = {}
+
+    def parents(self, x: int) -> Tuple[int, ...]:
+        ps = self.ecmp.get(x)
+        if ps is not None:
+            return ps
+        return (self.parent[x],) if self.parent[x] >= 0 else ()
+
+class Area:
+    """Link-state database of one area: routers, directed adjacency costs and stub prefixes,
+    with the shortest-path trees computed so far (one per root, on demand)."""
+    def __init__(self, name: str, routers: Iterable[str]):
+        self.name = name
+        self.routers: List[str] = sorted(routers)
+        self.index: Dict[str, int] = {r: i for i, r in enumerate(self.routers)}
+        self.adj: List[Dict[int, int]] = [{} for _ in self.routers]    # x -> {neighbor: cost out of x}
+        # (i, j) with i < j -> link key -> (cost i->j, cost j->i, local ifname on i, local ifname on j)
+        self.members: Dict[Tuple[int, int], Dict[EdgeKey, Tuple[int, int, str, str]]] = defaultdict(dict)
+        self.stubs: List[List[Tuple[str, int, Optional[EdgeKey]]]] = [[] for _ in self.routers]
+        self.trees: Dict[int, _Tree] = {}
+
+    # -- full SPF -----------------------------------------------------------------
+    def spf(self, root: int) -> _Tree:
+        tree = self.trees.get(root)
+        if tree is None:
+            tree = self.trees[root] = self._full_spf(root)
+        return tree
+
+    def _full_spf(self, root: int) -> _Tree:
+        tree = _Tree(len(self.routers))
+        dist, adj = tree.dist, self.adj
+        dist[root] = 0
+        heap = [(0, root)]
+        while heap:
+            d, x = heapq.heappop(heap)
+            if d > dist[x]:
+                continue
+            for y, w in adj[x].items():
+                nd = d + w
+                if nd < dist[y]:
+                    dist[y] = nd
+                    heapq.heappush(heap, (nd, y))
+        self._set_parents(tree, root, range(len(self.routers)))
+        return tree
+
+    def _set_parents(self, tree: _Tree, root: int, nodes: Iterable[int]):
+        """Parents of x are all neighbors n with dist[n] + cost(n->x) == dist[x] (costs are >= 1)."""
+        dist, parent, ecmp, adj = tree.dist, tree.parent, tree.ecmp, self.adj
+        for x in nodes:
+            ecmp.pop(x, None)
+            d = dist[x]
+            if x == root or d >= UNREACHABLE:
+                parent[x] = -1
+                continue
+            ps = [n for n in adj[x] if dist[n] + adj[n][x] == d]
+            parent[x] = ps[0] if ps else -1
+            if len(ps) > 1:
+                ecmp[x] = tuple(ps)
+
+    # -- incremental SPF ----------------------------------------------------------
+    def _children(self, tree: _Tree):
+        """children(x) over the primary parent array (one argsort), plus ECMP extras."""
+        par = np.frombuffer(tree.parent, dtype=np.int32)
+        order = np.argsort(par, kind='stable')
+        bounds = np.searchsorted(par[order], np.arange(len(par) + 1), side='left')
+        extra: Dict[int, List[int]] = defaultdict(list)
+        for x, ps in tree.ecmp.items():
+            for p in ps[1:]:
+                extra[p].append(x)
+        return lambda x: order[bounds[x]:bounds[x + 1]].tolist() + extra.get(x, [])
+
+    def edge_removed(self, root: int, u: int, v: int, w_uv: int, w_vu: int) -> Optional[int]:
+        """Update root's tree after adjacency u-v (costs w_uv, w_vu) left self.adj.
+
+        Only routers all of whose shortest paths used the edge are re-settled, by a Dijkstra
+        seeded from their neighbors outside that set. Returns the number re-settled (0 when only
+        an equal-cost parent was dropped), or None if the tree did not use the edge.
+        """
+        tree = self.trees[root]
+        dist = tree.dist
+        for p, c, w in ((u, v, w_uv), (v, u, w_vu)):
+            if c != root and dist[c] < UNREACHABLE and dist[p] + w == dist[c]:
+                break
+        else:
+            return None
+        if len(tree.parents(c)) > 1:
+            self._set_parents(tree, root, (c,))
+            return 0
+        children = self._children(tree)
+        detached: Set[int] = {c}
+        keep: Set[int] = set()       # outside the detached set but with a parent inside it
+        heap = [(dist[x], x) for x in children(c)]
+        heapq.heapify(heap)
+        seen = set()
+        while heap:
+            _, x = heapq.heappop(heap)
+            if x in seen:
+                continue
+            seen.add(x)
+            if all(q in detached for q in tree.parents(x)):
+                detached.add(x)
+                for y in children(x):
+                    heapq.heappush(heap, (dist[y], y))
+            else:
+                keep.add(x)
+        adj = self.adj
+        for x in detached:
+            dist[x] = UNREACHABLE
+        heap = []
+        for x in detached:
+            best = UNREACHABLE
+            for n in adj[x]:
+                if n not in detached:
+                    best = min(best, dist[n] + adj[n][x])
+            if best < UNREACHABLE:
+                dist[x] = best
+                heap.append((best, x))
+        heapq.heapify(heap)
+        while heap:
+            d, x = heapq.heappop(heap)
+            if d > dist[x]:
+                continue
+            for y, w in adj[x].items():
+                if y in detached and d + w < dist[y]:
+                    dist[y] = d + w
+                    heapq.heappush(heap, (d + w, y))
+        self._set_parents(tree, root, detached | keep)
+        return len(detached)
+
+    def edge_added(self, root: int, u: int, v: int, w_uv: int, w_vu: int) -> Optional[int]:
+        """Update root's tree after adjacency u-v joined self.adj: routers the edge brings closer
+        are improved by a Dijkstra started at the edge. Returns how many improved (0 when the edge
+        only adds an equal-cost parent), or None if the tree is unchanged."""
+        tree = self.trees[root]
+        dist, adj = tree.dist, self.adj
+        heap, touched = [], set()
+        for p, c, w in ((u, v, w_uv), (v, u, w_vu)):
+            nd = dist[p] + w
+            if nd < dist[c] and c != root:
+                dist[c] = nd
+                heap.append((nd, c))
+            elif nd == dist[c] and nd < UNREACHABLE:
+                touched.add(c)
+        if not heap and not touched:
+            return None
+        improved: Set[int] = set()
+        while heap:
+            d, x = heapq.heappop(heap)
+            if d > dist[x]:
+                continue
+            improved.add(x)
+            for y, w in adj[x].items():
+                if d + w < dist[y]:
+                    dist[y] = d + w
+                    heapq.heappush(heap, (d + w, y))
+        for x in improved:
+            touched.add(x)
+            touched.update(adj[x])
+        self._set_parents(tree, root, touched)
+        return len(improved)
+
+    # -- LSDB view ----------------------------------------------------------------
+    def lsa(self, router: str, up: Dict[EdgeKey, bool]) -> RouterLSA:
+        i = self.index[router]
+        return RouterLSA(router, self.name, sorted((self.routers[n], w) for n, w in self.adj[i].items()),
+                         [(prefix, cost) for prefix, cost, link in self.stubs[i] if link is None or up.get(link, True)])
+
+def _pair_costs(members: Dict[EdgeKey, Tuple[int, int, str, str]], up: Dict[EdgeKey, bool]) -> Optional[Tuple[int, int]]:
+    """Cost each way over the cheapest up member link, or None when all are down."""
+    best = None
+    for link, (w_ij, w_ji, _, _) in members.items():
+        if up.get(link, True):
+            best = (w_ij, w_ji) if best is None else (min(best[0], w_ij), min(best[1], w_ji))
+    return best
+
+class OspfDomain:
+    """OSPF areas derived from the parsed `router ospf` network statements of a Topology.
+
+    An adjacency forms over a link whose two interfaces are OSPF-enabled in the same area and
+    subnet (and, with check_mtu, have equal MTUs, as mismatched peers stay stuck in ExStart).
+    Shortest-path trees are computed per router and area on first use. sync() compares the
+    topology's link states with the adjacencies: each adjacency that went down, came up or
+    changed cost updates only the trees that used it (or that it shortens), and only the routers
+    inside the affected subtrees are re-settled. Config changes rebuild the domain.
+
+    Routing tables are derived lazily from the trees: intra-area routes first, then inter-area
+    routes through area border routers (routers in the backbone and another area).
+    """
+    def __init__(self, topo: Topology, check_mtu: bool = True):
+        self.topo = topo
+        self.check_mtu = check_mtu
+        self.build()
+
+    def build(self):
+        topo = self.topo
+        self._devices = {h: id(d) for h, d in topo.devices.items()}
+        self.enabled = {h: ospf_interfaces(d) for h, d in topo.devices.items() if d.routing.get('ospf')}
+        self.issues: List[Dict] = []
+        per_area: Dict[str, Set[str]] = defaultdict(set)
+        for h, ifaces in self.enabled.items():
+            for area, _, _ in ifaces.values():
+                per_area[area].add(h)
+        self.areas: Dict[str, Area] = {name: Area(name, routers) for name, routers in per_area.items()}
+        self.router_areas: Dict[str, List[str]] = defaultdict(list)
+        for name in sorted(self.areas):
+            for r in self.areas[name].routers:
+                self.router_areas[r].append(name)
+        self.up: Dict[EdgeKey, bool] = {}
+        linked: Dict[Tuple[str, str], EdgeKey] = {}
+        for a, b, data in topo.graph.edges(data=True):
+            if not (isinstance(a, tuple) and isinstance(b, tuple)) or a[0] == b[0]:
+                continue
+            oa, ob = self.enabled.get(a[0], {}).get(a[1]), self.enabled.get(b[0], {}).get(b[1])
+            if oa is None and ob is None:
+                continue
+            key = (a, b)
+            self.up[key] = data.get('up', True)
+            for end, o in ((a, oa), (b, ob)):
+                if o is not None:
+                    linked[end] = key
+            if oa is None or ob is None:
+                continue
+            reason = self._mismatch(a, b, oa, ob)
+            if reason:
+                self.issues.append({'link': key, 'reason': reason})
+                continue
+            area = self.areas[oa[0]]
+            i, j = area.index[a[0]], area.index[b[0]]
+            if i > j:
+                i, j, oa, ob, a, b = j, i, ob, oa, b, a
+            area.members[(i, j)][key] = (oa[2], ob[2], a[1], b[1])
+        for h, ifaces in self.enabled.items():
+            for ifn, (area_name, prefix, cost) in ifaces.items():
+                area = self.areas[area_name]
+                area.stubs[area.index[h]].append((prefix, cost, linked.get((h, ifn))))
+        for area in self.areas.values():
+            for (i, j), members in area.members.items():
+                costs = _pair_costs(members, self.up)
+                if costs is not None:
+                    area.adj[i][j], area.adj[j][i] = costs
+        self._routes: Dict[str, Dict[str, Route]] = {}
+        self._summaries: Dict[Tuple[str, str], Dict[str, int]] = {}
+        self.version = topo.version
+
+    def _mismatch(self, a, b, oa, ob) -> Optional[str]:
+        if oa[0] != ob[0]:
+            return f"area mismatch: {a[0]} {a[1]} in area {oa[0]}, {b[0]} {b[1]} in area {ob[0]}"
+        if oa[1] != ob[1]:
+            return f"subnet mismatch: {oa[1]} vs {ob[1]}"
+        if self.check_mtu:
+            ma = self.topo.devices[a[0]].interfaces[a[1]].mtu or DEFAULT_MTU
+            mb = self.topo.devices[b[0]].interfaces[b[1]].mtu or DEFAULT_MTU
+            if ma != mb:
+                return f"MTU mismatch {ma} vs {mb}: adjacency stuck in ExStart"
+        return None
+
+    # -- queries --------------------------------------------------------------------
+    def lsdb(self, area: str) -> Dict[str, RouterLSA]:
+        a = self.areas[normalize_area(area)]
+        return {r: a.lsa(r, self.up) for r in a.routers}
+
+    def adjacency_count(self) -> int:
+        return sum(len(a.members) for a in self.areas.values())
+
+    def abrs(self, area: str) -> List[str]:
+        """Area border routers attached to area (backbone routers that are also in another area)."""
+        return [r for r in self.areas[area].routers if len(self.router_areas[r]) > 1 and BACKBONE in self.router_areas[r]]
+
+    def distance(self, src: str, dst: str, area: Optional[str] = None) -> Optional[int]:
+        """Intra-area SPF cost from src to dst (in their first shared area by default)."""
+        name = area or next((x for x in self.router_areas.get(src, []) if x in self.router_areas.get(dst, [])), None)
+        if name is None:
+            return None
+        a = self.areas[name]
+        d = a.spf(a.index[src]).dist[a.index[dst]]
+        return d if d < UNREACHABLE else None
+
+    def compute_all(self) -> int:
+        """Run SPF for every router in every area; returns the number of trees."""
+        for a in self.areas.values():
+            for i in range(len(a.routers)):
+                a.spf(i)
+        return sum(len(a.trees) for a in self.areas.values())
+
+    def _first_hops(self, a: Area, root: int) -> List[Optional[frozenset]]:
+        """Per router of area a, the set of root's neighbors that start a shortest path to it."""
+        tree = a.spf(root)
+        dist = np.frombuffer(tree.dist, dtype=np.int64)
+        hops: List[Optional[frozenset]] = [None] * len(a.routers)
+        hops[root] = frozenset()
+        for x in np.argsort(dist, kind='stable').tolist():
+            if dist[x] >= UNREACHABLE:
+                break
+            if x == root:
+                continue
+            acc = set()
+            for p in tree.parents(x):
+                acc |= {x} if p == root else hops[p]
+            hops[x] = frozenset(acc)
+        return hops
+
+    def _interfaces_to(self, a: Area, i: int, n: int) -> List[str]:
+        """i's local interfaces on the cheapest up links towards neighbor n."""
+        pair, flip = ((i, n), False) if i < n else ((n, i), True)
+        best, names = None, []
+        for link, (w_ij, w_ji, if_i, if_j) in a.members.get(pair, {}).items():
+            if not self.up.get(link, True):
+                continue
+            cost, name = (w_ji, if_j) if flip else (w_ij, if_i)
+            if best is None or cost < best:
+                best, names = cost, [name]
+            elif cost == best:
+                names.append(name)
+        return sorted(names)
+
+    def _intra(self, router: str, area_name: str) -> Dict[str, Route]:
+        a = self.areas[area_name]
+        root = a.index[router]
+        dist = a.spf(root).dist
+        hops = self._first_hops(a, root)
+        best: Dict[str, Tuple[int, Set[int]]] = {}
+        own: Dict[str, int] = {}
+        for q, stubs in enumerate(a.stubs):
+            if dist[q] >= UNREACHABLE:
+                continue
+            for prefix, cost, link in stubs:
+                if link is not None and not self.up.get(link, True):
+                    continue
+                if q == root:
+                    own[prefix] = min(own.get(prefix, cost), cost)
+                    continue
+                total = dist[q] + cost
+                cur = best.get(prefix)
+                if cur is None or total < cur[0]:
+                    best[prefix] = (total, set(hops[q]))
+                elif total == cur[0]:
+                    cur[1].update(hops[q])
+        routes = {p: Route(p, c, area_name, 'connected') for p, c in own.items()}
+        for prefix, (cost, firsts) in best.items():
+            if prefix not in routes:
+                routes[prefix] = Route(prefix, cost, area_name, 'intra', self._next_hops(a, root, firsts))
+        return routes
+
+    def _next_hops(self, a: Area, root: int, firsts: Iterable[int]) -> Tuple[Tuple[str, str], ...]:
+        return tuple(sorted((a.routers[n], ifn) for n in firsts for ifn in self._interfaces_to(a, root, n)))
+
+    def _summary(self, abr: str, into: str) -> Dict[str, int]:
+        """prefix -> cost that abr advertises into area `into` (type-3 summary LSAs).
+
+        Into the backbone: its intra-area routes of the other areas; into another area: its
+        whole table except that area's own prefixes.
+        """
+        key = (abr, into)
+        if key not in self._summaries:
+            if into == BACKBONE:
+                out: Dict[str, int] = {}
+                for name in self.router_areas[abr]:
+                    if name != BACKBONE:
+                        for p, r in self._intra(abr, name).items():
+                            out[p] = min(out.get(p, r.cost), r.cost)
+            else:
+                out = {p: r.cost for p, r in self.routes(abr).items() if r.area != into}
+            self._summaries[key] = out
+        return self._summaries[key]
+
+    def routes(self, router: str) -> Dict[str, Route]:
+        """prefix -> Route for router; intra-area routes win over inter-area ones regardless of cost."""
+        cached = self._routes.get(router)
+        if cached is not None:
+            return cached
+        table: Dict[str, Route] = {}
+        areas = self.router_areas.get(router, [])
+        for name in areas:
+            for p, r in self._intra(router, name).items():
+                cur = table.get(p)
+                if cur is None or (r.kind, r.cost) < (cur.kind, cur.cost):
+                    table[p] = r
+        # Backbone routers learn summaries from ABRs over the backbone; others from their area's ABRs
+        source = [BACKBONE] if BACKBONE in areas else ([] if len(areas) != 1 else areas)
+        inter: Dict[str, Tuple[int, str, Set[int]]] = {}
+        for name in source:
+            a = self.areas[name]
+            root = a.index[router]
+            dist = a.spf(root).dist
+            hops = None
+            for abr in self.abrs(name):
+                x = a.index[abr]
+                if abr == router or dist[x] >= UNREACHABLE:
+                    continue
+                if hops is None:
+                    hops = self._first_hops(a, root)
+                for p, cost in self._summary(abr, name).items():
+                    if p in table:
+                        continue
+                    total = dist[x] + cost
+                    cur = inter.get(p)
+                    if cur is None or total < cur[0]:
+                        inter[p] = (total, name, set(hops[x]))
+                    elif total == cur[0]:
+                        cur[2].update(hops[x])
+        for p, (cost, name, firsts) in inter.items():
+            a = self.areas[name]
+            table[p] = Route(p, cost, name, 'inter', self._next_hops(a, a.index[router], firsts))
+        self._routes[router] = table
+        return table
+
+    # -- incremental updates -------------------------------------------------------------
+    def sync(self) -> Dict:
+        """Bring the domain up to the topology's current state (see the class docstring).
+
+        Returns what was done: changed adjacencies, trees updated vs untouched, routers
+        re-settled and the time taken; 'rebuilt' is True when a device changed.
+        """
+        t0 = time.perf_counter()
+        stats = {'rebuilt': False, 'changed': [], 'trees_updated': 0, 'trees_untouched': 0,
+                 'resettled': 0, 'seconds': 0.0}
+        topo = self.topo
+        if topo.version == self.version:
+            return stats
+        if len(topo.devices) != len(self._devices) or any(id(d) != self._devices.get(h) for h, d in topo.devices.items()):
+            self.build()
+            stats['rebuilt'] = True
+            stats['seconds'] = round(time.perf_counter() - t0, 6)
+            return stats
+        g = topo.graph
+        flipped = []
+        for link, was in self.up.items():
+            now = g.edges[link].get('up', True) if g.has_edge(*link) else False
+            if now != was:
+                self.up[link] = now
+                flipped.append(link)
+        self.version = topo.version
+        if not flipped:
+            return stats
+        self._routes.clear()
+        self._summaries.clear()
+        flipped = set(flipped)
+        updated: Set[Tuple[str, int]] = set()
+        for area in self.areas.values():
+            for (i, j), members in area.members.items():
+                if flipped.isdisjoint(members):
+                    continue
+                old = (area.adj[i][j], area.adj[j][i]) if j in area.adj[i] else None
+                new = _pair_costs(members, self.up)
+                if old == new:
+                    continue
+                stats['changed'].append((area.name, area.routers[i], area.routers[j], old, new))
+                if old is not None:
+                    del area.adj[i][j], area.adj[j][i]
+                    for root in area.trees:
+                        n = area.edge_removed(root, i, j, *old)
+                        if n is not None:
+                            updated.add((area.name, root))
+                            stats['resettled'] += n
+                if new is not None:
+                    area.adj[i][j], area.adj[j][i] = new
+                    for root in area.trees:
+                        n = area.edge_added(root, i, j, *new)
+                        if n is not None:
+                            updated.add((area.name, root))
+                            stats['resettled'] += n
+        stats['trees_updated'] = len(updated)
+        stats['trees_untouched'] = sum(len(a.trees) for a in self.areas.values()) - len(updated)
+        stats['seconds'] = round(time.perf_counter() - t0, 6)
+        return stats
+
+    def fail_link(self, spec: str) -> Optional[Dict]:
+        """inject_link_fault(spec) then sync(); None when the link does not exist."""
+        if not inject_link_fault(self.topo, spec):
+            return None
+        return self.sync()
+
+def route_changes(before: Dict[str, Dict[str, Route]], after: Dict[str, Dict[str, Route]]) -> Dict[str, Dict[str, List[str]]]:
+    """Per router, prefixes whose route was lost, gained or changed (cost or next hops) between two snapshots."""
+    out = {}
+    for router in sorted(set(before) | set(after)):
+        b, a = before.get(router, {}), after.get(router, {})
+        lost = sorted(set(b) - set(a))
+        gained = sorted(set(a) - set(b))
+        changed = sorted(p for p in set(a) & set(b) if (a[p].cost, a[p].next_hops) != (b[p].cost, b[p].next_hops))
+        if lost or gained or changed:
+            out[router] = {'lost': lost, 'gained': gained, 'changed': changed}
+    return out
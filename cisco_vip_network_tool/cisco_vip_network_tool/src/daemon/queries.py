@@ -0,0 +1,129 @@
+from typing import Callable, Dict, List
+from cisco_vip_network_tool.src.daemon.state import NetworkState
+from cisco_vip_network_tool.src.report.writer import edge_label
+
+class QueryError(ValueError):
+    """Bad or missing query parameter; reported to the client as a 400."""
+
+def _param(params: Dict, name: str, default=None, cast=str):
+    value = params.get(name, default)
+    if value is None:
+        raise QueryError(f"missing parameter {name!r}")
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        raise QueryError(f"bad value for {name!r}: {value!r}")
+
+def _specs(params: Dict) -> List[str]:
+    spec = params.get('spec', 'all')
+    return list(spec) if isinstance(spec, (list, tuple)) else [spec]
+
+def q_status(state: NetworkState, params: Dict) -> Dict:
+    return state.status()
+
+def q_validate(state: NetworkState, params: Dict) -> Dict:
+    from cisco_vip_network_tool.src.validation.validators import RuleCache, config_issues_report
+    with state.lock:
+        if state.rule_cache is None:
+            state.rule_cache = RuleCache()
+        # Only devices changed since the last run (and links touching them) are re-checked
+        report = state.cached('validate', lambda: config_issues_report(state.topo.devices, state.topo,
+                                                                       cache=state.rule_cache))
+        return {'version': state.topo.version, 'issues': report}
+
+def _link_loads(state: NetworkState) -> Dict:
+    from cisco_vip_network_tool.src.load.load_manager import compute_link_loads
+    return state.cached('load', lambda: compute_link_loads(state.topo, state.endpoints, peak=True,
+                                                            profiles=state.profiles))
+
+def q_load(state: NetworkState, params: Dict) -> Dict:
+    """Backbone link loads, busiest first (top=N limits them), and over-capacity findings."""
+    from cisco_vip_network_tool.src.load.load_manager import capacity_analysis
+    top = _param(params, 'top', 0, int)
+    with state.lock:
+        loads = _link_loads(state)
+        findings = state.cached('capacity', lambda: [dict(f, edge=edge_label(*f['edge']))
+                                                     for f in capacity_analysis(state.topo, loads)])
+        backbone = state.cached('load_ranked', lambda: sorted(
+            ((kbps, edge_label(u, v)) for (u, v), kbps in loads.items()
+             if isinstance(u, tuple) and isinstance(v, tuple)), reverse=True))
+        return {'version': state.topo.version,
+                'links': {label: kbps for kbps, label in (backbone[:top] if top else backbone)},
+                'capacity': findings}
+
+def q_path(state: NetworkState, params: Dict) -> Dict:
+    """Lowest-latency device path src -> dst (k > 1: the k shortest), with the links taken."""
+    from cisco_vip_network_tool.src.load.engine import engine_for
+    src, dst = _param(params, 'src'), _param(params, 'dst')
+    k = _param(params, 'k', 1, int)
+    with state.lock:
+        for host in (src, dst):
+            if host not in state.topo.devices:
+                raise QueryError(f"unknown device {host!r}")
+        eng = engine_for(state.topo)
+        eng.refresh()
+        paths = [eng.path(src, dst)] if k <= 1 else eng.k_shortest_paths(src, dst, k)
+        out = []
+        for hops in paths:
+            if hops:
+                links = [edge_label(*eng.dgraph.edges[a, b]['link']) for a, b in zip(hops, hops[1:])]
+                out.append({'hops': hops, 'latency_ms': eng.path_cost(hops), 'links': links})
+        return {'version': state.topo.version, 'paths': out}
+
+def q_what_if(state: NetworkState, params: Dict) -> Dict:
+    """Failure scenarios (spec: 'all' or links joined by '+'; repeatable) without changing state."""
+    from cisco_vip_network_tool.src.simulation.failures import FailureAnalyzer, what_if
+    top = _param(params, 'top', 10, int)
+    with state.lock:
+        fa = state.cached('failures', lambda: FailureAnalyzer(state.topo, state.endpoints, profiles=state.profiles))
+        results = what_if(state.topo, _specs(params), analyzer=fa)
+        return {'version': state.topo.version, 'scenarios': len(results), 'results': results[:top] if top else results}
+
+def q_fault(state: NetworkState, params: Dict) -> Dict:
+    """Set a link down (state=down, default) or back up; survives config reloads of its devices."""
+    from cisco_vip_network_tool.src.simulation.events import parse_link_spec
+    spec = _param(params, 'link')
+    up = _param(params, 'state', 'down') == 'up'
+    with state.lock:
+        key = parse_link_spec(state.topo, spec)
+        if key is None:
+            raise QueryError(f"no such link {spec!r}")
+        state.topo.set_link_state(*key, up=up)
+        return {'version': state.topo.version, 'link': edge_label(*key), 'up': up}
+
+def q_ospf(state: NetworkState, params: Dict) -> Dict:
+    """OSPF areas and unformed adjacencies; router=NAME adds that router's routing table."""
+    router = params.get('router')
+    with state.lock:
+        dom = state.ospf()
+        body = {'version': state.topo.version,
+                'areas': {name: len(a.routers) for name, a in sorted(dom.areas.items())},
+                'adjacencies': dom.adjacency_count(),
+                'issues': [{'link': edge_label(*i['link']), 'reason': i['reason']} for i in dom.issues]}
+        if router is not None:
+            if router not in dom.router_areas:
+                raise QueryError(f"{router!r} does not run OSPF")
+            body['routes'] = {p: {'cost': r.cost, 'area': r.area, 'kind': r.kind,
+                                  'next_hops': [f"{n} {ifn}" for n, ifn in r.next_hops]}
+                              for p, r in sorted(dom.routes(router).items())}
+        return body
+
+def q_reload(state: NetworkState, params: Dict) -> Dict:
+    """Apply pending config changes now instead of waiting for the next poll."""
+    return {'update': state.apply_changes(), 'version': state.topo.version}
+
+QUERIES: Dict[str, Callable[[NetworkState, Dict], Dict]] = {
+    'status': q_status,
+    'validate': q_validate,
+    'load': q_load,
+    'path': q_path,
+    'what-if': q_what_if,
+    'ospf': q_ospf,
+    'fault': q_fault,
+    'reload': q_reload,
+}
+MUTATING = ('fault', 'reload')
+
+def run_query(state: NetworkState, name: str, params: Dict) -> Dict:
+    """Dispatch one query; raises KeyError for unknown names and QueryError for bad parameters."""
+    return QUERIES[name](state, params)
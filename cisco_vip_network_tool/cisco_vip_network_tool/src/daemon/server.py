@@ -0,0 +1,181 @@
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from cisco_vip_network_tool.src.daemon.queries import MUTATING, QUERIES, QueryError, run_query
+from cisco_vip_network_tool.src.daemon.state import NetworkState
+
+WARM_QUERIES = ('validate', 'load')   # recomputed right after a change so queries find them cached
+
+def answer(state: NetworkState, name: str, params: Dict) -> Tuple[int, Dict]:
+    """(HTTP-style status, JSON-able body) for one query."""
+    if name not in QUERIES:
+        return 404, {'error': f"unknown query {name!r}", 'queries': sorted(QUERIES)}
+    t0 = time.perf_counter()
+    try:
+        body = run_query(state, name, params)
+    except QueryError as exc:
+        return 400, {'error': str(exc)}
+    except Exception as exc:
+        return 500, {'error': f"{type(exc).__name__}: {exc}"}
+    body['ms'] = round((time.perf_counter() - t0) * 1000, 3)
+    return 200, body
+
+def _dumps(body: Dict) -> bytes:
+    return json.dumps(body, default=str).encode()
+
+class _HTTPHandler(BaseHTTPRequestHandler):
+    """GET /<query>?param=value; mutating queries (fault, reload) also accept POST."""
+    server_version = 'vipnetd'
+    protocol_version = 'HTTP/1.1'
+
+    def _handle(self, allow_mutation: bool):
+        url = urlsplit(self.path)
+        name = url.path.strip('/') or 'status'
+        params = {k: v if len(v) > 1 else v[0] for k, v in parse_qs(url.query).items()}
+        if name in MUTATING and not allow_mutation:
+            status, body = 405, {'error': f"use POST for {name}"}
+        else:
+            status, body = answer(self.server.state, name, params)
+        data = _dumps(body)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._handle(allow_mutation=False)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        self._handle(allow_mutation=True)
+
+    def log_message(self, fmt, *args):
+        pass
+
+class _UnixHandler(socketserver.StreamRequestHandler):
+    """One JSON object per line, {"query": name, **params}; one JSON line back per request."""
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                req = json.loads(line)
+                name = req.pop('query', 'status')
+            except (ValueError, AttributeError) as exc:
+                status, body = 400, {'error': f"bad request: {exc}"}
+            else:
+                status, body = answer(self.server.state, name, req)
+            body.setdefault('status', status)
+            self.wfile.write(_dumps(body) + b'\n')
+            self.wfile.flush()
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+class Daemon:
+    """Keeps a NetworkState loaded, polls its config directory and serves queries.
+
+    http is 'host:port' (port 0 picks a free one) and unix_path a socket path; either may be None.
+    Each poll applies what changed and recomputes WARM_QUERIES, so answers come from memory.
+    """
+    def __init__(self, conf_dir: str, http: Optional[str] = None, unix_path: Optional[str] = None,
+                 poll_interval: float = 1.0, cache_dir: Optional[str] = None, workers: int = 1,
+                 log=print):
+        self.state = NetworkState(conf_dir, cache_dir=cache_dir)
+        self.http = http
+        self.unix_path = unix_path
+        self.poll_interval = poll_interval
+        self.workers = workers
+        self.log = log
+        self.http_address: Optional[Tuple[str, int]] = None
+        self._servers: List[socketserver.BaseServer] = []
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+
+    def warm(self):
+        for name in WARM_QUERIES:
+            answer(self.state, name, {})
+
+    def _poll_loop(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                update = self.state.apply_changes()
+            except Exception as exc:
+                self.log(f"[daemon] update failed: {type(exc).__name__}: {exc}")
+                continue
+            if update is not None:
+                self.warm()
+                self.log(f"[daemon] applied {update['changed']} changed, {update['removed']} removed files "
+                         f"in {update['seconds']}s (version {update['version']})")
+
+    def _spawn(self, target, name: str):
+        t = threading.Thread(target=target, name=name, daemon=True)
+        t.start()
+        self._threads.append(t)
+
+    def start(self):
+        info = self.state.load(workers=self.workers)
+        self.warm()
+        self.log(f"[daemon] loaded {len(self.state.topo.devices)} devices in {info['seconds']}s")
+        if self.http:
+            host, port = self.http.rsplit(':', 1)
+            srv = ThreadingHTTPServer((host, int(port)), _HTTPHandler)
+            srv.daemon_threads = True
+            srv.state = self.state
+            self.http_address = srv.server_address[:2]
+            self._servers.append(srv)
+            self._spawn(srv.serve_forever, 'daemon-http')
+            self.log(f"[daemon] http://{self.http_address[0]}:{self.http_address[1]}/")
+        if self.unix_path:
+            if os.path.exists(self.unix_path):
+                os.unlink(self.unix_path)
+            srv = _UnixServer(self.unix_path, _UnixHandler)
+            srv.state = self.state
+            self._servers.append(srv)
+            self._spawn(srv.serve_forever, 'daemon-unix')
+            self.log(f"[daemon] unix socket {self.unix_path}")
+        if self.poll_interval > 0:
+            self._spawn(self._poll_loop, 'daemon-poll')
+
+    def stop(self):
+        self._stop.set()
+        for srv in self._servers:
+            srv.shutdown()
+            srv.server_close()
+        for t in self._threads:
+            t.join(timeout=5)
+        if self.unix_path and os.path.exists(self.unix_path):
+            os.unlink(self.unix_path)
+
+    def serve_forever(self):
+        """start(), then block until interrupted."""
+        self.start()
+        try:
+            while not self._stop.wait(3600):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+def query_unix(path: str, query: str, **params) -> Dict:
+    """Client helper: send one query over the daemon's Unix socket and return the decoded reply."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        sock.sendall(json.dumps(dict(params, query=query)).encode() + b'\n')
+        buf = b''
+        while not buf.endswith(b'\n'):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            buf += chunk
+    return json.loads(buf)
@@ -0,0 +1,178 @@
+import fnmatch
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from cisco_vip_network_tool.src.model.devices import Device
+from cisco_vip_network_tool.src.parsers.cache import DEFAULT_MAX_BYTES, ParseCache
+from cisco_vip_network_tool.src.parsers.endpoints import ENDPOINT_FILES, load_endpoints
+from cisco_vip_network_tool.src.parsers.ingest import CONFIG_GLOB, ingest_configs, parse_config_path
+from cisco_vip_network_tool.src.topology.builder import Topology, build_from_devices
+from cisco_vip_network_tool.src.load.profiles import PROFILES_FILE, load_traffic_profiles
+from cisco_vip_network_tool.src.daemon.watcher import DirWatcher
+
+class NetworkState:
+    """Parsed devices, Topology, endpoints and derived results held in memory by the daemon.
+
+    apply_changes() re-parses only the config files the watcher reports as changed and patches
+    the Topology with apply_device_update(), so only links declared by or pointing at those
+    devices are re-derived. Derived results (validation report, link loads, failure analyzer)
+    are cached per (topology version, endpoint/profile version) and rebuilt on first use after
+    a change. All access goes through `lock`; load() and apply_changes() also hold
+    `update_lock` from poll to apply, so concurrent reloads (poll thread, /reload) run one at a
+    time while queries only wait for the final patch.
+    """
+    def __init__(self, conf_dir: str, cache_dir: Optional[str] = None, cache_max_bytes: int = DEFAULT_MAX_BYTES):
+        self.conf_dir = conf_dir
+        self.lock = threading.RLock()
+        self.update_lock = threading.Lock()
+        self.cache_dir = cache_dir
+        self.cache_max_bytes = cache_max_bytes
+        self.cache = ParseCache(cache_dir, cache_max_bytes) if cache_dir else None
+        self.watcher = DirWatcher(conf_dir, (CONFIG_GLOB, PROFILES_FILE) + ENDPOINT_FILES)
+        self.topo = Topology()
+        self.path_host: Dict[str, str] = {}      # config path -> hostname it defines
+        self.host_path: Dict[str, str] = {}      # hostname -> config path that owns it
+        self.duplicates: Dict[str, str] = {}     # config path -> hostname already owned by another file
+        self.errors: Dict[str, str] = {}         # config path -> parse error
+        self.endpoints: Dict = {}
+        self.profiles: Dict = {}
+        self.data_version = 0                    # bumped when endpoints or traffic profiles reload
+        self.last_update: Dict = {}
+        self._results: Dict[str, Tuple[Tuple[int, int], object]] = {}
+        self._ospf = None
+        self.rule_cache = None                   # validation findings per device content hash
+
+    def key(self) -> Tuple[int, int]:
+        return self.topo.version, self.data_version
+
+    def cached(self, name: str, compute: Callable[[], object]):
+        """compute() once per state key; callers hold the lock."""
+        hit = self._results.get(name)
+        if hit is not None and hit[0] == self.key():
+            return hit[1]
+        value = compute()
+        self._results[name] = (self.key(), value)
+        return value
+
+    def load(self, workers: int = 1, batch_size: int = 64) -> Dict:
+        """Initial full read: bulk ingestion (optionally in a process pool) and one topology build."""
+        with self.update_lock:
+            return self._load(workers, batch_size)
+
+    def _load(self, workers: int, batch_size: int) -> Dict:
+        t0 = time.perf_counter()
+        self.watcher.poll()          # stamps taken first: files written during the read show up as changed
+        result = ingest_configs(self.conf_dir, workers=workers, batch_size=batch_size,
+                                cache_dir=self.cache_dir, cache_max_bytes=self.cache_max_bytes)
+        with self.lock:
+            self.topo = build_from_devices(result.devices)
+            self.host_path = dict(result.paths)
+            self.path_host = {p: h for h, p in result.paths.items()}
+            self.duplicates = {path: host for host, _, path in result.duplicates}
+            self.errors = dict(result.errors)
+            self.endpoints = load_endpoints(self.conf_dir)
+            self.profiles = load_traffic_profiles(self.conf_dir)
+            self.data_version += 1
+            self._results.clear()
+            self.last_update = {'at': time.time(), 'changed': len(result.devices), 'removed': 0,
+                                'reparsed': len(result.devices) - result.cache_hits,
+                                'seconds': round(time.perf_counter() - t0, 4), 'version': self.topo.version}
+        return self.last_update
+
+    def _parse(self, paths: List[str]) -> List[Tuple[str, Optional[Device], Optional[str]]]:
+        out = []
+        for path in paths:
+            try:
+                dev, _ = parse_config_path(path, self.cache)
+                out.append((path, dev, None))
+            except Exception as exc:
+                out.append((path, None, f"{type(exc).__name__}: {exc}"))
+        return out
+
+    def _drop(self, path: str) -> Optional[str]:
+        """Remove the device path defined; returns its hostname if the file owned one."""
+        self.duplicates.pop(path, None)
+        self.errors.pop(path, None)
+        host = self.path_host.pop(path, None)
+        if host is None:
+            return None
+        del self.host_path[host]
+        self.topo.apply_device_update(self.topo.devices.get(host), None)
+        return host
+
+    def apply_changes(self) -> Optional[Dict]:
+        """Poll the config directory and apply what changed; None when nothing did.
+
+        Config files are parsed outside `lock` but under `update_lock`, so two callers never
+        report the same change or apply an older parse over a newer one. A hostname already owned
+        by another file is recorded as a duplicate and taken over once that file goes away or
+        renames its device.
+        """
+        with self.update_lock:
+            return self._apply_changes()
+
+    def _apply_changes(self) -> Optional[Dict]:
+        changed, removed = self.watcher.poll()
+        if not changed and not removed:
+            return None
+        t0 = time.perf_counter()
+        is_config = lambda p: fnmatch.fnmatch(os.path.basename(p), CONFIG_GLOB)
+        parsed = self._parse([p for p in changed if is_config(p)])
+        data_files = [p for p in changed + removed if not is_config(p)]
+        with self.lock:
+            freed = set()
+            for path in removed:
+                if is_config(path):
+                    freed.add(self._drop(path))
+            for path, dev, err in parsed:
+                if err is not None:
+                    self.errors[path] = err        # keep the last good device until the file parses
+                    continue
+                self.errors.pop(path, None)
+                self.duplicates.pop(path, None)
+                old_host = self.path_host.get(path)
+                owner = self.host_path.get(dev.hostname)
+                if owner is not None and owner != path:
+                    if old_host is not None:
+                        freed.add(self._drop(path))
+                    self.duplicates[path] = dev.hostname
+                    continue
+                if old_host is not None and old_host != dev.hostname:
+                    freed.add(self._drop(path))
+                    old_host = None
+                self.topo.apply_device_update(self.topo.devices.get(old_host) if old_host else None, dev)
+                self.path_host[path] = dev.hostname
+                self.host_path[dev.hostname] = path
+            waiting = sorted(p for p, h in self.duplicates.items() if h in freed and h not in self.host_path)
+            if data_files:
+                self.endpoints = load_endpoints(self.conf_dir)
+                self.profiles = load_traffic_profiles(self.conf_dir)
+                self.data_version += 1
+            self.last_update = {'at': time.time(), 'changed': len(changed), 'removed': len(removed),
+                                'reparsed': len(parsed), 'seconds': round(time.perf_counter() - t0, 4),
+                                'version': self.topo.version}
+        if waiting:
+            # A duplicate can now own its hostname: re-read it on the next poll
+            for path in waiting:
+                self.watcher.stamps.pop(path, None)
+        return self.last_update
+
+    def ospf(self):
+        """The OSPF domain, kept across versions: link faults update its SPF trees incrementally."""
+        from cisco_vip_network_tool.src.control.ospf import OspfDomain
+        if self._ospf is None or self._ospf.topo is not self.topo:
+            self._ospf = OspfDomain(self.topo)
+        else:
+            self._ospf.sync()
+        return self._ospf
+
+    def status(self) -> Dict:
+        with self.lock:
+            g = self.topo.graph
+            links = self.cached('links', lambda: sum(1 for u, v in g.edges()
+                                                     if isinstance(u, tuple) and isinstance(v, tuple)))
+            return {'version': self.topo.version, 'data_version': self.data_version,
+                    'devices': len(self.topo.devices), 'links': links, 'endpoints': len(self.endpoints),
+                    'errors': dict(self.errors), 'duplicates': dict(self.duplicates),
+                    'last_update': self.last_update}
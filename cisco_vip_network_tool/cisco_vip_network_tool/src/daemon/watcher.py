@@ -0,0 +1,41 @@
+import fnmatch
+import os
+from typing import Dict, Iterable, List, Tuple
+
+Stamp = Tuple[int, int]    # (mtime_ns, size)
+
+class DirWatcher:
+    """Polls a directory for added, changed and removed files matching glob patterns.
+
+    Each poll is one os.scandir pass comparing (mtime_ns, size) with the previous pass, so it
+    costs a stat per file and needs no OS-specific notification API.
+    """
+    def __init__(self, root: str, patterns: Iterable[str]):
+        self.root = root
+        self.patterns = tuple(patterns)
+        self.stamps: Dict[str, Stamp] = {}
+
+    def snapshot(self) -> Dict[str, Stamp]:
+        out = {}
+        try:
+            entries = list(os.scandir(self.root))
+        except FileNotFoundError:
+            return out
+        for entry in entries:
+            if not any(fnmatch.fnmatch(entry.name, p) for p in self.patterns):
+                continue
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            if entry.is_file():
+                out[entry.path] = (st.st_mtime_ns, st.st_size)
+        return out
+
+    def poll(self) -> Tuple[List[str], List[str]]:
+        """(added or changed paths, removed paths) since the previous poll, each sorted."""
+        now = self.snapshot()
+        changed = sorted(p for p, s in now.items() if self.stamps.get(p) != s)
+        removed = sorted(p for p in self.stamps if p not in now)
+        self.stamps = now
+        return changed, removed
@@ -0,0 +1,329 @@
+from typing import Dict, List, Optional, Tuple
+import heapq
+import weakref
+import zlib
+import numpy as np
+from cisco_vip_network_tool.src.model.devices import Endpoint
+from cisco_vip_network_tool.src.topology.builder import Topology
+from cisco_vip_network_tool.src.load.profiles import TrafficProfile, bucket_curves, rate_of
+
+class LoadEngine:
+    """Routed load model over a Topology, with indexes and paths cached per topology version.
+
+    Each endpoint sends its demand to its gateway device (the SVI owning ep.gw, else the first SVI
+    of the VLAN) from an access switch of its VLAN. Endpoint records do not say which switch port
+    an endpoint sits on, so when several switches have access ports in the VLAN each endpoint
+    is pinned to one of those ports by a hash of its name: the VLAN's demand spreads over its
+    switches in proportion to their access ports, and repeated runs attach it the same way. A VLAN
+    without access ports attaches at the gateway device. Demand whose gateway cannot reach the
+    attachment switch adds no link load; unrouted() reports it. Gateway ->
+    attachment paths come from one early-exit Dijkstra per gateway device over
+    Topology.device_graph(), and are stored as a sparse path x link incidence (COO rows/cols)
+    so link loads are a single demand-vector x incidence product.
+    """
+    def __init__(self, topo: Topology):
+        self.topo = topo
+        self._version = None
+
+    def refresh(self):
+        """Rebuild indexes if the topology changed since the last call."""
+        if self._version == self.topo.version:
+            return
+        self.dgraph = self.topo.device_graph()
+        # Plain (neighbor, weight) lists: much cheaper to walk than networkx adjacency views
+        self._adj: Dict[str, List[Tuple[str, float]]] = {
+            u: [(v, a.get('weight', 1.0)) for v, a in nbrs.items()] for u, nbrs in self.dgraph.adjacency()}
+        self.links: List[Tuple] = list(self.topo.graph.edges())
+        self.link_pos = {}
+        for i, (u, v) in enumerate(self.links):
+            self.link_pos[(u, v)] = i
+            self.link_pos[(v, u)] = i
+        self.svi_by_ip: Dict[str, Tuple[str, str]] = {}
+        self.vlan_gw: Dict[int, Tuple[str, str]] = {}
+        self.vlan_access: Dict[int, List[str]] = {}        # VLAN -> switch of each access port
+        for host in sorted(self.topo.devices):
+            dev = self.topo.devices[host]
+            for ifn, iface in dev.interfaces.items():
+                low = ifn.lower()
+                if low.startswith('vlan') and iface.ip:
+                    try:
+                        vlan = int(low.replace('vlan', ''))
+                    except ValueError:
+                        continue
+                    self.svi_by_ip.setdefault(iface.ip.split('/')[0], (host, ifn))
+                    self.vlan_gw.setdefault(vlan, (host, ifn))
+                if iface.vlan is not None:
+                    self.vlan_access.setdefault(iface.vlan, []).append(host)
+        self._spt: Dict[str, Dict[str, Optional[List[str]]]] = {}  # src -> dst -> device path
+        self._alt: Dict[Tuple[str, str, int], List[List[str]]] = {}  # (a, b, k) -> detour paths
+        self._pairs: Dict[Tuple[str, str], int] = {}
+        self._routed: List[bool] = []                      # per pair row: gateway reaches attachment
+        self._rows: List[int] = []
+        self._cols: List[int] = []
+        self._version = self.topo.version
+
+    def gateway_for(self, ep: Endpoint) -> Optional[Tuple[str, str]]:
+        """(device, SVI) serving ep: the SVI that owns ep.gw, else the VLAN's first SVI."""
+        return self.svi_by_ip.get(str(ep.gw).split('/')[0]) or self.vlan_gw.get(ep.vlan)
+
+    def attachment_for(self, ep: Endpoint, gw_dev: str) -> str:
+        """Switch ep is attached at: one of its VLAN's access ports picked by name hash, else gw_dev."""
+        ports = self.vlan_access.get(ep.vlan)
+        if not ports:
+            return gw_dev
+        return ports[zlib.crc32(ep.name.encode()) % len(ports)]
+
+    def _dijkstra(self, src: str, targets=None, blocked=(), blocked_nodes=()):
+        """Dijkstra from src over device weights; stops once every target (if given) is settled.
+
+        blocked holds (u, v) device pairs (both orientations) to treat as removed, blocked_nodes
+        devices that may not be entered. Returns (dist, prev, settled).
+        """
+        adj = self._adj
+        dist = {src: 0.0}
+        prev: Dict[str, Optional[str]] = {src: None}
+        done = set()
+        if src not in adj:
+            return dist, prev, done
+        pending = set(targets) if targets is not None else None
+        heap = [(0.0, src)]
+        while heap and (pending is None or pending):
+            d, u = heapq.heappop(heap)
+            if u in done:
+                continue
+            done.add(u)
+            if pending is not None:
+                pending.discard(u)
+            for v, w in adj[u]:
+                if blocked and (u, v) in blocked:
+                    continue
+                if blocked_nodes and v in blocked_nodes:
+                    continue
+                nd = d + w
+                if v not in dist or nd < dist[v]:
+                    dist[v] = nd
+                    prev[v] = u
+                    heapq.heappush(heap, (nd, v))
+        return dist, prev, done
+
+    def _search(self, src: str, targets, blocked=(), blocked_nodes=()) -> Dict[str, List[str]]:
+        """Early-exit Dijkstra from src; returns target -> device path for reachable targets."""
+        _, prev, done = self._dijkstra(src, targets, blocked, blocked_nodes)
+        paths = {}
+        for t in targets:
+            if t in done:
+                hops = [t]
+                while prev[hops[-1]] is not None:
+                    hops.append(prev[hops[-1]])
+                paths[t] = hops[::-1]
+        return paths
+
+    def shortest_path_tree(self, src: str) -> Tuple[Dict[str, float], Dict[str, Optional[str]]]:
+        """Full (dist, parent) tree from src; its paths are the ones path()/prefetch() return."""
+        self.refresh()
+        dist, prev, _ = self._dijkstra(src)
+        return dist, prev
+
+    def path(self, src: str, dst: str) -> Optional[List[str]]:
+        """Cached shortest device path src -> dst (None if unreachable)."""
+        known = self._spt.setdefault(src, {})
+        if dst not in known:
+            known[dst] = self._search(src, [dst]).get(dst)
+        return known[dst]
+
+    def path_cost(self, hops: List[str]) -> float:
+        return sum(self.dgraph.edges[a, b]['weight'] for a, b in zip(hops, hops[1:]))
+
+    def k_shortest_paths(self, src: str, dst: str, k: int, blocked=()) -> List[List[str]]:
+        """Up to k loopless device paths src -> dst in cost order (Yen), avoiding blocked pairs."""
+        self.refresh()
+        first = self._search(src, [dst], blocked).get(dst)
+        if not first:
+            return []
+        found = [first]
+        seen = {tuple(first)}
+        candidates: List[Tuple[float, int, List[str]]] = []
+        tie = 0
+        while len(found) < k:
+            last = found[-1]
+            for i in range(len(last) - 1):
+                root = last[:i + 1]
+                cut = set(blocked)
+                for p in found:
+                    if len(p) > i + 1 and p[:i + 1] == root:
+                        cut.add((p[i], p[i + 1]))
+                        cut.add((p[i + 1], p[i]))
+                spur = self._search(root[-1], [dst], cut, set(root[:-1])).get(dst)
+                if spur:
+                    full = root[:-1] + spur
+                    if tuple(full) not in seen:
+                        seen.add(tuple(full))
+                        tie += 1
+                        heapq.heappush(candidates, (self.path_cost(full), tie, full))
+            if not candidates:
+                break
+            found.append(heapq.heappop(candidates)[2])
+        return found
+
+    def detours(self, a: str, b: str, k: int = 3) -> List[List[str]]:
+        """k shortest device paths a -> b that avoid the direct a-b edge, cached per topology
+        version so every overloaded link between the same two devices shares one computation."""
+        self.refresh()
+        key = (a, b, k)
+        if key not in self._alt:
+            rev = self._alt.get((b, a, k))
+            self._alt[key] = ([p[::-1] for p in rev] if rev is not None
+                              else self.k_shortest_paths(a, b, k, blocked={(a, b), (b, a)}))
+        return self._alt[key]
+
+    def prefetch(self, pairs):
+        """Compute paths for many (src, dst) pairs with one bounded search per distinct source."""
+        by_src: Dict[str, set] = {}
+        for src, dst in pairs:
+            if dst not in self._spt.get(src, {}):
+                by_src.setdefault(src, set()).add(dst)
+        for src, dsts in by_src.items():
+            found = self._search(src, dsts)
+            known = self._spt.setdefault(src, {})
+            for d in dsts:
+                known[d] = found.get(d)
+
+    def pair_index(self, gw_dev: str, attach_dev: str) -> int:
+        """Row of the (gateway, attachment) pair in the incidence, computing its path on first use."""
+        key = (gw_dev, attach_dev)
+        row = self._pairs.get(key)
+        if row is None:
+            row = len(self._pairs)
+            self._pairs[key] = row
+            hops = self.path(gw_dev, attach_dev)
+            self._routed.append(hops is not None)
+            hops = hops or [gw_dev]
+            for a, b in zip(hops, hops[1:]):
+                self._rows.append(row)
+                self._cols.append(self.link_pos[self.dgraph.edges[a, b]['link']])
+        return row
+
+    def endpoint_rows(self, endpoints: Dict[str, Endpoint]) -> Tuple[np.ndarray, List[Optional[Tuple[str, str]]]]:
+        """Incidence row per endpoint (-1 when no gateway) plus the resolved gateway keys."""
+        self.refresh()
+        rows = np.full(len(endpoints), -1, dtype=np.int64)
+        gws: List[Optional[Tuple[str, str]]] = []
+        # Resolve each distinct (vlan, gw) once, then route all new pairs in a batch
+        gw_of: Dict[Tuple[int, str], Optional[Tuple[str, str]]] = {}
+        keys = []
+        resolved: Dict[Tuple, Optional[Tuple[Tuple[str, str], str]]] = {}
+        for ep in endpoints.values():
+            vk = (ep.vlan, str(ep.gw))
+            if vk not in gw_of:
+                gw_of[vk] = self.gateway_for(ep)
+            gw = gw_of[vk]
+            mk = vk + ((self.attachment_for(ep, gw[0]),) if gw else ())
+            keys.append(mk)
+            if mk not in resolved:
+                resolved[mk] = (gw, mk[2]) if gw else None
+        self.prefetch((r[0][0], r[1]) for r in resolved.values() if r is not None)
+        memo = {mk: ((self.pair_index(r[0][0], r[1]), r[0]) if r else (-1, None)) for mk, r in resolved.items()}
+        for i, mk in enumerate(keys):
+            row, gw = memo[mk]
+            rows[i] = row
+            gws.append(gw)
+        return rows, gws
+
+    def pair_keys(self) -> List[Tuple[str, str]]:
+        """(gateway device, attachment device) of every incidence row, in row order."""
+        return list(self._pairs)
+
+    def routed_rows(self) -> np.ndarray:
+        """Per incidence row: whether the gateway reaches the attachment switch."""
+        return np.array(self._routed, dtype=bool)
+
+    def unrouted(self, endpoints: Dict[str, Endpoint], peak: bool = False,
+                 profiles: Optional[Dict[str, TrafficProfile]] = None) -> Dict[str, float]:
+        """Endpoint -> kbps of demand that adds no link load: no gateway, or no path to it."""
+        rows, _ = self.endpoint_rows(endpoints)
+        rates = self.endpoint_rates(endpoints, peak, profiles)
+        lost = rows < 0
+        lost[~lost] = ~self.routed_rows()[rows[~lost]]
+        names = list(endpoints)
+        return {names[i]: float(rates[i]) for i in np.flatnonzero(lost)}
+
+    def incidence(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(pair row, link column) COO arrays of the path incidence built so far."""
+        return np.asarray(self._rows, dtype=np.int64), np.asarray(self._cols, dtype=np.int64)
+
+    def pair_demand(self, rows: np.ndarray, rates: np.ndarray) -> np.ndarray:
+        """Total rate per (gateway, attachment) pair row."""
+        valid = rows >= 0
+        return np.bincount(rows[valid], weights=rates[valid], minlength=len(self._pairs))
+
+    def link_loads(self, rows: np.ndarray, rates: np.ndarray) -> np.ndarray:
+        """Per-link load vector: (per-pair demand) x (pair x link incidence)."""
+        demand = self.pair_demand(rows, rates)
+        r, c = self.incidence()
+        return np.bincount(c, weights=demand[r], minlength=len(self.links))
+
+    def endpoint_rates(self, endpoints: Dict[str, Endpoint], peak: bool = False,
+                       profiles: Optional[Dict[str, TrafficProfile]] = None) -> np.ndarray:
+        """Regular or peak kbps per endpoint from profiles (APP_DEFAULTS for apps they lack)."""
+        per_app = {}
+        for ep in endpoints.values():
+            if ep.app_profile not in per_app:
+                per_app[ep.app_profile] = rate_of(profiles, ep.app_profile, peak)
+        return np.fromiter((per_app[ep.app_profile] for ep in endpoints.values()),
+                           dtype=np.float64, count=len(endpoints))
+
+    def link_series(self, rows: np.ndarray, apps: np.ndarray, curves: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(link columns, links x buckets load) for endpoint rows whose app index selects a row of curves.
+
+        The endpoints x buckets demand matrix is curves[apps]; every endpoint row is its app's
+        curve, so it is evaluated factored: per-pair app counts (pairs x apps) @ curves gives
+        pairs x buckets, which the path incidence sums per link. Only loaded links are returned.
+        """
+        valid = rows >= 0
+        n_apps = curves.shape[0]
+        counts = np.bincount(rows[valid] * n_apps + apps[valid],
+                             minlength=len(self._pairs) * n_apps).reshape(len(self._pairs), n_apps)
+        pair_series = counts @ curves
+        r, c = self.incidence()
+        order = np.argsort(c, kind='stable')
+        r, c = r[order], c[order]
+        cols, starts = np.unique(c, return_index=True)
+        if not len(cols):
+            return cols, np.zeros((0, curves.shape[1]))
+        return cols, np.add.reduceat(pair_series[r], starts, axis=0)
+
+    def series(self, endpoints: Dict[str, Endpoint], profiles: Dict[str, TrafficProfile],
+               bucket_minutes: int = 5) -> Tuple[List[Tuple], np.ndarray]:
+        """(loaded backbone links, links x day-buckets kbps) for endpoints under profiles."""
+        rows, _ = self.endpoint_rows(endpoints)
+        names: Dict[str, int] = {}
+        apps = np.fromiter((names.setdefault(ep.app_profile, len(names)) for ep in endpoints.values()),
+                           dtype=np.int64, count=len(endpoints))
+        cols, loads = self.link_series(rows, apps, bucket_curves(profiles, list(names), bucket_minutes))
+        keep = loads.any(axis=1)
+        return [self.links[i] for i in cols[keep]], loads[keep]
+
+    def compute(self, endpoints: Dict[str, Endpoint], peak: bool = False, include_access: bool = True,
+                profiles: Optional[Dict[str, TrafficProfile]] = None) -> Dict:
+        """Edge key -> kbps for every loaded backbone link (plus HOST access edges if requested)."""
+        rows, gws = self.endpoint_rows(endpoints)
+        rates = self.endpoint_rates(endpoints, peak, profiles)
+        loads = np.rint(self.link_loads(rows, rates)).astype(np.int64)
+        out: Dict = {}
+        if include_access:
+            for ep, gw, rate in zip(endpoints.values(), gws, rates.tolist()):
+                if gw is not None:
+                    key = (f"HOST:{ep.name}", f"{gw[0]}:{gw[1]}")
+                    out[key] = out.get(key, 0) + int(round(rate))
+        for i in np.flatnonzero(loads):
+            out[self.links[i]] = int(loads[i])
+        return out
+
+_ENGINES: 'weakref.WeakKeyDictionary[Topology, LoadEngine]' = weakref.WeakKeyDictionary()
+
+def engine_for(topo: Topology) -> LoadEngine:
+    """Shared LoadEngine per Topology so paths survive across calls until the topology changes."""
+    eng = _ENGINES.get(topo)
+    if eng is None:
+        eng = _ENGINES[topo] = LoadEngine(topo)
+    return eng
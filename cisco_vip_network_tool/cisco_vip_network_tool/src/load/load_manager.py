@@ -1,74 +1,151 @@
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 from collections import defaultdict
 import networkx as nx
+import numpy as np
 from cisco_vip_network_tool.src.model.devices import Device, Endpoint
 from cisco_vip_network_tool.src.topology.builder import Topology
+from cisco_vip_network_tool.src.load.engine import engine_for
+from cisco_vip_network_tool.src.load.profiles import APP_DEFAULTS, TrafficProfile, default_profiles
 
-# Default per-app kbps (regular, peak)
-APP_DEFAULTS = {
-    'HTTP': (500, 1500),
-    'VoIP': (100, 200),
-    'Video': (2000, 5000),
-    'DB': (1000, 3000),
-}
-
-def compute_link_loads(topo: Topology, endpoints: Dict[str, Endpoint], peak: bool = False) -> Dict:
+def compute_link_loads(topo: Topology, endpoints: Dict[str, Endpoint], peak: bool = False,
+                       include_access: bool = True, profiles: Optional[Dict[str, TrafficProfile]] = None) -> Dict:
     """Compute aggregate kbps per link using shortest paths between endpoints and their gateways.
 
-    This is a simplified traffic model.
+    Demand is routed from each endpoint's access switch to its gateway device and added to every
+    traversed backbone link (see LoadEngine). HOST:<name> -> gateway access edges are kept in the
+    result for compatibility unless include_access is False.
+
+    Returns mapping: edge_key -> load_kbps. Demand that cannot be routed is left out; see
+    unrouted_demand.
+    """
+    return engine_for(topo).compute(endpoints, peak=peak, include_access=include_access, profiles=profiles)
+
+def unrouted_demand(topo: Topology, endpoints: Dict[str, Endpoint], peak: bool = False,
+                    profiles: Optional[Dict[str, TrafficProfile]] = None) -> Dict[str, float]:
+    """Endpoint -> kbps missing from compute_link_loads: no gateway SVI, or the gateway cannot
+    reach the endpoint's access switch."""
+    return engine_for(topo).unrouted(endpoints, peak=peak, profiles=profiles)
+
+class LoadSeries:
+    """Per-link kbps over one day in fixed buckets: series[i, b] is the load of links[i] in bucket b."""
+    def __init__(self, links: List[Tuple], series: np.ndarray, bucket_minutes: int):
+        self.links = links
+        self.series = series
+        self.bucket_minutes = bucket_minutes
+
+    def total(self) -> np.ndarray:
+        """Summed backbone load per bucket."""
+        return self.series.sum(axis=0) if len(self.links) else np.zeros(self.series.shape[1])
+
+    def hourly_total(self) -> np.ndarray:
+        """Mean summed backbone load per hour of day (24 values).
+
+        Each hour averages the buckets overlapping it, weighted by overlap, so buckets longer
+        than an hour (e.g. 120 minutes) count towards every hour they span.
+        """
+        total = self.total()
+        starts = np.arange(len(total)) * self.bucket_minutes
+        hours = np.arange(24)[:, None] * 60
+        overlap = np.clip(np.minimum(hours + 60, starts + self.bucket_minutes) - np.maximum(hours, starts), 0, None)
+        return overlap @ total / 60.0
+
+    def busiest_hour(self) -> Tuple[int, float]:
+        """(hour, mean summed kbps) of the hour with the most backbone traffic."""
+        hourly = self.hourly_total()
+        hour = int(np.argmax(hourly))
+        return hour, float(hourly[hour])
 
-    Returns mapping: edge_key -> load_kbps.
+    def link_peaks(self) -> Iterator[Tuple[Tuple, int, int]]:
+        """(link, peak kbps, minute of day the peak bucket starts) per link, busiest first."""
+        if not len(self.links):
+            return
+        peak_bucket = self.series.argmax(axis=1)
+        peaks = self.series[np.arange(len(self.links)), peak_bucket]
+        for i in np.argsort(-peaks, kind='stable'):
+            yield self.links[i], int(round(peaks[i])), int(peak_bucket[i]) * self.bucket_minutes
 
+    def at(self, minute: int) -> Dict:
+        """Edge key -> kbps in the bucket containing minute (same shape as compute_link_loads)."""
+        col = self.series[:, (minute % 1440) // self.bucket_minutes]
+        return {e: int(round(v)) for e, v in zip(self.links, col.tolist()) if v}
+
+def compute_load_series(topo: Topology, endpoints: Dict[str, Endpoint],
+                        profiles: Optional[Dict[str, TrafficProfile]] = None, bucket_minutes: int = 5) -> LoadSeries:
+    """Backbone link loads through one day from per-app hourly curves (see profiles.bucket_curves).
+
+    Access edges are left out: each carries a single endpoint's curve.
+    """
+    links, series = engine_for(topo).series(endpoints, profiles or default_profiles(), bucket_minutes)
+    return LoadSeries(links, series, bucket_minutes)
+
+def _hop_headroom(topo: Topology, dgraph: nx.Graph, link_loads: Dict) -> Dict[Tuple[str, str], int]:
+    """Spare kbps per device pair: sum over its up member links of max(0, capacity - load)."""
+    room = {}
+    for a, b, data in dgraph.edges(data=True):
+        spare = 0
+        for u, v in data['links']:
+            cap = topo.graph.edges[u, v].get('bandwidth_kbps') or 100000
+            load = link_loads.get((u, v), link_loads.get((v, u), 0))
+            spare += max(0, cap - load)
+        room[(a, b)] = room[(b, a)] = spare
+    return room
+
+def iter_capacity_findings(topo: Topology, link_loads: Dict, k: int = 3, max_rerouted: Optional[int] = None) -> Iterator[Dict]:
+    """Yield one finding per backbone link whose load exceeds its bandwidth, hottest first.
+
+    Each finding lists up to k detours between the link's two devices (Yen's k shortest paths
+    on the device graph without their direct edge, plus spare parallel links) with their headroom:
+    the smallest spare capacity along the path. Detours are cached per device pair in the
+    LoadEngine, so many hot links between the same devices cost one search. Only the
+    max_rerouted hottest links get detours when that is set.
     """
-    # Build helper index from device names to their VLAN SVIs for gateway mapping
-    vlan_gw = {}
-    for dev, data in topo.graph.nodes(data=True):
-        d = data.get('device')
-        if not d:
-            continue
-        for ifn, iface in d.interfaces.items():
-            if ifn.lower().startswith('vlan') and iface.ip:
-                try:
-                    vlan = int(ifn.lower().replace('vlan', ''))
-                    vlan_gw[(dev, vlan)] = (dev, ifn)
-                except Exception:
-                    pass
-
-    # Aggregate loads
-    loads = defaultdict(int)
-    for ep in endpoints.values():
-        rate = APP_DEFAULTS.get(ep.app_profile, (500, 1500))[1 if peak else 0]
-        # Find the gateway node for the VLAN
-        gw_key = None
-        for (dev, vlan), ifkey in vlan_gw.items():
-            if vlan == ep.vlan:
-                gw_key = ifkey  # (dev, ifn)
-                break
-        if not gw_key:
-            continue
-        # Path from 'host' to gateway is modeled as a single hop edge (host -> switch:VlanX)
-        # For backbone traffic between gateways, we route using graph shortest path
-        # Here we just add load on edges that are on path from gateway's device to others if needed.
-        # Simplification: traffic terminates at gateway (northbound traffic not modeled here).
-        # Add load on access edge (ep -> gw)
-        loads[(f"HOST:{ep.name}", f"{gw_key[0]}:{gw_key[1]}")] += rate
-
-    return dict(loads)
-
-def capacity_analysis(topo: Topology, link_loads: Dict) -> List[Dict]:
-    """Compare loads vs link bandwidth and recommend alternatives (k-shortest paths placeholder)."""
-    findings = []
+    hot = []
     for (u, v), load in link_loads.items():
         # Backbone link keys in topo use ((dev,if),(dev,if)) – here we also have host edges.
         if isinstance(u, tuple) and isinstance(v, tuple) and topo.graph.has_edge(u, v):
             cap = topo.graph.edges[u, v].get('bandwidth_kbps', 100000)
             if load > cap:
-                findings.append({
-                    'edge': (u, v),
-                    'load_kbps': load, 'capacity_kbps': cap,
-                    'recommendation': 'Enable secondary path or QoS to reclassify lower-priority traffic.'
-                })
-        else:
-            # Host access edge capacity assumed high; skip
-            pass
-    return findings
+                hot.append((load - cap, u, v, load, cap))
+        # Host access edge capacity assumed high; skip
+    if not hot:
+        return
+    hot.sort(key=lambda h: (-h[0], h[1], h[2]))
+    engine = engine_for(topo)
+    engine.refresh()
+    room = _hop_headroom(topo, engine.dgraph, link_loads)
+    for n, (excess, u, v, load, cap) in enumerate(hot):
+        alternatives = []
+        if max_rerouted is None or n < max_rerouted:
+            a, b = u[0], v[0]
+            if engine.dgraph.has_edge(a, b):
+                spare = 0
+                for x, y in engine.dgraph.edges[a, b]['links']:
+                    if {x, y} != {u, v}:
+                        c = topo.graph.edges[x, y].get('bandwidth_kbps') or 100000
+                        spare += max(0, c - link_loads.get((x, y), link_loads.get((y, x), 0)))
+                if spare:
+                    alternatives.append({'path': [a, b], 'via': 'parallel links', 'headroom_kbps': spare})
+            for path in engine.detours(a, b, k):
+                head = min(room.get(hop, 0) for hop in zip(path, path[1:]))
+                alternatives.append({'path': path, 'headroom_kbps': head})
+            alternatives.sort(key=lambda alt: -alt['headroom_kbps'])
+        yield {
+            'edge': (u, v),
+            'load_kbps': load, 'capacity_kbps': cap, 'excess_kbps': excess,
+            'alternatives': alternatives[:k],
+            'recommendation': _recommend(excess, alternatives),
+        }
+
+def _recommend(excess: int, alternatives: List[Dict]) -> str:
+    best = alternatives[0] if alternatives else None
+    if best is None or best['headroom_kbps'] <= 0:
+        return 'No detour with spare capacity: upgrade the link or apply QoS to lower-priority traffic.'
+    route = ' -> '.join(best['path']) + (f" ({best['via']})" if 'via' in best else '')
+    if best['headroom_kbps'] >= excess:
+        return f"Move {excess} kbps to {route}, which has {best['headroom_kbps']} kbps headroom."
+    return (f"Move up to {best['headroom_kbps']} kbps to {route}; the remaining {excess - best['headroom_kbps']} kbps "
+            f"needs more capacity or QoS.")
+
+def capacity_analysis(topo: Topology, link_loads: Dict, k: int = 3, max_rerouted: Optional[int] = None) -> List[Dict]:
+    """Compare loads vs link bandwidth and recommend detours with headroom (k shortest paths)."""
+    return list(iter_capacity_findings(topo, link_loads, k=k, max_rerouted=max_rerouted))
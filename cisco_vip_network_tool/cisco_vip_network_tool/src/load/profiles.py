@@ -0,0 +1,77 @@
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+import numpy as np
+import yaml
+
+# Default per-app kbps (regular, peak)
+APP_DEFAULTS = {
+    'HTTP': (500, 1500),
+    'VoIP': (100, 200),
+    'Video': (2000, 5000),
+    'DB': (1000, 3000),
+}
+UNKNOWN_APP = (500, 1500)
+BUSY_HOURS = range(9, 17)   # apps without an hourly curve run at peak_kbps in these hours, else regular
+PROFILES_FILE = 'traffic_profiles.yaml'
+
+@dataclass(slots=True)
+class TrafficProfile:
+    """Per-app demand: regular/peak kbps and an optional 24-entry curve of peak fractions by hour."""
+    name: str
+    regular_kbps: float
+    peak_kbps: float
+    hourly: Optional[List[float]] = None
+
+    def hourly_kbps(self) -> np.ndarray:
+        """kbps for hours 0..23: peak_kbps x hourly[h], or the BUSY_HOURS step without a curve."""
+        if self.hourly is not None:
+            return np.clip(np.asarray(self.hourly, dtype=np.float64), 0, None) * self.peak_kbps
+        out = np.full(24, float(self.regular_kbps))
+        out[list(BUSY_HOURS)] = self.peak_kbps
+        return out
+
+def default_profiles() -> Dict[str, TrafficProfile]:
+    return {app: TrafficProfile(app, reg, peak) for app, (reg, peak) in APP_DEFAULTS.items()}
+
+def parse_profiles(data: Dict) -> Dict[str, TrafficProfile]:
+    """{'profiles': {app: {regular_kbps, peak_kbps, hourly?}}} -> app -> TrafficProfile.
+
+    Apps missing from the file keep their APP_DEFAULTS rates; an hourly curve must have 24 entries.
+    """
+    profiles = default_profiles()
+    for app, spec in ((data or {}).get('profiles') or {}).items():
+        reg, peak = APP_DEFAULTS.get(app, UNKNOWN_APP)
+        hourly = spec.get('hourly')
+        if hourly is not None and len(hourly) != 24:
+            raise ValueError(f"traffic profile {app}: hourly curve needs 24 values, got {len(hourly)}")
+        profiles[app] = TrafficProfile(app, float(spec.get('regular_kbps', reg)), float(spec.get('peak_kbps', peak)),
+                                       [float(x) for x in hourly] if hourly is not None else None)
+    return profiles
+
+def load_traffic_profiles(conf_dir: str) -> Dict[str, TrafficProfile]:
+    """traffic_profiles.yaml from conf_dir, or the built-in defaults when there is none."""
+    path = os.path.join(conf_dir, PROFILES_FILE)
+    if not os.path.exists(path):
+        return default_profiles()
+    with open(path) as fh:
+        return parse_profiles(yaml.safe_load(fh))
+
+def rate_of(profiles: Optional[Dict[str, TrafficProfile]], app: str, peak: bool) -> float:
+    prof = profiles.get(app) if profiles else None
+    if prof is None:
+        return APP_DEFAULTS.get(app, UNKNOWN_APP)[1 if peak else 0]
+    return prof.peak_kbps if peak else prof.regular_kbps
+
+def bucket_curves(profiles: Dict[str, TrafficProfile], apps: List[str], bucket_minutes: int) -> np.ndarray:
+    """apps x buckets kbps over one day; hourly values sit at the middle of each hour and are
+    interpolated linearly (wrapping at midnight) to the middle of every bucket."""
+    if bucket_minutes <= 0 or 1440 % bucket_minutes:
+        raise ValueError(f"bucket_minutes must divide 1440, got {bucket_minutes}")
+    mids = (np.arange(1440 // bucket_minutes) + 0.5) * bucket_minutes / 60.0
+    hours = np.arange(24) + 0.5
+    out = np.empty((len(apps), len(mids)))
+    for i, app in enumerate(apps):
+        prof = profiles.get(app) or TrafficProfile(app, *UNKNOWN_APP)
+        out[i] = np.interp(mids, hours, prof.hourly_kbps(), period=24)
+    return out
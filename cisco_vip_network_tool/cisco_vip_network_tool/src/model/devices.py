@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
-@dataclass
+@dataclass(slots=True)
 class Interface:
     """Represents a L3 or L2 interface on a device."""
     name: str
@@ -10,8 +10,10 @@ class Interface:
     bandwidth_kbps: Optional[int] = None  # capacity in kbps
     vlan: Optional[int] = None            # access VLAN for L2 ports
     description: Optional[str] = None     # used for link inference
+    mode: Optional[str] = None            # 'switchport mode': 'access' | 'trunk'
+    trunk_vlans: Optional[List[int]] = None  # allowed VLANs on a trunk; None = all
 
-@dataclass
+@dataclass(slots=True)
 class Device:
     """Base device class."""
     hostname: str
@@ -21,7 +23,7 @@ class Device:
     vlans: Dict[int, Dict] = field(default_factory=dict)       # {10: {'name': 'Users'}}
     default_gateways: Dict[int, str] = field(default_factory=dict)  # VLAN -> gateway IP/CIDR
 
-@dataclass
+@dataclass(slots=True)
 class Endpoint:
     """Represents an endpoint/host connected to an access VLAN."""
     name: str
@@ -1,7 +1,11 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Tuple
+from cisco_vip_network_tool.src.model.devices import Device
 
-@dataclass
+NodeKey = Tuple[str, str]               # (hostname, interface) node of the interface graph
+EdgeKey = Tuple[NodeKey, NodeKey]
+
+@dataclass(slots=True)
 class Link:
     """Represents a link between two device interfaces."""
     a_dev: str
@@ -12,3 +16,14 @@ class Link:
     latency_ms: float = 1.0
     mtu: Optional[int] = None
     up: bool = True  # used for fault injection
+
+def link_for_hint(da: Device, a_if: str, db: Device, b_if: str) -> Link:
+    """Link between resolved interfaces: MTU is the smaller configured side, bandwidth comes from side a."""
+    a = da.interfaces.get(a_if)
+    b = db.interfaces.get(b_if)
+    mtu = None
+    if a and a.mtu and b and b.mtu:
+        mtu = min(a.mtu, b.mtu)
+    bw = (a.bandwidth_kbps or 100000) if a else 100000
+    return Link(a_dev=da.hostname, a_if=a_if, b_dev=db.hostname, b_if=b_if,
+                bandwidth_kbps=bw, mtu=mtu, up=True)
@@ -0,0 +1,85 @@
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import Optional
+from cisco_vip_network_tool.src.model.devices import Device
+from cisco_vip_network_tool.src.parsers.cisco_parser import PARSER_VERSION
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'cisco_vip_network_tool', 'parse')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+_SUFFIX = '.dev'
+
+class ParseCache:
+    """Content-addressed on-disk cache of parsed Device objects.
+
+    Entries are keyed by sha256(parser version + raw file bytes) and stored as pickles, so a
+    changed file or a parser upgrade is simply a miss. File mtimes double as LRU timestamps:
+    hits touch the entry and evict() drops the least recently used entries above max_bytes.
+    """
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key_for(data) -> str:
+        """Hash raw config bytes (bytes, mmap or any buffer) together with PARSER_VERSION."""
+        h = hashlib.sha256(PARSER_VERSION.encode())
+        h.update(b'\0')
+        h.update(data)
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + _SUFFIX)
+
+    def get(self, key: str) -> Optional[Device]:
+        """Return the cached Device for key, or None on a miss or unreadable entry."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as fh:
+                dev = pickle.load(fh)
+            os.utime(path)
+            return dev
+        except Exception:
+            return None
+
+    def put(self, key: str, device: Device):
+        """Store device under key; written to a temp file and renamed so readers never see partial entries."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                pickle.dump(device, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache fits max_bytes. Returns entries removed."""
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(_SUFFIX):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                removed += 1
+            except OSError:
+                pass
+        return removed
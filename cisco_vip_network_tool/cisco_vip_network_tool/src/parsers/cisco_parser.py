@@ -1,8 +1,11 @@
 import re
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Optional, TextIO, Tuple
 from ipaddress import ip_interface
 from cisco_vip_network_tool.src.model.devices import Device, Interface
 
+# Bump whenever parser output (or the Device/Interface layout) changes; keys the parse cache.
+PARSER_VERSION = '4'
+
 LINK_TAG = re.compile(r"LINK:([A-Za-z0-9_-]+):([^\s]+)-([A-Za-z0-9_-]+):([^\s]+)")  # LINK:R1:Gi0/0-R2:Gi0/0
 
 def _mask_to_prefix(mask: str) -> int:
@@ -11,8 +14,43 @@ def _mask_to_prefix(mask: str) -> int:
     bits = ''.join(f"{p:08b}" for p in parts)
     return bits.count('1')
 
-def parse_config(text: str) -> Device:
-    """Parse a Cisco-like config dump into a Device object.
+def _vlan_list(spec: str) -> List[int]:
+    """'10,20,30-32' -> [10, 20, 30, 31, 32]."""
+    out = set()
+    for part in spec.split(','):
+        part = part.strip()
+        if '-' in part:
+            lo, hi = part.split('-', 1)
+            out.update(range(int(lo), int(hi) + 1))
+        elif part:
+            out.add(int(part))
+    return sorted(out)
+
+def _apply_trunk_allowed(iface: Interface, arg: str):
+    """Apply 'switchport trunk allowed vlan <arg>' (list, add/remove/except list, all, none)."""
+    words = arg.split()
+    if not words:
+        return
+    try:
+        if words[0] == 'all':
+            iface.trunk_vlans = None
+        elif words[0] == 'none':
+            iface.trunk_vlans = []
+        elif words[0] == 'add' and len(words) > 1:
+            if iface.trunk_vlans is not None:     # adding to "all" (None) leaves it at all
+                iface.trunk_vlans = sorted(set(iface.trunk_vlans) | set(_vlan_list(words[1])))
+        elif words[0] == 'remove' and len(words) > 1:
+            base = iface.trunk_vlans if iface.trunk_vlans is not None else range(1, 4095)
+            iface.trunk_vlans = sorted(set(base) - set(_vlan_list(words[1])))
+        elif words[0] == 'except' and len(words) > 1:
+            iface.trunk_vlans = sorted(set(range(1, 4095)) - set(_vlan_list(words[1])))
+        else:
+            iface.trunk_vlans = _vlan_list(words[0])
+    except ValueError:
+        pass
+
+def parse_config_regex(text: str) -> Device:
+    """Reference regex parser (whole-text scans); kept for parity checks against the streaming engine.
     Supports interfaces (ip, mtu, bandwidth), routing (ospf/bgp), VLANs, and interface descriptions.
     """
     # Hostname
@@ -70,6 +108,13 @@ def parse_config(text: str) -> Device:
         if vlm:
             iface.vlan = int(vlm.group(1))
 
+        # L2 mode and trunk allowed VLANs (each allowed line applies in order)
+        modem = re.search(r"\n\s*switchport mode\s+(access|trunk)\b", body)
+        if modem:
+            iface.mode = modem.group(1)
+        for am in re.finditer(r"\n\s*switchport trunk allowed vlan\s+(.+)", body):
+            _apply_trunk_allowed(iface, am.group(1))
+
         device.interfaces[ifname] = iface
 
     # Routing protocols (basic)
@@ -91,6 +136,176 @@ def parse_config(text: str) -> Device:
 
     return device
 
+# Line patterns for the streaming engine; matched against a single (stripped) line.
+_RE_HOSTNAME = re.compile(r"hostname\s+(\S+)")
+_RE_VLAN = re.compile(r"vlan\s+(\d+)")
+_RE_VLAN_NAME = re.compile(r"\s+name\s+(\S+)")
+_RE_IFACE = re.compile(r"interface\s+(\S+)")
+_RE_ROUTER = re.compile(r"router\s+(ospf|bgp)(?:\s+(\d+))?")
+_RE_DESC = re.compile(r"description\s+(.+)")
+_RE_IP = re.compile(r"ip address\s+(\S+)(?:\s+(\S+))?")
+_RE_MTU = re.compile(r"mtu\s+(\d+)")
+_RE_BW = re.compile(r"bandwidth\s+(\d+)")
+_RE_ACCESS_VLAN = re.compile(r"switchport access vlan\s+(\d+)")
+_RE_MODE = re.compile(r"switchport mode\s+(access|trunk)\b")
+_RE_TRUNK_ALLOWED = re.compile(r"switchport trunk allowed vlan\s+(.+)")
+_RE_OSPF_NET = re.compile(r"network\s+(\S+)\s+(\S+)\s+area\s+(\S+)")
+_RE_BGP_NEIGH = re.compile(r"neighbor\s+(\S+)\s+remote-as\s+(\d+)")
+
+def parse_config(text: str) -> Device:
+    """Parse a Cisco-like config dump into a Device object.
+    Supports interfaces (ip, mtu, bandwidth), routing (ospf/bgp), VLANs, and interface descriptions.
+    """
+    return parse_config_lines(text.splitlines())
+
+def parse_config_file(fh: TextIO) -> Device:
+    """Parse an open config file line by line without reading it into memory."""
+    return parse_config_lines(fh)
+
+def _close_interface(device: Device, iface: Interface, ip_pending: Optional[str]):
+    """Finish an interface block: apply the 'ip address a.b.c.d/nn' fallback and store it."""
+    if ip_pending and '/' in ip_pending:
+        iface.ip = ip_pending
+    device.interfaces[iface.name] = iface
+
+def parse_config_lines(lines: Iterable[str]) -> Device:
+    """Single-pass, line-oriented state machine over a config dump.
+
+    Accepts any iterable of lines (list, file object, generator) and produces the same
+    Device/Interface objects as parse_config_regex. Interface blocks end at '!' or the
+    next 'interface'; router blocks end at '!' or the next 'router'.
+    """
+    hostname = None
+    is_router = False
+    vlans: Dict[int, Dict] = {}
+    routing: Dict[str, Dict] = {}
+    device = Device(hostname="UNKNOWN", type="switch", vlans=vlans, routing=routing)
+
+    iface: Optional[Interface] = None
+    ip_seen = False            # an 'ip address <ip> <mask>' line was consumed for iface
+    ip_pending = None          # first single-token 'ip address' argument for iface
+    rtr_kind = None            # 'ospf' | 'bgp' while inside a router block
+    rtr_section: Optional[Dict] = None
+    pending_vlan = None        # VLAN id whose 'name' may follow on the next line
+
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if pending_vlan is not None:
+            nm = _RE_VLAN_NAME.match(line)
+            if nm:
+                vlans[pending_vlan]["name"] = nm.group(1)
+            pending_vlan = None
+        if not line:
+            continue
+        head = line[0]
+
+        # Column-0 lines: section headers and terminators
+        if head == '!':
+            if iface is not None:
+                _close_interface(device, iface, None if ip_seen else ip_pending)
+                iface = None
+            rtr_kind = None
+            continue
+        if not head.isspace():
+            if line.startswith('interface'):
+                if iface is not None:
+                    _close_interface(device, iface, None if ip_seen else ip_pending)
+                    iface = None
+                im = _RE_IFACE.match(line)
+                if im:
+                    iface = Interface(name=im.group(1))
+                    ip_seen = False
+                    ip_pending = None
+                continue
+            if line.startswith('router'):
+                rtr_kind = None
+                rm = _RE_ROUTER.match(line)
+                if rm:
+                    is_router = True
+                    kind, num = rm.group(1), rm.group(2)
+                    if num is not None:
+                        rtr_kind = kind
+                        if kind == 'ospf':
+                            rtr_section = routing.setdefault("ospf", {"process": num, "networks": []})
+                        else:
+                            rtr_section = routing.setdefault("bgp", {"asn": num, "neighbors": []})
+                continue
+            elif line.startswith('hostname'):
+                if hostname is None:
+                    hm = _RE_HOSTNAME.match(line)
+                    if hm:
+                        hostname = hm.group(1)
+                continue
+            elif line.startswith('vlan'):
+                vm = _RE_VLAN.match(line)
+                if vm:
+                    vid = int(vm.group(1))
+                    vlans[vid] = {"name": f"VLAN{vid}"}
+                    if vm.end() == len(line):
+                        pending_vlan = vid
+                continue
+
+        # Body lines belong to whichever blocks are currently open
+        body = line.lstrip()
+        if iface is not None:
+            if body.startswith('description'):
+                if iface.description is None:
+                    dm = _RE_DESC.match(body)
+                    if dm:
+                        iface.description = dm.group(1).strip()
+            elif body.startswith('ip address'):
+                ipm = _RE_IP.match(body)
+                if ipm and not ip_seen:
+                    if ipm.group(2) is not None:
+                        ip_seen = True
+                        try:
+                            iface.ip = f"{ipm.group(1)}/{_mask_to_prefix(ipm.group(2))}"
+                        except Exception:
+                            pass
+                    elif ip_pending is None:
+                        ip_pending = ipm.group(1)
+            elif body.startswith('mtu'):
+                if iface.mtu is None:
+                    mm = _RE_MTU.match(body)
+                    if mm:
+                        iface.mtu = int(mm.group(1))
+            elif body.startswith('bandwidth'):
+                if iface.bandwidth_kbps is None:
+                    bm = _RE_BW.match(body)
+                    if bm:
+                        iface.bandwidth_kbps = int(bm.group(1))
+            elif body.startswith('switchport access vlan'):
+                if iface.vlan is None:
+                    am = _RE_ACCESS_VLAN.match(body)
+                    if am:
+                        iface.vlan = int(am.group(1))
+            elif body.startswith('switchport mode'):
+                if iface.mode is None:
+                    mm = _RE_MODE.match(body)
+                    if mm:
+                        iface.mode = mm.group(1)
+            elif body.startswith('switchport trunk allowed vlan'):
+                tm = _RE_TRUNK_ALLOWED.match(body)
+                if tm:
+                    _apply_trunk_allowed(iface, tm.group(1))
+        if rtr_kind == 'ospf':
+            if body.startswith('network'):
+                nm = _RE_OSPF_NET.match(body)
+                if nm:
+                    rtr_section["networks"].append(
+                        {"ip": nm.group(1), "wildcard": nm.group(2), "area": nm.group(3)})
+        elif rtr_kind == 'bgp':
+            if body.startswith('neighbor'):
+                bm = _RE_BGP_NEIGH.match(body)
+                if bm:
+                    rtr_section["neighbors"].append({"neighbor": bm.group(1), "asn": bm.group(2)})
+
+    if iface is not None:
+        _close_interface(device, iface, None if ip_seen else ip_pending)
+    device.hostname = hostname or "UNKNOWN"
+    device.type = "router" if is_router else "switch"
+    return device
+
 def extract_link_hints(device: Device) -> List[Tuple[str, str, str, str]]:
     """From interface descriptions like
     'LINK:R1:Gi0/0-R2:Gi0/0' return tuples (R1,Gi0/0,R2,Gi0/0).
@@ -0,0 +1,57 @@
+import csv
+import json
+import os
+from typing import Dict, Iterator
+import yaml
+from cisco_vip_network_tool.src.model.devices import Endpoint
+
+try:
+    from yaml import CSafeLoader as _YamlLoader      # libyaml, roughly 10x faster
+except ImportError:                                  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
+# Searched in this order; the first file present is used
+ENDPOINT_FILES = ('endpoints.jsonl', 'endpoints.csv', 'endpoints.yaml')
+CSV_FIELDS = ('name', 'vlan', 'ip', 'gw', 'app_profile')
+
+def _endpoint(name: str, spec: Dict) -> Endpoint:
+    return Endpoint(name=name, vlan=int(spec['vlan']), ip=spec['ip'], gw=spec['gw'], app_profile=spec['app_profile'])
+
+def iter_endpoints_yaml(path: str) -> Iterator[Endpoint]:
+    """endpoints.yaml: {'endpoints': {name: {vlan, ip, gw, app_profile}}}, read with the C loader."""
+    with open(path) as fh:
+        data = yaml.load(fh, Loader=_YamlLoader) or {}
+    for name, spec in (data.get('endpoints') or {}).items():
+        yield _endpoint(name, spec)
+
+def iter_endpoints_csv(path: str) -> Iterator[Endpoint]:
+    """endpoints.csv: header name,vlan,ip,gw,app_profile; one endpoint per row, streamed."""
+    with open(path, newline='') as fh:
+        for row in csv.DictReader(fh):
+            yield _endpoint(row['name'], row)
+
+def iter_endpoints_jsonl(path: str) -> Iterator[Endpoint]:
+    """endpoints.jsonl: one {"name", "vlan", "ip", "gw", "app_profile"} object per line, streamed."""
+    with open(path) as fh:
+        for line in fh:
+            if line.strip():
+                spec = json.loads(line)
+                yield _endpoint(spec['name'], spec)
+
+_READERS = {'.jsonl': iter_endpoints_jsonl, '.csv': iter_endpoints_csv, '.yaml': iter_endpoints_yaml}
+
+def endpoints_path(conf_dir: str):
+    for name in ENDPOINT_FILES:
+        path = os.path.join(conf_dir, name)
+        if os.path.exists(path):
+            return path
+    return None
+
+def iter_endpoints(path: str) -> Iterator[Endpoint]:
+    """Endpoints of a .jsonl, .csv or .yaml file, by extension."""
+    return _READERS[os.path.splitext(path)[1]](path)
+
+def load_endpoints(conf_dir: str) -> Dict[str, Endpoint]:
+    """Load endpoints.jsonl, endpoints.csv or endpoints.yaml (first found) from conf_dir."""
+    path = endpoints_path(conf_dir)
+    return {ep.name: ep for ep in iter_endpoints(path)} if path else {}
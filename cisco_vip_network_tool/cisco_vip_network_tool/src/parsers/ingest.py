@@ -0,0 +1,111 @@
+import glob
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Dict, Iterator, List, Optional, Tuple
+from cisco_vip_network_tool.src.model.devices import Device
+from cisco_vip_network_tool.src.parsers.cisco_parser import parse_config_lines
+from cisco_vip_network_tool.src.parsers.cache import ParseCache, DEFAULT_MAX_BYTES
+
+CONFIG_GLOB = '*.config.dump'
+
+@dataclass
+class IngestResult:
+    """Outcome of a bulk ingestion run over a config directory."""
+    devices: Dict[str, Device] = field(default_factory=dict)
+    duplicates: List[Tuple[str, str, str]] = field(default_factory=list)  # (hostname, kept_path, skipped_path)
+    errors: List[Tuple[str, str]] = field(default_factory=list)           # (path, error message)
+    paths: Dict[str, str] = field(default_factory=dict)                   # hostname -> path it came from
+    cache_hits: int = 0
+
+def _decode_lines(buf) -> Iterator[str]:
+    for raw in iter(buf.readline, b''):
+        yield raw.decode('utf-8', errors='replace')
+
+def iter_mmap_lines(path: str) -> Iterator[str]:
+    """Yield decoded lines of a file through a read-only memory map (no full-text copy)."""
+    with open(path, 'rb') as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            return
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from _decode_lines(mm)
+
+def parse_config_path(path: str, cache: Optional[ParseCache] = None) -> Tuple[Device, bool]:
+    """Parse a single config dump from disk using the streaming parser over an mmap.
+
+    With a cache, the mapped bytes are hashed first and a hit skips parsing entirely.
+    Returns (device, cache_hit).
+    """
+    with open(path, 'rb') as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            return parse_config_lines(()), False
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if cache is None:
+                return parse_config_lines(_decode_lines(mm)), False
+            key = cache.key_for(mm)
+            dev = cache.get(key)
+            if dev is not None:
+                return dev, True
+            dev = parse_config_lines(_decode_lines(mm))
+            cache.put(key, dev)
+            return dev, False
+
+def _parse_batch(paths: List[str], cache_dir: Optional[str] = None,
+                 cache_max_bytes: int = DEFAULT_MAX_BYTES) -> List[Tuple[str, Optional[Device], Optional[str], bool]]:
+    """Worker entry point: parse a batch of files, capturing per-file errors."""
+    cache = ParseCache(cache_dir, cache_max_bytes) if cache_dir else None
+    out = []
+    for path in paths:
+        try:
+            dev, hit = parse_config_path(path, cache)
+            out.append((path, dev, None, hit))
+        except Exception as exc:
+            out.append((path, None, f"{type(exc).__name__}: {exc}", False))
+    return out
+
+def _batches(items: List[str], size: int) -> List[List[str]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def ingest_configs(conf_dir: str, workers: int = 1, batch_size: int = 64,
+                   cache_dir: Optional[str] = None, cache_max_bytes: int = DEFAULT_MAX_BYTES) -> IngestResult:
+    """Parse every *.config.dump under conf_dir, optionally in a process pool.
+
+    workers=1 parses in-process, workers=0 uses one worker per CPU. Files are handed out in
+    batches of batch_size paths to amortise IPC. Results are merged in sorted path order so the
+    first file (by path) wins a hostname; later ones are reported as duplicates.
+    With cache_dir set, unchanged files are served from the ParseCache and the cache is
+    trimmed to cache_max_bytes afterwards.
+    """
+    paths = sorted(glob.glob(os.path.join(conf_dir, CONFIG_GLOB)))
+    batches = _batches(paths, max(1, batch_size))
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    work = partial(_parse_batch, cache_dir=cache_dir, cache_max_bytes=cache_max_bytes)
+    if workers > 1 and len(batches) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(batches))) as pool:
+            parsed = [r for batch in pool.map(work, batches) for r in batch]
+    else:
+        parsed = [r for batch in batches for r in work(batch)]
+    if cache_dir:
+        ParseCache(cache_dir, cache_max_bytes).evict()
+    return merge_parsed(parsed)
+
+def merge_parsed(parsed: List[Tuple[str, Optional[Device], Optional[str], bool]]) -> IngestResult:
+    """Merge (path, device, error, cache_hit) tuples deterministically by hostname."""
+    result = IngestResult()
+    owners: Dict[str, str] = {}
+    for path, dev, err, hit in sorted(parsed, key=lambda r: r[0]):
+        result.cache_hits += hit
+        if err is not None:
+            result.errors.append((path, err))
+            continue
+        if dev.hostname in owners:
+            result.duplicates.append((dev.hostname, owners[dev.hostname], path))
+            continue
+        owners[dev.hostname] = path
+        result.devices[dev.hostname] = dev
+    result.devices = dict(sorted(result.devices.items()))
+    result.paths = owners
+    return result
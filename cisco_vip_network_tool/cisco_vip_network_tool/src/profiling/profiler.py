@@ -0,0 +1,218 @@
+import cProfile
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence
+
+LATENCY_BOUNDS = [1e-6 * 2 ** i for i in range(21)]          # 1us .. ~1s
+DEPTH_BOUNDS = [0] + [2 ** i for i in range(17)]               # 0, 1, 2, 4 .. 65536
+
+class Histogram:
+    """Fixed-bucket histogram; counts[i] holds values <= bounds[i] (last bucket is +Inf)."""
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, v: float):
+        self.counts[bisect_left(self.bounds, v)] += 1
+        self.count += 1
+        self.sum += v
+        if v > self.max:
+            self.max = v
+
+    def merge(self, other: 'Histogram'):
+        for i, c in enumerate(other.counts):
+            self.counts[i] += c
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (max for the overflow bucket)."""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank and c:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+    def to_dict(self) -> Dict:
+        return {'count': self.count, 'sum': self.sum, 'mean': self.sum / self.count if self.count else 0.0,
+                'p50': self.quantile(0.5), 'p99': self.quantile(0.99), 'max': self.max,
+                'buckets': [[b, c] for b, c in zip(self.bounds + ['+Inf'], self.counts) if c]}
+
+class SimMetrics:
+    """Message handling latency (per message type) and queue depth samples of a simulation run.
+
+    Runtimes give each Node a SimMetrics (per thread, merged afterwards, or one shared instance in
+    single-threaded runtimes); Node._handle records handling latency, the runtime samples queue depth.
+    """
+    def __init__(self):
+        self.handle: Dict[str, Histogram] = {}
+        self.depth = Histogram(DEPTH_BOUNDS)
+
+    def observe_handle(self, kind: str, seconds: float):
+        h = self.handle.get(kind)
+        if h is None:
+            h = self.handle[kind] = Histogram(LATENCY_BOUNDS)
+        h.observe(seconds)
+
+    def merge(self, other: 'SimMetrics'):
+        for kind, h in other.handle.items():
+            mine = self.handle.get(kind)
+            if mine is None:
+                mine = self.handle[kind] = Histogram(LATENCY_BOUNDS)
+            mine.merge(h)
+        self.depth.merge(other.depth)
+
+    def summary(self, stats: Dict[str, Dict], wall_s: float, sim_s: Optional[float] = None) -> Dict:
+        sent = sum(s.get('sent', 0) for s in stats.values())
+        handled = sum(h.count for h in self.handle.values())
+        out = {'nodes': len(stats), 'wall_s': wall_s, 'messages_sent': sent, 'messages_handled': handled,
+               'messages_dropped': sum(s.get('dropped', 0) for s in stats.values()),
+               'handled_per_wall_s': handled / wall_s if wall_s else 0.0,
+               'handle_latency_s': {k: h.to_dict() for k, h in sorted(self.handle.items())},
+               'queue_depth': self.depth.to_dict()}
+        if sim_s:
+            out['sim_s'] = sim_s
+            out['handled_per_sim_s'] = handled / sim_s
+        return out
+
+class StageProfiler:
+    """Wall time, CPU time and peak traced memory per named stage.
+
+    Stages nest ('validate' -> 'validate.duplicate_ips'); a parent's peak includes its children.
+    With cprofile_stage set, that stage (full dotted name) runs under cProfile and the stats are
+    dumped to cprofile_out. A disabled profiler's stage() does nothing.
+    """
+    def __init__(self, enabled: bool = True, memory: bool = True, cprofile_stage: Optional[str] = None,
+                 cprofile_out: Optional[str] = None):
+        self.enabled = enabled
+        self.memory = memory and enabled
+        self.cprofile_stage = cprofile_stage
+        self.cprofile_out = cprofile_out or f"{cprofile_stage}.prof"
+        self.stages: Dict[str, Dict] = {}
+        self.simulation: Optional[Dict] = None
+        self._stack: List[List] = []          # open stages: [name, base_bytes, peak_seen_bytes]
+        self._traced = False
+
+    def start(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._traced = True
+
+    def stop(self):
+        if self._traced:
+            tracemalloc.stop()
+            self._traced = False
+
+    def _mem_enter(self) -> int:
+        cur, peak = tracemalloc.get_traced_memory()
+        for frame in self._stack:
+            frame[2] = max(frame[2], peak)
+        tracemalloc.reset_peak()
+        return cur
+
+    def _mem_exit(self, base: int, seen: int) -> int:
+        peak = max(seen, tracemalloc.get_traced_memory()[1])
+        for frame in self._stack:
+            frame[2] = max(frame[2], peak)
+        return peak - base
+
+    @contextmanager
+    def stage(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        full = '.'.join([f[0] for f in self._stack] + [name])
+        tracing = self.memory and tracemalloc.is_tracing()
+        base = self._mem_enter() if tracing else 0
+        frame = [name, base, 0]
+        self._stack.append(frame)
+        prof = cProfile.Profile() if full == self.cprofile_stage else None
+        w0, c0 = time.perf_counter(), time.process_time()
+        if prof:
+            prof.enable()
+        try:
+            yield
+        finally:
+            if prof:
+                prof.disable()
+            wall, cpu = time.perf_counter() - w0, time.process_time() - c0
+            self._stack.pop()
+            rec = self.stages.setdefault(full, {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0})
+            rec['calls'] += 1
+            rec['wall_s'] += wall
+            rec['cpu_s'] += cpu
+            if tracing:
+                rec['peak_bytes'] = max(rec.get('peak_bytes', 0), self._mem_exit(base, frame[2]))
+            if prof:
+                prof.dump_stats(self.cprofile_out)
+                rec['cprofile'] = self.cprofile_out
+
+    def report(self) -> Dict:
+        return {'meta': {'python': platform.python_version(), 'platform': platform.platform(), 'pid': os.getpid(),
+                         'argv': sys.argv[1:], 'memory_traced': self.memory,
+                         'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())},
+                'stages': self.stages, 'simulation': self.simulation}
+
+NULL_PROFILER = StageProfiler(enabled=False)
+
+def _labels(**kw) -> str:
+    if not kw:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in kw.items()) + '}'
+
+def to_prometheus(report: Dict, prefix: str = 'vipnet') -> str:
+    """Render a StageProfiler.report() in the Prometheus text exposition format."""
+    lines = []
+
+    def metric(name: str, kind: str, help_: str, samples: List):
+        lines.append(f"# HELP {prefix}_{name} {help_}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+        for suffix, labels, value in samples:
+            lines.append(f"{prefix}_{name}{suffix}{labels} {value:g}")
+
+    stages = report.get('stages') or {}
+    metric('stage_wall_seconds', 'gauge', 'Wall-clock time spent in a pipeline stage.',
+           [('', _labels(stage=s), r['wall_s']) for s, r in stages.items()])
+    metric('stage_cpu_seconds', 'gauge', 'Process CPU time spent in a pipeline stage.',
+           [('', _labels(stage=s), r['cpu_s']) for s, r in stages.items()])
+    peaks = [('', _labels(stage=s), r['peak_bytes']) for s, r in stages.items() if 'peak_bytes' in r]
+    if peaks:
+        metric('stage_peak_bytes', 'gauge', 'Peak traced Python memory above the stage start.', peaks)
+    sim = report.get('simulation')
+    if sim:
+        metric('sim_messages_sent_total', 'counter', 'Messages sent by simulated nodes.',
+               [('', '', sim['messages_sent'])])
+        metric('sim_messages_dropped_total', 'counter', 'Messages dropped by simulated nodes.',
+               [('', '', sim['messages_dropped'])])
+        metric('sim_handled_per_second', 'gauge', 'Messages handled per wall-clock second.',
+               [('', '', sim['handled_per_wall_s'])])
+        samples = []
+        for kind, h in sim['handle_latency_s'].items():
+            samples += _histogram_samples(h, type=kind)
+        metric('sim_handle_seconds', 'histogram', 'Time spent handling one message.', samples)
+        metric('sim_queue_depth', 'histogram', 'Sampled pending-message queue depth.',
+               _histogram_samples(sim['queue_depth']))
+    return '\n'.join(lines) + '\n'
+
+def _histogram_samples(h: Dict, **labels) -> List:
+    out, seen = [], 0
+    for bound, c in h['buckets']:
+        seen += c
+        out.append(('_bucket', _labels(**labels, le=bound if bound == '+Inf' else f'{bound:g}'), seen))
+    if not h['buckets'] or h['buckets'][-1][0] != '+Inf':
+        out.append(('_bucket', _labels(**labels, le='+Inf'), h['count']))
+    out.append(('_sum', _labels(**labels), h['sum']))
+    out.append(('_count', _labels(**labels), h['count']))
+    return out
@@ -0,0 +1,81 @@
+import csv
+import json
+import sys
+from typing import Dict, Iterable, Optional, TextIO, Tuple
+
+CSV_COLUMNS = ('section', 'subject', 'value', 'detail')
+
+def node_label(node) -> str:
+    """'R1:GigabitEthernet0/0' for interface keys, str(node) for HOST:<name> nodes."""
+    return f"{node[0]}:{node[1]}" if isinstance(node, tuple) else str(node)
+
+def edge_label(u, v) -> str:
+    return f"{node_label(u)}<->{node_label(v)}"
+
+class ReportWriter:
+    """Streams report records to a file (or stdout for '-') as JSON Lines or CSV.
+
+    Every record has a section ('validate.mtu_mismatches', 'load', ...), a subject (the finding
+    text, link or scenario), an optional numeric value and free-form detail fields. JSONL writes
+    {"section", "subject", "value", **detail} per line; CSV writes the columns section, subject,
+    value, detail with detail JSON-encoded. Records go out as they are written, nothing is buffered
+    beyond the file object, and per-section counts are kept for summaries.
+    """
+    def __init__(self, path: str, fmt: str = 'jsonl'):
+        if fmt not in ('jsonl', 'csv'):
+            raise ValueError(f"unknown report format {fmt!r}")
+        self.path = path
+        self.fmt = fmt
+        self.counts: Dict[str, int] = {}
+        self._fh: TextIO = sys.stdout if path == '-' else open(path, 'w', newline='')
+        self._csv = None
+        if fmt == 'csv':
+            self._csv = csv.writer(self._fh)
+            self._csv.writerow(CSV_COLUMNS)
+
+    def write(self, section: str, subject: str, value=None, **detail):
+        self.counts[section] = self.counts.get(section, 0) + 1
+        if self._csv is not None:
+            self._csv.writerow((section, subject, '' if value is None else value,
+                                json.dumps(detail, default=str) if detail else ''))
+        else:
+            rec = {'section': section, 'subject': subject}
+            if value is not None:
+                rec['value'] = value
+            rec.update(detail)
+            self._fh.write(json.dumps(rec, default=str) + '\n')
+
+    def write_findings(self, findings: Iterable[Tuple[str, object]], prefix: str) -> int:
+        """Write (check, finding) pairs as prefix.check records; returns how many were written.
+
+        Dict findings use their first field as the subject and keep every field as detail.
+        """
+        n = 0
+        for check, finding in findings:
+            if isinstance(finding, str):
+                self.write(f"{prefix}.{check}", finding)
+            elif isinstance(finding, dict):
+                self.write(f"{prefix}.{check}", str(next(iter(finding.values()), '')), **finding)
+            else:
+                items = list(finding)
+                self.write(f"{prefix}.{check}", ' '.join(map(str, items)), items=items)
+            n += 1
+        return n
+
+    def close(self):
+        if self._fh is not sys.stdout:
+            self._fh.close()
+        else:
+            self._fh.flush()
+
+    def __enter__(self) -> 'ReportWriter':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def open_report(path: Optional[str], fmt: Optional[str] = None) -> Optional[ReportWriter]:
+    """ReportWriter for path (format from fmt, else from a .csv extension, else JSONL), or None."""
+    if not path:
+        return None
+    return ReportWriter(path, fmt or ('csv' if path.endswith('.csv') else 'jsonl'))
@@ -0,0 +1,91 @@
+import asyncio
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+from cisco_vip_network_tool.src.model.devices import Device
+from cisco_vip_network_tool.src.topology.builder import Topology
+from cisco_vip_network_tool.src.simulation.node import Node
+from cisco_vip_network_tool.src.profiling.profiler import SimMetrics
+
+class AsyncBroker:
+    """Broker with one event-driven inbox per device instead of one queue per interface.
+
+    send() appends (iface, msg) to the destination device's inbox and wakes its coroutine;
+    a node blocked in wait() costs nothing until a message arrives. register/send/recv keep the
+    InProcBroker signatures; recv() is non-blocking here since blocking would stall the loop.
+    """
+    def __init__(self):
+        self.keys = set()
+        self.inboxes: Dict[str, Deque[Tuple[str, Dict]]] = {}
+        self._wake: Dict[str, asyncio.Event] = {}
+
+    def register(self, key: Tuple[str, str]):
+        self.keys.add(key)
+        if key[0] not in self.inboxes:
+            self.inboxes[key[0]] = deque()
+            self._wake[key[0]] = asyncio.Event()
+
+    def send(self, dst: Tuple[str, str], msg: Dict):
+        if dst in self.keys:
+            self.inboxes[dst[0]].append((dst[1], msg))
+            self._wake[dst[0]].set()
+
+    def recv(self, key: Tuple[str, str], timeout: float = 0.1) -> Optional[Dict]:
+        box = self.inboxes.get(key[0])
+        if not box:
+            return None
+        for i, (ifn, msg) in enumerate(box):
+            if ifn == key[1]:
+                del box[i]
+                return msg
+        return None
+
+    async def wait(self, host: str, timeout: float) -> bool:
+        """Sleep until host's inbox is non-empty or timeout elapses. Returns True if mail is waiting."""
+        if self.inboxes[host]:
+            return True
+        ev = self._wake[host]
+        ev.clear()
+        try:
+            await asyncio.wait_for(ev.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return bool(self.inboxes[host])
+
+async def run_node(node: Node, broker: AsyncBroker, duration_s: float, hello_interval: float):
+    """Coroutine equivalent of NodeThread.run: hello on a timer, otherwise wait for mail."""
+    loop = asyncio.get_running_loop()
+    host = node.device.hostname
+    t0 = loop.time()
+    end = t0 + duration_s
+    next_hello = t0
+    box = broker.inboxes.get(host, deque())
+    while True:
+        now = loop.time()
+        if now >= end:
+            break
+        if now >= next_hello:
+            node._send_hello()
+            next_hello += hello_interval
+        if host not in broker.inboxes:
+            await asyncio.sleep(min(next_hello, end) - now)
+            continue
+        if await broker.wait(host, max(0.0, min(next_hello, end) - loop.time())):
+            if node.metrics is not None:
+                node.metrics.depth.observe(len(box))
+            while box:
+                ifn, msg = box.popleft()
+                node._handle(msg, ifn)
+
+async def _simulate(devices: Dict[str, Device], topo: Topology, log_cb, duration_s: float,
+                    hello_interval: float, metrics: Optional[SimMetrics], packet_size: int) -> Dict[str, Dict]:
+    broker = AsyncBroker()
+    nodes = [Node(dev, topo, broker, log_cb=log_cb, metrics=metrics, packet_size=packet_size)
+             for dev in devices.values()]
+    await asyncio.gather(*(run_node(n, broker, duration_s, hello_interval) for n in nodes))
+    return {n.device.hostname: n.stats for n in nodes}
+
+def run_asyncio_simulation(devices: Dict[str, Device], topo: Topology, log_cb=None, duration_s: float = 5.0,
+                           hello_interval: float = 1.0, metrics: Optional[SimMetrics] = None,
+                           packet_size: int = 1500) -> Dict[str, Dict]:
+    """Run every device as a coroutine in one event loop; same stats shape as run_day1_simulation."""
+    return asyncio.run(_simulate(devices, topo, log_cb, duration_s, hello_interval, metrics, packet_size))
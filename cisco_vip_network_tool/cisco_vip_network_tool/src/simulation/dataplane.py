@@ -0,0 +1,208 @@
+import time
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from cisco_vip_network_tool.src.model.devices import Endpoint
+from cisco_vip_network_tool.src.topology.builder import Topology
+from cisco_vip_network_tool.src.load.engine import engine_for
+from cisco_vip_network_tool.src.load.profiles import TrafficProfile
+
+IP_HEADER = 20
+NO_LIMIT = 1 << 40                  # MTU of links whose MTU is unknown
+FATES = ('delivered', 'no_route', 'link_down', 'mtu')
+DENSE_GROUPS = 1 << 22              # (path, size) groups counted with bincount instead of a sort
+
+def fragments(sizes: np.ndarray, mtu: np.ndarray) -> np.ndarray:
+    """IPv4 fragments a packet of each size becomes on a link of each MTU (1 when it fits)."""
+    per = np.maximum((mtu - IP_HEADER) // 8 * 8, 8)
+    return np.where(sizes > mtu, -(-(sizes - IP_HEADER) // per), 1)
+
+class DataPlane:
+    """Endpoint -> gateway packet forwarding over a Topology, a batch of packets at a time.
+
+    Flow i is the i-th endpoint sending to its gateway device over the LoadEngine path. Paths
+    (the forwarding state) are captured when the DataPlane is built and only change on
+    reroute(); link up/MTU state is read from the topology on every batch, so a link failing
+    after routing drops the flows crossing it until reroute() moves them. A batch is two arrays,
+    flow ids and packet sizes (IP total length); packets are grouped by (path, size) so all
+    per-hop work is array operations over the groups.
+
+    Fragmentation: with df set, packets larger than a link's MTU are dropped there; otherwise
+    they are split into fragments sized for the smallest MTU crossed so far, and each link counts
+    the fragments and header bytes it carries.
+    """
+    def __init__(self, topo: Topology, endpoints: Dict[str, Endpoint], df: bool = False):
+        self.topo = topo
+        self.endpoints = endpoints
+        self.df = df
+        self.flows: List[str] = [ep.name for ep in endpoints.values()]
+        self.reroute()
+        self.reset()
+
+    def reroute(self):
+        """Recompute every flow's path on the current topology (down links are avoided)."""
+        eng = engine_for(self.topo)
+        rows, _ = eng.endpoint_rows(self.endpoints)
+        self.links: List[Tuple] = list(eng.links)
+        self.flow_row = rows
+        self.routed = eng.routed_rows()
+        n = len(self.routed)
+        r, c = eng.incidence()
+        self.hops = np.bincount(r, minlength=n)
+        width = int(self.hops.max()) if n and len(r) else 0
+        # Incidence rows run gateway -> attachment; store hops in packet order (attachment first)
+        starts = np.concatenate(([0], np.cumsum(self.hops)[:-1])) if n else np.zeros(0, dtype=np.int64)
+        pos = self.hops[r] - 1 - (np.arange(len(r)) - starts[r])
+        self.hop_link = np.full((n, width), -1, dtype=np.int64)
+        self.hop_link[r, pos] = c
+        self._state_version = None
+
+    def reset(self):
+        """Zero the per-link and per-flow counters."""
+        self.link_bytes = np.zeros(len(self.links), dtype=np.float64)
+        self.link_packets = np.zeros(len(self.links), dtype=np.float64)
+        self.flow_fates = np.zeros((len(self.flows), len(FATES)), dtype=np.int64)
+        self.flow_bytes = np.zeros(len(self.flows), dtype=np.float64)
+        self.fragmented = 0
+        self.packets = 0
+
+    def _link_state(self):
+        """Per path: MTU allowed up to each hop and the first down hop, refreshed per topology version."""
+        if self._state_version == self.topo.version:
+            return
+        mtu = np.full(len(self.links) + 1, NO_LIMIT, dtype=np.int64)   # last slot: padding hops
+        down = np.zeros(len(self.links) + 1, dtype=bool)
+        for i, (u, v) in enumerate(self.links):
+            data = self.topo.graph.get_edge_data(u, v)
+            if data is None:
+                down[i] = True
+                continue
+            mtu[i] = data.get('mtu') or NO_LIMIT
+            down[i] = not data.get('up', True)
+        self.mtu_to = np.minimum.accumulate(mtu[self.hop_link], axis=1)
+        is_down = down[self.hop_link]
+        self.down_at = np.where(is_down.any(axis=1), is_down.argmax(axis=1), self.hops) if is_down.size else self.hops
+        self._state_version = self.topo.version
+
+    def forward(self, flow_ids: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+        """Push one batch through the network, updating the counters; returns each packet's FATES index."""
+        self._link_state()
+        flow_ids = np.asarray(flow_ids, dtype=np.int64)
+        sizes = np.asarray(sizes, dtype=np.int64)
+        # Group packets by (path row, size); row 0 of the key space is "no gateway"
+        distinct = np.flatnonzero(np.bincount(sizes))
+        size_ix = np.zeros(int(distinct[-1]) + 1 if len(distinct) else 1, dtype=np.int64)
+        size_ix[distinct] = np.arange(len(distinct))
+        n_sizes = max(len(distinct), 1)
+        key = (self.flow_row[flow_ids] + 1) * n_sizes + size_ix[sizes]
+        n_keys = (len(self.hops) + 1) * n_sizes
+        if n_keys <= DENSE_GROUPS:
+            counts = np.bincount(key, minlength=n_keys)
+            groups = np.flatnonzero(counts)
+            lut = np.zeros(n_keys, dtype=np.int64)
+            lut[groups] = np.arange(len(groups))
+            inverse, counts = lut[key], counts[groups]
+        else:
+            groups, inverse, counts = np.unique(key, return_inverse=True, return_counts=True)
+        row = groups // n_sizes - 1
+        size = distinct[groups % n_sizes] if len(distinct) else np.zeros(0, dtype=np.int64)
+
+        fate = np.zeros(len(groups), dtype=np.int64)
+        routed = (row >= 0) & self.routed[np.maximum(row, 0)]
+        fate[~routed] = FATES.index('no_route')
+        r = row[routed]
+        s = size[routed][:, None]
+        reach = self.down_at[r]
+        mtu = self.mtu_to[r]
+        if self.df:
+            fits = (mtu >= s).sum(axis=1)
+            too_big = fits < reach
+            reach = np.minimum(reach, fits)
+        frags = fragments(s, mtu)
+        crossed = np.arange(self.hop_link.shape[1]) < reach[:, None]
+        weight = counts[routed][:, None]
+        links = self.hop_link[r][crossed]
+        self.link_bytes += np.bincount(links, weights=((s + (frags - 1) * IP_HEADER) * weight)[crossed],
+                                       minlength=len(self.links))
+        self.link_packets += np.bincount(links, weights=(frags * weight)[crossed], minlength=len(self.links))
+        cut = np.full(len(r), FATES.index('delivered'))
+        cut[reach < self.hops[r]] = FATES.index('link_down')
+        if self.df:
+            cut[too_big] = FATES.index('mtu')
+        fate[routed] = cut
+        last = frags[np.arange(len(r)), np.maximum(reach - 1, 0)] if frags.size else np.ones(len(r), dtype=np.int64)
+        self.fragmented += int(counts[routed][(last > 1) & (reach > 0)].sum())
+
+        per_packet = fate[inverse]
+        self.flow_fates += np.bincount(flow_ids * len(FATES) + per_packet,
+                                       minlength=len(self.flows) * len(FATES)).reshape(len(self.flows), len(FATES))
+        self.flow_bytes += np.bincount(flow_ids, weights=sizes * (per_packet == 0), minlength=len(self.flows))
+        self.packets += len(flow_ids)
+        return per_packet
+
+    def summary(self) -> Dict:
+        totals = self.flow_fates.sum(axis=0)
+        out = {'packets': self.packets, 'fragmented': self.fragmented,
+               'delivered_bytes': int(self.flow_bytes.sum())}
+        out.update({name: int(n) for name, n in zip(FATES, totals)})
+        return out
+
+    def link_counters(self) -> Iterator[Tuple[Tuple, int, int]]:
+        """(link, bytes, packets) for every link that carried traffic, busiest first."""
+        for i in np.argsort(-self.link_bytes, kind='stable'):
+            if not self.link_bytes[i]:
+                break
+            yield self.links[i], int(self.link_bytes[i]), int(self.link_packets[i])
+
+def packet_batches(n_flows: int, packets: int, batch_size: int = 1 << 18,
+                   sizes: Union[int, Sequence[int]] = 1500, weights: Optional[np.ndarray] = None,
+                   seed: int = 0) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """(flow ids, sizes) batches totalling `packets`; flows are drawn in proportion to weights
+    and sizes uniformly from `sizes` (or all equal to it when it is an int)."""
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+    rng = np.random.default_rng(seed)
+    p = None
+    if weights is not None and weights.sum() > 0:
+        p = weights / weights.sum()
+    choices = None if isinstance(sizes, (int, np.integer)) else np.asarray(sizes, dtype=np.int64)
+    for start in range(0, packets, batch_size):
+        n = min(batch_size, packets - start)
+        flows = rng.choice(n_flows, size=n, p=p)
+        yield flows, (np.full(n, sizes, dtype=np.int64) if choices is None else rng.choice(choices, size=n))
+
+def run_dataplane(topo: Topology, endpoints: Dict[str, Endpoint], packets: int = 1_000_000,
+                  batch_size: int = 1 << 18, packet_size: Union[int, Sequence[int]] = 1500, df: bool = False,
+                  profiles: Optional[Dict[str, TrafficProfile]] = None, faults: Sequence[str] = (),
+                  seed: int = 0) -> Tuple[DataPlane, Dict]:
+    """Send `packets` endpoint packets (flows weighted by regular profile rates) through topo.
+
+    Links in faults are taken down after routing, so flows over them are dropped instead of
+    rerouted; they are brought back up before returning. Returns the DataPlane (with its
+    counters) and summary() plus forwarding time and rate (packet generation excluded).
+    """
+    from cisco_vip_network_tool.src.simulation.events import parse_link_spec
+    dp = DataPlane(topo, endpoints, df=df)
+    downed, missing = [], []
+    for spec in faults:
+        key = parse_link_spec(topo, spec)
+        if key is None:
+            missing.append(spec)
+        elif topo.graph.edges[key].get('up', True):
+            topo.set_link_state(key[0], key[1], False)
+            downed.append(key)
+    seconds = 0.0
+    try:
+        if endpoints:
+            weights = engine_for(topo).endpoint_rates(endpoints, profiles=profiles)
+            for flows, sizes in packet_batches(len(dp.flows), packets, batch_size, packet_size, weights, seed):
+                t0 = time.perf_counter()
+                dp.forward(flows, sizes)
+                seconds += time.perf_counter() - t0
+    finally:
+        for key in downed:
+            topo.set_link_state(key[0], key[1], True)
+    summary = dp.summary()
+    summary['seconds'] = round(seconds, 4)
+    summary['packets_per_sec'] = int(dp.packets / seconds) if seconds > 0 else 0
+    summary['faults_not_found'] = missing
+    return dp, summary
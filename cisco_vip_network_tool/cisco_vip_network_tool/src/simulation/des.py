@@ -0,0 +1,131 @@
+import heapq
+import itertools
+from typing import Dict, List, Optional, Set, Tuple
+from cisco_vip_network_tool.src.model.devices import Device
+from cisco_vip_network_tool.src.topology.builder import Topology
+from cisco_vip_network_tool.src.simulation.node import Node
+from cisco_vip_network_tool.src.simulation.events import inject_link_fault
+from cisco_vip_network_tool.src.profiling.profiler import SimMetrics
+
+DEFAULT_LATENCY_MS = 1.0
+
+class DESBroker:
+    """Broker whose send() schedules delivery on the simulator's virtual clock.
+
+    Keeps the register/send/recv surface of InProcBroker; recv() is never needed because
+    deliveries are pushed to the owning Node as events. Messages for devices the simulator does
+    not own but lists in `remote` go to its outbox as (arrival time, dst, msg).
+    """
+    def __init__(self, sim: 'DiscreteEventSimulator'):
+        self.sim = sim
+        self.keys = set()
+
+    def register(self, key: Tuple[str, str]):
+        self.keys.add(key)
+
+    def send(self, dst: Tuple[str, str], msg: Dict):
+        local = dst in self.keys
+        if not local and dst[0] not in self.sim.remote:
+            return
+        src = msg.get('from') or {}
+        port = self.sim.topo.port(dst[0], dst[1], (src.get('dev'), src.get('if')))
+        latency_ms = (port.latency_ms if port else None) or DEFAULT_LATENCY_MS
+        t = self.sim.now + latency_ms / 1000.0
+        if local:
+            self.sim.schedule(t, 'deliver', dst, msg)
+        else:
+            self.sim.outbox.append((t, dst, msg))
+
+    def recv(self, key: Tuple[str, str], timeout: float = 0.1) -> Optional[Dict]:
+        return None
+
+class DiscreteEventSimulator:
+    """Heap-ordered event queue with a virtual clock driving Node protocol handlers.
+
+    Events are (time, seq, kind, args); seq breaks ties in scheduling order, so a run is fully
+    deterministic. Kinds: 'hello' (periodic per node), 'deliver' (message arrival after the link
+    latency) and 'fault' (inject_link_fault at a given virtual time).
+
+    When `remote` names devices simulated elsewhere (a shard of a larger run), messages to them
+    collect in `outbox` and the caller feeds incoming ones back through deliver(). With `metrics`,
+    message handling time and the pending event count (sampled per event) are recorded.
+    """
+    def __init__(self, devices: Dict[str, Device], topo: Topology, hello_interval: float = 1.0, log_cb=None,
+                 remote: Optional[Set[str]] = None, metrics: Optional[SimMetrics] = None, packet_size: int = 1500):
+        self.topo = topo
+        self.metrics = metrics
+        self.remote = remote or set()
+        self.outbox: List[Tuple[float, Tuple[str, str], Dict]] = []
+        self.hello_interval = hello_interval
+        self.log_cb = log_cb or (lambda x: None)
+        self.now = 0.0
+        self.events_processed = 0
+        self._heap: List[Tuple[float, int, str, tuple]] = []
+        self._seq = itertools.count()
+        self.broker = DESBroker(self)
+        self.nodes: Dict[str, Node] = {}
+        self._owner: Dict[Tuple[str, str], Node] = {}
+        for host in sorted(devices):
+            node = Node(devices[host], topo, self.broker, log_cb=self._stamped, metrics=metrics,
+                        packet_size=packet_size)
+            self.nodes[host] = node
+            for ifn in node.device.interfaces:
+                self._owner[(host, ifn)] = node
+            self.schedule(0.0, 'hello', host)
+
+    def _stamped(self, msg: str):
+        self.log_cb(f"t={self.now:.3f}s {msg}")
+
+    def schedule(self, t: float, kind: str, *args):
+        heapq.heappush(self._heap, (t, next(self._seq), kind, args))
+
+    def schedule_fault(self, t: float, spec: str):
+        """Bring link spec ('R1-Gi0/0-R2-Gi0/0') down at virtual time t."""
+        self.schedule(t, 'fault', spec)
+
+    def deliver(self, t: float, dst: Tuple[str, str], msg: Dict):
+        """Accept a message sent by another shard, arriving at virtual time t."""
+        if dst in self._owner:
+            self.schedule(t, 'deliver', dst, msg)
+
+    def next_event_time(self) -> float:
+        return self._heap[0][0] if self._heap else float('inf')
+
+    def run(self, until: float, inclusive: bool = True):
+        """Process every event with time <= until (< until if not inclusive) and advance the clock."""
+        heap = self._heap
+        depth = self.metrics.depth if self.metrics is not None else None
+        while heap and (heap[0][0] <= until if inclusive else heap[0][0] < until):
+            if depth is not None:
+                depth.observe(len(heap))
+            t, _, kind, args = heapq.heappop(heap)
+            self.now = t
+            self.events_processed += 1
+            if kind == 'deliver':
+                dst, msg = args
+                self._owner[dst]._handle(msg, dst[1])
+            elif kind == 'hello':
+                self.nodes[args[0]]._send_hello()
+                self.schedule(t + self.hello_interval, 'hello', args[0])
+            elif kind == 'fault':
+                ok = inject_link_fault(self.topo, args[0])
+                self._stamped(f"[fault] link {args[0]} {'DOWN' if ok else 'NOT FOUND'}")
+        self.now = max(self.now, until)
+
+    def stats(self) -> Dict[str, Dict]:
+        return {host: node.stats for host, node in self.nodes.items()}
+
+def run_des_simulation(devices: Dict[str, Device], topo: Topology, log_cb=None, duration_s: float = 5.0,
+                       hello_interval: float = 1.0, faults: Optional[List[Tuple[float, str]]] = None,
+                       metrics: Optional[SimMetrics] = None, packet_size: int = 1500) -> Dict[str, Dict]:
+    """Replay HELLO/HELLO-ACK exchange (and scheduled faults) on a virtual clock.
+
+    Returns the same per-node stats shape as run_day1_simulation, but independent of wall-clock
+    time and thread scheduling.
+    """
+    sim = DiscreteEventSimulator(devices, topo, hello_interval=hello_interval, log_cb=log_cb, metrics=metrics,
+                                 packet_size=packet_size)
+    for t, spec in faults or []:
+        sim.schedule_fault(t, spec)
+    sim.run(duration_s)
+    return sim.stats()
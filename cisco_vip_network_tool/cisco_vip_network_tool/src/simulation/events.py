@@ -1,18 +1,22 @@
-from typing import Dict, Tuple
-from cisco_vip_network_tool.src.topology.builder import Topology
+from typing import Dict, Optional, Tuple
+from cisco_vip_network_tool.src.model.link import EdgeKey
 
-def inject_link_fault(topo: Topology, spec: str) -> bool:
-    """Turn down a link specified as 'R1-Gi0/0-R2-Gi0/0'. Returns True if found."""
+# topo below is a Topology or a CompactTopology: both have resolve_interface, graph.has_edge and
+# set_link_state, and this module imports neither so the compact path stays networkx-free
+
+def parse_link_spec(topo, spec: str) -> Optional[EdgeKey]:
+    """Resolve 'R1-Gi0/0-R2-Gi0/0' to the graph's link key, or None if there is no such link.
+
+    Interface names may be abbreviated; they are resolved against the parsed devices.
+    """
     try:
         a, b, c, d = spec.split('-')
-        key1 = ((a, b), (c, d))
-        key2 = ((c, d), (a, b))
-        if topo.graph.has_edge(*key1):
-            topo.graph.edges[key1]['up'] = False
-            return True
-        if topo.graph.has_edge(*key2):
-            topo.graph.edges[key2]['up'] = False
-            return True
-        return False
+        key = ((a, topo.resolve_interface(a, b)), (c, topo.resolve_interface(c, d)))
+        return key if topo.graph.has_edge(*key) else None
     except Exception:
-        return False
+        return None
+
+def inject_link_fault(topo, spec: str) -> bool:
+    """Turn down a link specified as 'R1-Gi0/0-R2-Gi0/0'. Returns True if found."""
+    key = parse_link_spec(topo, spec)
+    return key is not None and topo.set_link_state(key[0], key[1], False)
@@ -0,0 +1,393 @@
+import heapq
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import networkx as nx
+import numpy as np
+from cisco_vip_network_tool.src.model.devices import Endpoint
+from cisco_vip_network_tool.src.topology.builder import EdgeKey, Topology
+from cisco_vip_network_tool.src.load.engine import engine_for
+from cisco_vip_network_tool.src.load.profiles import TrafficProfile
+from cisco_vip_network_tool.src.simulation.events import parse_link_spec
+
+class FailureAnalyzer:
+    """What-if engine for batches of link failures (N-1 sweeps or explicit N-k sets).
+
+    Built once per topology state: bridges and a DFS numbering of the device graph answer
+    single-failure connectivity in O(1) (a bridge cuts off exactly one DFS subtree), and the
+    LoadEngine's gateway path incidence tells which demand crosses a failed link, so only that
+    demand is re-routed. Multi-link scenarios fall back to a traversal of the affected components
+    unless every failed device edge sits in its own 2-edge-connected component.
+    """
+    def __init__(self, topo: Topology, endpoints: Optional[Dict[str, Endpoint]] = None, peak: bool = True,
+                 max_listed: int = 20, profiles: Optional[Dict[str, TrafficProfile]] = None):
+        self.topo = topo
+        self.max_listed = max_listed
+        self.dgraph = topo.device_graph()
+        self._index_graph()
+        self.eng = engine_for(topo)
+        eps = endpoints or {}
+        rows, _ = self.eng.endpoint_rows(eps)
+        rates = self.eng.endpoint_rates(eps, peak, profiles)
+        self.demand = self.eng.pair_demand(rows, rates)
+        self.pairs = self.eng.pair_keys()
+        r, c = self.eng.incidence()
+        self.base_loads = np.bincount(c, weights=self.demand[r], minlength=len(self.eng.links))
+        # CSR both ways: pair row -> link columns on its path, link column -> pair rows crossing it
+        order = np.argsort(r, kind='stable')
+        self._row_ptr = np.concatenate(([0], np.cumsum(np.bincount(r, minlength=len(self.pairs)))))
+        self._row_cols = c[order]
+        order = np.argsort(c, kind='stable')
+        self._col_ptr = np.concatenate(([0], np.cumsum(np.bincount(c, minlength=len(self.eng.links)))))
+        self._col_rows = r[order]
+        self.capacity = np.array([self.topo.graph.edges[e].get('bandwidth_kbps') or 100000 for e in self.eng.links],
+                                 dtype=np.int64)
+
+    def _index_graph(self):
+        """DFS numbering (tin/tout/parent), component sizes, bridges and 2-edge-connected component ids."""
+        G = self.dgraph
+        self.tin: Dict[str, int] = {}
+        self.tout: Dict[str, int] = {}
+        self.parent: Dict[str, Optional[str]] = {}
+        self.comp: Dict[str, int] = {}
+        self.comp_size: List[int] = []
+        self.comp_start: List[int] = []   # components occupy contiguous ranges of order
+        self.order: List[str] = []
+        for root in sorted(G.nodes):
+            if root in self.tin:
+                continue
+            cid = len(self.comp_size)
+            start = len(self.order)
+            self.comp_start.append(start)
+            self.parent[root] = None
+            stack = [(root, iter(G.adj[root]))]
+            self.tin[root] = len(self.order)
+            self.order.append(root)
+            self.comp[root] = cid
+            while stack:
+                node, it = stack[-1]
+                for nbr in it:
+                    if nbr not in self.tin:
+                        self.parent[nbr] = node
+                        self.tin[nbr] = len(self.order)
+                        self.order.append(nbr)
+                        self.comp[nbr] = cid
+                        stack.append((nbr, iter(G.adj[nbr])))
+                        break
+                else:
+                    stack.pop()
+                    self.tout[node] = len(self.order)
+            self.comp_size.append(len(self.order) - start)
+        self.bridges: Set[Tuple[str, str]] = set()
+        for u, v in nx.bridges(G):
+            self.bridges.add((u, v))
+            self.bridges.add((v, u))
+        self.two_ecc: Dict[str, int] = {}
+        H = G.copy()
+        H.remove_edges_from(list(self.bridges))
+        for i, nodes in enumerate(nx.connected_components(H)):
+            for n in nodes:
+                self.two_ecc[n] = i
+
+    def single_link_scenarios(self) -> List[List[EdgeKey]]:
+        """One scenario per up link (the N-1 sweep)."""
+        return [[(u, v)] for u, v, d in self.topo.graph.edges(data=True)
+                if isinstance(u, tuple) and isinstance(v, tuple) and d.get('up', True)]
+
+    def _dead_device_edges(self, failed: List[EdgeKey]) -> Tuple[Set[Tuple[str, str]], Dict[Tuple[str, str], EdgeKey]]:
+        """Device edges whose every up link failed, and the replacement link of degraded parallel bundles."""
+        failed_set = {tuple(sorted(k)) for k in failed}
+        by_dev: Dict[Tuple[str, str], List[EdgeKey]] = defaultdict(list)
+        for k in failed:
+            if k[0][0] != k[1][0] and self.dgraph.has_edge(k[0][0], k[1][0]):
+                by_dev[(k[0][0], k[1][0])].append(k)
+        dead: Set[Tuple[str, str]] = set()
+        moved: Dict[Tuple[str, str], EdgeKey] = {}
+        for (a, b), keys in by_dev.items():
+            e = self.dgraph.edges[a, b]
+            alive = [l for l in e['links'] if tuple(sorted(l)) not in failed_set]
+            if not alive:
+                dead.add((a, b))
+                dead.add((b, a))
+            elif tuple(sorted(e['link'])) in failed_set:
+                best = max(alive, key=lambda l: (self.topo.graph.edges[l].get('bandwidth_kbps') or 100000,
+                                                 -self.topo.graph.edges[l].get('latency_ms', 1.0)))
+                moved[(a, b)] = moved[(b, a)] = best
+        return dead, moved
+
+    def _connectivity(self, dead: Set[Tuple[str, str]]):
+        """(side, isolated_count, isolated sample, lost device pairs) after removing dead device edges.
+
+        side(n) labels the piece a device ends up in; devices sharing a label stay connected.
+        Within each split component, every device outside its largest piece counts as isolated.
+        """
+        edges = {(u, v) for u, v in dead if u < v}
+        whole = lambda n: 0
+        if not edges:
+            return whole, 0, [], 0
+        if len(edges) == 1:
+            u, v = next(iter(edges))
+            if (u, v) not in self.bridges:
+                return whole, 0, [], 0
+            # A bridge splits off exactly the DFS subtree below it
+            child = v if self.parent.get(v) == u else u
+            lo, hi = self.tin[child], self.tout[child]
+            cid = self.comp[child]
+            first, total = self.comp_start[cid], self.comp_size[cid]
+            s = hi - lo
+            if s <= total - s:
+                side_nodes = self.order[lo:lo + self.max_listed]
+            else:
+                head = self.order[first:min(lo, first + self.max_listed)]
+                side_nodes = head + self.order[hi:min(first + total, hi + self.max_listed - len(head))]
+            tin = self.tin
+            return (lambda n: 1 if lo <= tin.get(n, -1) < hi else 0), min(s, total - s), \
+                sorted(side_nodes), s * (total - s)
+        if all((u, v) not in self.bridges for u, v in edges) and \
+                len({self.two_ecc[u] for u, _ in edges}) == len(edges):
+            return whole, 0, [], 0
+        # General case: relabel the components that lost an edge; every piece of a split
+        # component touches a removed edge, so traversals from the edge ends reach them all
+        labels: Dict[str, int] = {}
+        nxt = 0
+        for root in sorted({u for e in edges for u in e}):
+            if root in labels:
+                continue
+            nxt += 1
+            labels[root] = nxt
+            stack = [root]
+            while stack:
+                n = stack.pop()
+                for m in self.dgraph.adj[n]:
+                    if m not in labels and (n, m) not in dead:
+                        labels[m] = nxt
+                        stack.append(m)
+        by_comp: Dict[int, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        for n, label in labels.items():
+            by_comp[self.comp[n]][label] += 1
+        keep = set()
+        lost = 0
+        for sizes in by_comp.values():
+            total = sum(sizes.values())
+            lost += (total * total - sum(x * x for x in sizes.values())) // 2
+            keep.add(max(sizes, key=lambda l: (sizes[l], -l)))
+        isolated = sorted(n for n, label in labels.items() if label not in keep)
+        return (lambda n: labels.get(n, 0)), len(isolated), isolated[:self.max_listed], lost
+
+    def analyze(self, failed: List[EdgeKey], name: Optional[str] = None) -> Dict:
+        """Impact of taking every link in failed down at once."""
+        out = self._evaluate([failed])[0]
+        if name:
+            out['scenario'] = name
+        return out
+
+    def sweep(self, scenarios: Iterable[List[EdgeKey]]) -> List[Dict]:
+        """Analyze every scenario; results are ordered worst first."""
+        results = self._evaluate(list(scenarios))
+        results.sort(key=lambda r: (-r['lost_device_pairs'], -r['unserved_kbps'], -len(r['new_overloads']),
+                                    -r['rerouted_kbps'], r['scenario']))
+        return results
+
+    def _evaluate(self, scenarios: List[List[EdgeKey]]) -> List[Dict]:
+        """Connectivity per scenario, then re-route affected demand grouped by gateway device.
+
+        Grouping by gateway lets every scenario that cuts a single device edge reuse one
+        shortest-path tree per gateway: only the subtree hanging below the failed edge is
+        re-settled. Scenarios cutting several device edges run a blocked search instead.
+        """
+        outs, state = [], []
+        tasks: Dict[str, List[Tuple[int, List[int]]]] = defaultdict(list)  # gw -> (scenario, rows)
+        for i, failed in enumerate(scenarios):
+            failed = [k for k in failed if self.topo.graph.has_edge(*k) and self.topo.graph.edges[k].get('up', True)]
+            dead, moved = self._dead_device_edges(failed)
+            side, n_isolated, isolated, lost_pairs = self._connectivity(dead)
+            outs.append({
+                'scenario': '+'.join(f"{a[0]}-{a[1]}-{b[0]}-{b[1]}" for a, b in map(sorted, failed)),
+                'links_down': len(failed),
+                'isolated_count': n_isolated,
+                'isolated_devices': isolated,
+                'lost_device_pairs': lost_pairs,
+            })
+            st = {'dead': dead, 'moved': moved, 'delta': defaultdict(float), 'rerouted': 0.0, 'unserved': 0.0}
+            state.append(st)
+            rows = set()
+            for k in failed:
+                c = self.eng.link_pos.get(k)
+                if c is not None:
+                    rows.update(self._col_rows[self._col_ptr[c]:self._col_ptr[c + 1]].tolist())
+            by_gw: Dict[str, List[int]] = defaultdict(list)
+            for row in sorted(rows):
+                d = self.demand[row]
+                if not d:
+                    continue
+                cols = self._row_cols[self._row_ptr[row]:self._row_ptr[row + 1]].tolist()
+                for c in cols:
+                    st['delta'][c] -= d
+                gw, attach = self.pairs[row]
+                if side(gw) != side(attach):
+                    st['unserved'] += d
+                elif not dead:
+                    # Device path unchanged; a parallel link of the bundle takes over
+                    st['rerouted'] += d
+                    for c in cols:
+                        u, v = self.eng.links[c]
+                        alt = moved.get((u[0], v[0]))
+                        st['delta'][self.eng.link_pos[alt] if alt else c] += d
+                else:
+                    by_gw[gw].append(row)
+            for gw, group in by_gw.items():
+                tasks[gw].append((i, group))
+        for gw in sorted(tasks):
+            tree = None
+            for i, group in tasks[gw]:
+                st = state[i]
+                targets = {self.pairs[r][1] for r in group}
+                if len(st['dead']) == 2:
+                    if tree is None:
+                        tree = _PathTree(gw, *self.eng.shortest_path_tree(gw))
+                    paths = tree.repair(self.eng._adj, st['dead'], targets)
+                else:
+                    paths = self.eng._search(gw, targets, blocked=st['dead'])
+                for row in group:
+                    d = self.demand[row]
+                    hops = paths.get(self.pairs[row][1])
+                    if hops is None:
+                        st['unserved'] += d
+                        continue
+                    st['rerouted'] += d
+                    for a, b in zip(hops, hops[1:]):
+                        link = st['moved'].get((a, b)) or self.dgraph.edges[a, b]['link']
+                        st['delta'][self.eng.link_pos[link]] += d
+        for out, st in zip(outs, state):
+            out.update(self._load_impact(st['delta'], st['rerouted'], st['unserved']))
+        return outs
+
+    def _load_impact(self, delta: Dict[int, float], rerouted: float, unserved: float) -> Dict:
+        overloaded = []
+        for c, dv in delta.items():
+            after = self.base_loads[c] + dv
+            if dv > 0 and after > self.capacity[c] >= self.base_loads[c]:
+                overloaded.append({'edge': self.eng.links[c], 'load_kbps': int(round(after)),
+                                   'capacity_kbps': int(self.capacity[c])})
+        overloaded.sort(key=lambda f: f['capacity_kbps'] - f['load_kbps'])
+        return {'rerouted_kbps': int(round(rerouted)), 'unserved_kbps': int(round(unserved)),
+                'new_overloads': overloaded[:self.max_listed]}
+
+class _PathTree:
+    """Shortest-path tree of one gateway, numbered so subtrees are contiguous ranges of order."""
+    def __init__(self, src: str, dist: Dict[str, float], parent: Dict[str, Optional[str]]):
+        self.src = src
+        self.dist = dist
+        self.parent = parent
+        children: Dict[str, List[str]] = {}
+        for n, p in parent.items():
+            if p is not None:
+                children.setdefault(p, []).append(n)
+        # Stack preorder keeps every subtree contiguous; sizes accumulate in reverse preorder
+        order = []
+        stack = [src]
+        while stack:
+            n = stack.pop()
+            order.append(n)
+            stack.extend(children.get(n, ()))
+        size = dict.fromkeys(order, 1)
+        for n in reversed(order):
+            p = parent[n]
+            if p is not None:
+                size[p] += size[n]
+        self.order = order
+        self.tin = {n: i for i, n in enumerate(order)}
+        self.tout = {n: self.tin[n] + size[n] for n in order}
+
+    def repair(self, adj, dead: Set[Tuple[str, str]], targets) -> Dict[str, List[str]]:
+        """New paths to targets once one device edge (both orientations in dead) is removed.
+
+        Only devices below the edge in the tree can change: each is seeded with its best
+        surviving neighbour outside that subtree, then a Dijkstra restricted to the subtree
+        settles them. Returns target -> path; unreachable targets are omitted.
+        """
+        u, v = next(iter(dead))
+        if self.parent.get(v) == u:
+            child = v
+        elif self.parent.get(u) == v:
+            child = u
+        else:
+            child = None
+        paths: Dict[str, List[str]] = {}
+        if child is None:
+            for t in targets:
+                if t in self.dist:
+                    paths[t] = self._tree_path(t)
+            return paths
+        lo, hi = self.tin[child], self.tout[child]
+        tin = self.tin
+        inside = lambda n: lo <= tin.get(n, -1) < hi
+        dist: Dict[str, float] = {}
+        prev: Dict[str, str] = {}
+        heap = []
+        for x in self.order[lo:hi]:
+            for y, w in adj[x]:
+                if (x, y) in dead or inside(y) or y not in self.dist:
+                    continue
+                nd = self.dist[y] + w
+                if x not in dist or nd < dist[x]:
+                    dist[x] = nd
+                    prev[x] = y
+            if x in dist:
+                heapq.heappush(heap, (dist[x], x))
+        pending = {t for t in targets if inside(t)}
+        for t in targets:
+            if t in self.dist and not inside(t):
+                paths[t] = self._tree_path(t)
+        done = set()
+        while heap and pending:
+            d, x = heapq.heappop(heap)
+            if x in done:
+                continue
+            done.add(x)
+            pending.discard(x)
+            for y, w in adj[x]:
+                if (x, y) in dead or not inside(y):
+                    continue
+                nd = d + w
+                if y not in dist or nd < dist[y]:
+                    dist[y] = nd
+                    prev[y] = x
+                    heapq.heappush(heap, (nd, y))
+        for t in targets:
+            if t in done:
+                hops = [t]
+                while inside(hops[-1]):
+                    hops.append(prev[hops[-1]])
+                paths[t] = self._tree_path(hops[-1]) + hops[-2::-1]
+        return paths
+
+    def _tree_path(self, t: str) -> List[str]:
+        hops = [t]
+        while self.parent[hops[-1]] is not None:
+            hops.append(self.parent[hops[-1]])
+        return hops[::-1]
+
+def what_if(topo: Topology, specs: List[str], endpoints: Optional[Dict[str, Endpoint]] = None,
+            peak: bool = True, profiles: Optional[Dict[str, TrafficProfile]] = None,
+            analyzer: Optional[FailureAnalyzer] = None) -> List[Dict]:
+    """Run failure scenarios without touching topo.
+
+    Each spec is 'all' (every single up link, N-1) or links joined by '+', e.g.
+    'R1-Gi0/0-R2-Gi0/0+R2-Gi0/1-SW1-Gi0/1' for a simultaneous double failure.
+    A FailureAnalyzer built earlier for the same topology state can be passed to skip indexing.
+    """
+    fa = analyzer or FailureAnalyzer(topo, endpoints, peak=peak, profiles=profiles)
+    scenarios: List[List[EdgeKey]] = []
+    bad = []
+    for spec in specs:
+        if spec == 'all':
+            scenarios.extend(fa.single_link_scenarios())
+            continue
+        keys = [parse_link_spec(topo, part) for part in spec.split('+')]
+        if any(k is None for k in keys):
+            bad.append(spec)
+            continue
+        scenarios.append(keys)
+    results = fa.sweep(scenarios)
+    results.extend({'scenario': spec, 'error': 'link not found'} for spec in bad)
+    return results
@@ -0,0 +1,306 @@
+import json
+import multiprocessing as mp
+import queue
+import socket
+import struct
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from cisco_vip_network_tool.src.model.devices import Device
+from cisco_vip_network_tool.src.topology.builder import Topology
+from cisco_vip_network_tool.src.simulation.node import NodeThread
+
+# Wire format
+# frame  := u32 payload_len | payload
+# payload:= record*
+# record := u8 code | str dst_dev | str dst_if | str src_dev | str src_if [| u32 n | n bytes JSON]
+# str    := u16 len | utf-8 bytes
+# Known control messages get a one-byte code and no body; anything else is code 0 + JSON.
+MSG_CODES = {'HELLO': 1, 'HELLO-ACK': 2}
+CODE_NAMES = {v: k for k, v in MSG_CODES.items()}
+GENERIC = 0
+REGISTER = 100
+_U8 = struct.Struct('!B')
+_U16 = struct.Struct('!H')
+_U32 = struct.Struct('!I')
+
+def _pack_str(s: str) -> bytes:
+    b = s.encode('utf-8')
+    return _U16.pack(len(b)) + b
+
+def _unpack_str(buf: bytes, off: int) -> Tuple[str, int]:
+    (n,) = _U16.unpack_from(buf, off)
+    off += 2
+    return buf[off:off + n].decode('utf-8'), off + n
+
+def encode_record(dst: Tuple[str, str], msg: Optional[Dict], code: Optional[int] = None) -> bytes:
+    """Encode one message addressed to dst (or a REGISTER record when msg is None)."""
+    src = (msg or {}).get('from') or {}
+    if code is None:
+        code = MSG_CODES.get(msg.get('type'), GENERIC) if set(msg) <= {'type', 'from'} else GENERIC
+    out = _U8.pack(code) + _pack_str(dst[0]) + _pack_str(dst[1]) + \
+        _pack_str(src.get('dev', '')) + _pack_str(src.get('if', ''))
+    if code == GENERIC:
+        body = json.dumps(msg, separators=(',', ':')).encode('utf-8')
+        out += _U32.pack(len(body)) + body
+    return out
+
+def _record_end(buf: bytes, off: int) -> Tuple[int, Tuple[str, str], int]:
+    """Return (code, dst, end offset) of the record at off without decoding the rest."""
+    code = buf[off]
+    dst_dev, p = _unpack_str(buf, off + 1)
+    dst_if, p = _unpack_str(buf, p)
+    for _ in range(2):
+        (n,) = _U16.unpack_from(buf, p)
+        p += 2 + n
+    if code == GENERIC:
+        (n,) = _U32.unpack_from(buf, p)
+        p += 4 + n
+    return code, (dst_dev, dst_if), p
+
+def decode_records(buf: bytes) -> List[Tuple[int, Tuple[str, str], Dict]]:
+    """Decode a frame payload into (code, dst, msg) tuples."""
+    out = []
+    off = 0
+    while off < len(buf):
+        code = buf[off]
+        dst_dev, p = _unpack_str(buf, off + 1)
+        dst_if, p = _unpack_str(buf, p)
+        src_dev, p = _unpack_str(buf, p)
+        src_if, p = _unpack_str(buf, p)
+        if code == GENERIC:
+            (n,) = _U32.unpack_from(buf, p)
+            msg = json.loads(buf[p + 4:p + 4 + n])
+            p += 4 + n
+        elif code == REGISTER:
+            msg = {}
+        else:
+            msg = {'type': CODE_NAMES[code], 'from': {'dev': src_dev, 'if': src_if}}
+        out.append((code, (dst_dev, dst_if), msg))
+        off = p
+    return out
+
+def _recv_exact(sock: socket.socket, n: int) -> Optional[bytes]:
+    chunks = []
+    while n:
+        chunk = sock.recv(n)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        n -= len(chunk)
+    return b''.join(chunks)
+
+def _read_frame(sock: socket.socket) -> Optional[bytes]:
+    head = _recv_exact(sock, 4)
+    if head is None:
+        return None
+    return _recv_exact(sock, _U32.unpack(head)[0])
+
+class TcpBrokerHub:
+    """Central router: clients REGISTER the (device, iface) keys they own, then send batched
+    frames of records that the hub regroups per destination client and forwards unchanged.
+    """
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        self.sock = socket.create_server((host, port))
+        self.address = self.sock.getsockname()[:2]
+        self.routes: Dict[Tuple[str, str], socket.socket] = {}
+        self._locks: Dict[socket.socket, threading.Lock] = {}
+        self._routes_lock = threading.Lock()
+        self.messages = 0
+        self.frames = 0
+        self.t0 = None
+        self._closing = False
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    def _accept_loop(self):
+        while not self._closing:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._locks[conn] = threading.Lock()
+            threading.Thread(target=self._client_loop, args=(conn,), daemon=True).start()
+
+    def _client_loop(self, conn: socket.socket):
+        while True:
+            try:
+                payload = _read_frame(conn)
+            except OSError:
+                payload = None
+            if payload is None:
+                break
+            out: Dict[socket.socket, List[bytes]] = {}
+            off = 0
+            n = 0
+            while off < len(payload):
+                code, dst, end = _record_end(payload, off)
+                if code == REGISTER:
+                    with self._routes_lock:
+                        self.routes[dst] = conn
+                else:
+                    n += 1
+                    target = self.routes.get(dst)
+                    if target is not None:
+                        out.setdefault(target, []).append(payload[off:end])
+                off = end
+            for target, records in out.items():
+                body = b''.join(records)
+                try:
+                    with self._locks[target]:
+                        target.sendall(_U32.pack(len(body)) + body)
+                except OSError:
+                    pass
+            if n:
+                with self._routes_lock:
+                    if self.t0 is None:
+                        self.t0 = time.perf_counter()
+                    self.messages += n
+                    self.frames += len(out)
+        with self._routes_lock:
+            for key in [k for k, c in self.routes.items() if c is conn]:
+                del self.routes[key]
+        conn.close()
+
+    def stats(self) -> Dict:
+        """Routed message/frame counts and messages per second since the first message."""
+        elapsed = (time.perf_counter() - self.t0) if self.t0 else 0.0
+        return {'messages': self.messages, 'frames': self.frames, 'elapsed_s': round(elapsed, 3),
+                'msgs_per_sec': round(self.messages / elapsed, 1) if elapsed else 0.0}
+
+    def close(self):
+        self._closing = True
+        self.sock.close()
+
+class TcpBroker:
+    """Client broker with InProcBroker's register/send/recv API over a TcpBrokerHub.
+
+    Messages to locally registered keys short-circuit; remote ones are encoded and buffered,
+    then shipped as one frame when batch_size records accumulate or on the next recv()/flush().
+    """
+    def __init__(self, address: Tuple[str, int], batch_size: int = 256):
+        self.sock = socket.create_connection(address)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.batch_size = batch_size
+        self.queues: Dict[Tuple[str, str], queue.Queue] = {}
+        self._out: List[bytes] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        threading.Thread(target=self._reader, daemon=True).start()
+
+    def _reader(self):
+        while not self._closed:
+            try:
+                payload = _read_frame(self.sock)
+            except OSError:
+                return
+            if payload is None:
+                return
+            for _, dst, msg in decode_records(payload):
+                q = self.queues.get(dst)
+                if q is not None:
+                    q.put(msg)
+
+    def register(self, key: Tuple[str, str]):
+        self.queues[key] = queue.Queue()
+        with self._lock:
+            self._out.append(encode_record(key, None, code=REGISTER))
+
+    def send(self, dst: Tuple[str, str], msg: Dict):
+        q = self.queues.get(dst)
+        if q is not None:
+            q.put(msg)
+            return
+        rec = encode_record(dst, msg)
+        with self._lock:
+            self._out.append(rec)
+            full = len(self._out) >= self.batch_size
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Ship all buffered records as a single length-prefixed frame."""
+        with self._lock:
+            if not self._out:
+                return
+            body = b''.join(self._out)
+            self._out = []
+            self.sock.sendall(_U32.pack(len(body)) + body)
+
+    def recv(self, key: Tuple[str, str], timeout: float = 0.1) -> Optional[Dict]:
+        self.flush()
+        q = self.queues.get(key)
+        if not q:
+            return None
+        try:
+            return q.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.flush()
+        self._closed = True
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+def run_tcp_worker(address: Tuple[str, int], devices: Dict[str, Device], topo: Topology, hostnames: List[str],
+                   duration_s: float = 5.0, start_event=None, results=None, log: bool = False,
+                   packet_size: int = 1500) -> Dict[str, Dict]:
+    """Run NodeThreads for hostnames against a remote hub (one worker per process or host)."""
+    broker = TcpBroker(tuple(address))
+    log_cb = (lambda m: print('[sim]', m, flush=True)) if log else None
+    nodes = [NodeThread(devices[h], topo, broker, log_cb=log_cb, duration_s=duration_s, packet_size=packet_size)
+             for h in hostnames]
+    broker.flush()
+    if start_event is not None:
+        start_event.wait()
+    for n in nodes:
+        n.start()
+    for n in nodes:
+        n.join()
+    broker.close()
+    stats = {n.device.hostname: n.stats for n in nodes}
+    if results is not None:
+        results.put(stats)
+    return stats
+
+def run_tcp_simulation(devices: Dict[str, Device], topo: Topology, log_cb=None, duration_s: float = 5.0,
+                       processes: int = 2, host: str = '127.0.0.1', port: int = 0,
+                       packet_size: int = 1500) -> Dict[str, Dict]:
+    """Split devices across worker processes that exchange HELLOs through a TCP hub.
+
+    The hub runs in this process; workers start once every interface key is registered.
+    Returns merged per-node stats (same shape as run_day1_simulation) and logs hub throughput.
+    """
+    hub = TcpBrokerHub(host, port)
+    names = sorted(devices)
+    processes = max(1, min(processes, len(names) or 1))
+    shards = [names[i::processes] for i in range(processes)]
+    n_keys = sum(len(devices[h].interfaces) for h in names)
+    ctx = mp.get_context('spawn')
+    start = ctx.Event()
+    results = ctx.Queue()
+    workers = [ctx.Process(target=run_tcp_worker, daemon=True,
+                           args=(hub.address, devices, topo, shard, duration_s, start, results, log_cb is not None,
+                                 packet_size))
+               for shard in shards if shard]
+    for w in workers:
+        w.start()
+    deadline = time.time() + 60
+    while len(hub.routes) < n_keys and time.time() < deadline:
+        time.sleep(0.01)
+    start.set()
+    stats: Dict[str, Dict] = {}
+    for _ in workers:
+        stats.update(results.get(timeout=duration_s + 60))
+    for w in workers:
+        w.join()
+    if log_cb:
+        s = hub.stats()
+        log_cb(f"[ipc] tcp hub routed {s['messages']} msgs in {s['frames']} frames "
+               f"({s['msgs_per_sec']} msg/s)")
+    hub.close()
+    return {h: stats[h] for h in names if h in stats}
@@ -5,6 +5,7 @@ import json
 from typing import Dict, List, Tuple, Optional
 from cisco_vip_network_tool.src.model.devices import Device
 from cisco_vip_network_tool.src.topology.builder import Topology
+from cisco_vip_network_tool.src.profiling.profiler import SimMetrics
 
 class InProcBroker:
     """Simple in-process broker routing messages by (device,iface) tuple keys."""
@@ -27,15 +28,22 @@ class InProcBroker:
         except queue.Empty:
             return None
 
-class NodeThread(threading.Thread):
-    """Represents a router/switch thread that exchanges metadata 'packets' via broker."""
-    def __init__(self, device: Device, topo: Topology, broker: InProcBroker, log_cb=None):
-        super().__init__(daemon=True)
+class Node:
+    """Protocol state and handlers of one router/switch, independent of how it is scheduled.
+
+    Runtimes (threads, discrete-event, ...) drive a Node by calling _send_hello() periodically
+    and _handle() for each delivered message; all I/O goes through the broker. With `metrics`
+    set, the handling time of every message is recorded. HELLOs are packet_size bytes and are
+    dropped on ports whose MTU is smaller.
+    """
+    def __init__(self, device: Device, topo: Topology, broker, log_cb=None, metrics: Optional[SimMetrics] = None,
+                 packet_size: int = 1500):
         self.device = device
+        self.packet_size = packet_size
         self.topo = topo
         self.broker = broker
         self.log_cb = log_cb or (lambda x: None)
-        self.running = True
+        self.metrics = metrics
         self.stats = {'sent': 0, 'recv': 0, 'dropped': 0}
 
         # Register all interfaces as queue endpoints
@@ -45,11 +53,59 @@ class NodeThread(threading.Thread):
     def log(self, msg: str):
         self.log_cb(f"[{self.device.hostname}] {msg}")
 
+    def _send_hello(self):
+        """Broadcast simple HELLO to all neighbors over up links."""
+        host = self.device.hostname
+        for port in self.topo.ports(host):
+            if not port.up:
+                continue
+            msg = {'type': 'HELLO', 'from': {'dev': host, 'if': port.local_if}, 'size': self.packet_size}
+            self.broker.send(port.peer, msg)
+            self.stats['sent'] += 1
+
+    def _handle(self, msg: Dict, ifn: str):
+        if self.metrics is None:
+            self._dispatch(msg, ifn)
+            return
+        t0 = time.perf_counter()
+        self._dispatch(msg, ifn)
+        self.metrics.observe_handle(msg.get('type', '?'), time.perf_counter() - t0)
+
+    def _dispatch(self, msg: Dict, ifn: str):
+        """Basic handler: respond to HELLO with HELLO-ACK."""
+        self.stats['recv'] += 1
+        if msg.get('type') == 'HELLO':
+            src = msg['from']
+            # MTU check: drop a HELLO larger than the receiving port's MTU
+            size = msg.get('size', self.packet_size)
+            port = self.topo.port(self.device.hostname, ifn, (src['dev'], src['if']))
+            if port and port.mtu and size > port.mtu:
+                self.stats['dropped'] += 1
+                self.log(f"Dropped {size}-byte HELLO from {src['dev']}:{src['if']} due to MTU {port.mtu}")
+                return
+            # Send ACK back
+            ack = {'type': 'HELLO-ACK', 'from': {'dev': self.device.hostname, 'if': ifn}}
+            self.broker.send((src['dev'], src['if']), ack)
+            self.stats['sent'] += 1
+        elif msg.get('type') == 'HELLO-ACK':
+            pass  # could update adjacency table
+
+class NodeThread(Node, threading.Thread):
+    """Represents a router/switch thread that exchanges metadata 'packets' via broker."""
+    def __init__(self, device: Device, topo: Topology, broker: InProcBroker, log_cb=None,
+                 duration_s: float = 5.0, metrics: Optional[SimMetrics] = None, packet_size: int = 1500):
+        threading.Thread.__init__(self, daemon=True)
+        Node.__init__(self, device, topo, broker, log_cb=log_cb, metrics=metrics, packet_size=packet_size)
+        self.running = True
+        self.duration_s = duration_s
+
     def run(self):
         """Main event loop: process incoming messages and perform periodic discovery."""
         t0 = time.time()
         hello_interval = 1.0
         last_hello = 0.0
+        queues = ([self.broker.queues[(self.device.hostname, ifn)] for ifn in self.device.interfaces]
+                  if self.metrics is not None else [])
         while self.running:
             now = time.time()
             # Periodic neighbor discovery (hello)
@@ -61,51 +117,30 @@ class NodeThread(threading.Thread):
                 msg = self.broker.recv((self.device.hostname, ifn), timeout=0.01)
                 if msg:
                     self._handle(msg, ifn)
+            if self.metrics is not None:
+                self.metrics.depth.observe(sum(q.qsize() for q in queues))
             # Exit after short demo window
-            if now - t0 > 5.0:  # 5 seconds demo
+            if now - t0 > self.duration_s:
                 self.running = False
             time.sleep(0.01)
 
-    def _send_hello(self):
-        """Broadcast simple HELLO to all neighbors over up links."""
-        for (u, v, data) in list(self.topo.graph.edges(data=True)):
-            if not data.get('up', True):
-                continue
-            # Edge stored as ((dev,if),(dev,if))
-            for src, dst in [(u, v), (v, u)]:
-                if src[0] == self.device.hostname:
-                    msg = {'type': 'HELLO', 'from': {'dev': src[0], 'if': src[1]}}
-                    self.broker.send(dst, msg)
-                    self.stats['sent'] += 1
-
-    def _handle(self, msg: Dict, ifn: str):
-        """Basic handler: respond to HELLO with HELLO-ACK."""
-        self.stats['recv'] += 1
-        if msg.get('type') == 'HELLO':
-            src = msg['from']
-            # MTU check demo: if packet size exceeds MTU, drop
-            edge = ((src['dev'], src['if']), (self.device.hostname, ifn))
-            data = self.topo.graph.edges.get(edge) or self.topo.graph.edges.get((edge[1], edge[0]))
-            if data and data.get('mtu') and 1500 > data['mtu']:
-                self.stats['dropped'] += 1
-                self.log(f"Dropped HELLO from {src['dev']}:{src['if']} due to MTU {data['mtu']}")
-                return
-            # Send ACK back
-            ack = {'type': 'HELLO-ACK', 'from': {'dev': self.device.hostname, 'if': ifn}}
-            self.broker.send((src['dev'], src['if']), ack)
-            self.stats['sent'] += 1
-        elif msg.get('type') == 'HELLO-ACK':
-            pass  # could update adjacency table
+def run_day1_simulation(devices: Dict[str, Device], topo: Topology, log_cb=None,
+                        duration_s: float = 5.0, metrics: Optional[SimMetrics] = None,
+                        packet_size: int = 1500) -> Dict[str, Dict]:
+    """Spin up a NodeThread per device and run periodic hello/ack exchange for a short window.
 
-def run_day1_simulation(devices: Dict[str, Device], topo: Topology, log_cb=None) -> Dict[str, Dict]:
-    """Spin up a NodeThread per device and run periodic hello/ack exchange for a short window."""
+    With `metrics`, each thread records into its own SimMetrics, merged into `metrics` at the end.
+    """
     broker = InProcBroker()
     threads = []
     for dev in devices.values():
-        t = NodeThread(dev, topo, broker, log_cb=log_cb)
+        t = NodeThread(dev, topo, broker, log_cb=log_cb, duration_s=duration_s,
+                       metrics=SimMetrics() if metrics is not None else None, packet_size=packet_size)
         threads.append(t)
         t.start()
     for t in threads:
         t.join()
+        if metrics is not None:
+            metrics.merge(t.metrics)
     # Collect stats
     return {t.device.hostname: t.stats for t in threads}
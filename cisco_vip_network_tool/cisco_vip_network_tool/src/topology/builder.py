@@ -1,13 +1,68 @@
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from collections import defaultdict
+import threading
 import networkx as nx
 from cisco_vip_network_tool.src.model.devices import Device, Interface, Endpoint
-from cisco_vip_network_tool.src.model.link import Link
+from cisco_vip_network_tool.src.model.link import EdgeKey, Link, NodeKey, link_for_hint
+from cisco_vip_network_tool.src.parsers.cisco_parser import extract_link_hints
+from cisco_vip_network_tool.src.topology.ifnames import InterfaceIndex
+
+class Port:
+    """One side of a link as seen from a device: local interface, peer key and cached link state."""
+    __slots__ = ('local_if', 'peer', 'mtu', 'latency_ms', 'up')
+
+    def __init__(self, local_if: str, peer: NodeKey, mtu: Optional[int], latency_ms: float, up: bool):
+        self.local_if = local_if
+        self.peer = peer
+        self.mtu = mtu
+        self.latency_ms = latency_ms
+        self.up = up
 
 class Topology:
-    """Holds the built topology graph with devices, links, and endpoints."""
+    """Holds the built topology graph with devices, links, and endpoints.
+
+    Links come from LINK description tags and are maintained incrementally: each link remembers
+    which devices declared it, so apply_device_update() only re-links the changed device and the
+    devices whose tags mention it. `version` increases on every structural or link-state change.
+    """
     def __init__(self):
         self.graph = nx.Graph()
         self.endpoints: Dict[str, Endpoint] = {}
+        self.devices: Dict[str, Device] = {}
+        self.version = 0
+        self._if_index: Dict[str, InterfaceIndex] = {}
+        self._hints: Dict[str, List[Tuple[str, str, str, str]]] = {}  # declaring host -> LINK hints
+        self._mentions: Dict[str, Set[str]] = defaultdict(set)        # host -> declaring hosts naming it
+        self._owned: Dict[str, Set[EdgeKey]] = {}                      # declaring host -> links it produced
+        self._owners: Dict[EdgeKey, Set[str]] = {}                     # link -> declaring hosts
+        self._device_graph: Optional[nx.Graph] = None
+        self._device_graph_version = -1
+        self._ports: Optional[Dict[str, List[Port]]] = None            # host -> ports, built lazily
+        self._port_by_pair: Dict[Tuple[NodeKey, NodeKey], Port] = {}
+        self._ports_lock = threading.Lock()     # node threads build the tables on first use
+
+    def __getstate__(self):
+        # Simulation workers get the topology pickled; the lock is per process
+        state = self.__dict__.copy()
+        del state['_ports_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._ports_lock = threading.Lock()
+
+    @classmethod
+    def from_graph(cls, graph: nx.Graph, devices: Dict[str, Device]) -> 'Topology':
+        """Topology over an already built interface graph, e.g. CompactTopology.to_networkx().
+
+        Which device declared each link is not known, so the result serves readers (validators,
+        load, visualization, set_link_state) but not apply_device_update().
+        """
+        topo = cls()
+        topo.graph = graph
+        topo.devices = dict(devices)
+        topo._if_index = {h: InterfaceIndex(d.interfaces) for h, d in devices.items()}
+        return topo
 
     def add_device(self, device: Device):
         """Add device node with attributes for visualization."""
@@ -23,6 +78,7 @@ class Topology:
             mtu=link.mtu,
             up=link.up
         )
+        self._invalidate_ports()
 
     def add_endpoint(self, ep: Endpoint):
         """Track endpoint metadata; endpoints connect via VLAN to a switch SVI or access port."""
@@ -31,43 +87,195 @@ class Topology:
     def neighbors(self, node_key):
         return self.graph.neighbors(node_key)
 
-def build_from_devices(devices: Dict[str, Device]) -> Topology:
-    """Construct a topology using link hints from interface descriptions."""
-    topo = Topology()
-    for dev in devices.values():
-        topo.add_device(dev)
+    def resolve_interface(self, dev: str, ifname: str) -> str:
+        """Map an interface spelling ('Gi0/0') to the name configured on dev; unknown names pass through."""
+        index = self._if_index.get(dev)
+        if index is None:
+            return ifname
+        return index.resolve(ifname) or ifname
 
-    # Build links using description hints
-    # When we see 'LINK:R1:Gi0/0-R2:Gi0/0' on either side, create a link.
-    added = set()
-    for dev in devices.values():
-        for ifname, iface in dev.interfaces.items():
-            if not iface.description:
-                continue
-            if 'LINK:' not in iface.description:
+    def device_graph(self) -> nx.Graph:
+        """Device-level view over up links, cached per version.
+
+        Parallel links between two devices collapse into one edge whose 'link' attribute is the
+        preferred interface edge (highest bandwidth, then lowest latency); 'links' lists them all.
+        """
+        if self._device_graph is not None and self._device_graph_version == self.version:
+            return self._device_graph
+        G = nx.Graph()
+        G.add_nodes_from(self.devices)
+        for u, v, data in self.graph.edges(data=True):
+            if not data.get('up', True) or u[0] == v[0]:
                 continue
-            # Normalize order to avoid duplicate edges
-            desc = iface.description
-            try:
-                tag = desc.split('LINK:')[1]
-                left, right = tag.split('-')
-                a_dev, a_if = left.split(':')[0], left.split(':')[1]
-                b_dev, b_if = right.split(':')[0], right.split(':')[1]
-                key = tuple(sorted([(a_dev, a_if), (b_dev, b_if)]))
-                if key in added:
+            bw = data.get('bandwidth_kbps') or 100000
+            lat = data.get('latency_ms', 1.0)
+            if G.has_edge(u[0], v[0]):
+                e = G.edges[u[0], v[0]]
+                e['links'].append((u, v))
+                if (bw, -lat) <= (e['bandwidth_kbps'], -e['weight']):
                     continue
-                # Determine link attributes
-                a = devices.get(a_dev).interfaces.get(a_if)
-                b = devices.get(b_dev).interfaces.get(b_if)
-                mtu = None
-                if a and a.mtu and b and b.mtu:
-                    mtu = min(a.mtu, b.mtu)
-                bw = (a.bandwidth_kbps or 100000) if a else 100000
-                link = Link(a_dev=a_dev, a_if=a_if, b_dev=b_dev, b_if=b_if,
-                            bandwidth_kbps=bw, mtu=mtu, up=True)
-                topo.add_link(link)
-                added.add(key)
-            except Exception:
+            else:
+                G.add_edge(u[0], v[0], links=[(u, v)])
+                e = G.edges[u[0], v[0]]
+            e.update(link=(u, v), weight=lat, bandwidth_kbps=bw)
+        self._device_graph = G
+        self._device_graph_version = self.version
+        return G
+
+    def _build_ports(self):
+        """One O(E) pass building every device's port table; reused until links are re-derived.
+
+        Runs once under the lock however many threads ask at the same time, and publishes
+        _ports last so a reader that sees it also sees _port_by_pair.
+        """
+        with self._ports_lock:
+            if self._ports is None:
+                self._port_by_pair, self._ports = self._port_tables()
+
+    def _port_tables(self) -> Tuple[Dict[Tuple[NodeKey, NodeKey], Port], Dict[str, List[Port]]]:
+        ports: Dict[str, List[Port]] = defaultdict(list)
+        by_pair: Dict[Tuple[NodeKey, NodeKey], Port] = {}
+        for u, v, data in self.graph.edges(data=True):
+            if not (isinstance(u, tuple) and isinstance(v, tuple)):
                 continue
+            for a, b in ((u, v), (v, u)):
+                p = Port(a[1], b, data.get('mtu'), data.get('latency_ms', 1.0), data.get('up', True))
+                ports[a[0]].append(p)
+                by_pair[(a, b)] = p
+        return by_pair, ports
 
+    def ports(self, hostname: str) -> List[Port]:
+        """All link ports of a device (check Port.up); O(local degree) after the first call."""
+        if self._ports is None:
+            self._build_ports()
+        return self._ports.get(hostname, [])
+
+    def port(self, hostname: str, ifname: str, peer: NodeKey) -> Optional[Port]:
+        """The port on hostname:ifname facing peer, or None if they are not linked."""
+        if self._ports is None:
+            self._build_ports()
+        return self._port_by_pair.get(((hostname, ifname), peer))
+
+    def _invalidate_ports(self):
+        self._ports = None
+        self._port_by_pair = {}
+
+    def set_link_state(self, a: NodeKey, b: NodeKey, up: bool) -> bool:
+        """Set the up flag of link a<->b. Returns False if no such link exists."""
+        if not self.graph.has_edge(a, b):
+            return False
+        # Patch the two cached ports in place instead of rebuilding the tables; the lock keeps a
+        # concurrent _build_ports from copying the old state into ports this does not see
+        with self._ports_lock:
+            self.graph.edges[a, b]['up'] = up
+            for pair in ((a, b), (b, a)):
+                p = self._port_by_pair.get(pair)
+                if p is not None:
+                    p.up = up
+        self.version += 1
+        return True
+
+    def add_devices(self, devices: Iterable[Device]):
+        """Register many devices and link them in one pass (used for full builds)."""
+        hosts = set()
+        for dev in devices:
+            if dev.hostname in self.devices:
+                hosts |= self._forget_device(dev.hostname)
+            self._register_device(dev)
+            hosts.add(dev.hostname)
+        for h in list(hosts):
+            hosts |= self._mentions.get(h, set())
+        self._relink(hosts)
+        self.version += 1
+
+    def apply_device_update(self, old: Optional[Device], new: Optional[Device]):
+        """Incrementally replace device old with new (either may be None for add/remove).
+
+        Only links declared by, or pointing at, the affected hostnames are recomputed;
+        links that survive keep their up/down state.
+        """
+        hosts: Set[str] = set()
+        if old is not None and old.hostname in self.devices:
+            hosts |= self._forget_device(old.hostname)
+        if new is not None:
+            if new.hostname in self.devices:
+                hosts |= self._forget_device(new.hostname)
+            self._register_device(new)
+            hosts.add(new.hostname)
+            hosts |= self._mentions.get(new.hostname, set())
+        self._relink(hosts)
+        self.version += 1
+
+    def _register_device(self, dev: Device):
+        self.devices[dev.hostname] = dev
+        self.add_device(dev)
+        self._if_index[dev.hostname] = InterfaceIndex(dev.interfaces)
+        hints = extract_link_hints(dev)
+        self._hints[dev.hostname] = hints
+        for a_dev, _, b_dev, _ in hints:
+            self._mentions[a_dev].add(dev.hostname)
+            self._mentions[b_dev].add(dev.hostname)
+
+    def _forget_device(self, hostname: str) -> Set[str]:
+        """Unregister hostname; returns the hosts whose links must be recomputed."""
+        affected = {hostname} | self._mentions.get(hostname, set())
+        for a_dev, _, b_dev, _ in self._hints.pop(hostname, []):
+            for d in (a_dev, b_dev):
+                if d in self._mentions:
+                    self._mentions[d].discard(hostname)
+                    if not self._mentions[d]:
+                        del self._mentions[d]
+        self.devices.pop(hostname, None)
+        self._if_index.pop(hostname, None)
+        self._invalidate_ports()
+        if self.graph.has_node(hostname):
+            self.graph.remove_node(hostname)
+        return affected
+
+    def _relink(self, hosts: Set[str]):
+        """Drop every link declared by hosts, then re-derive them from current LINK hints."""
+        self._invalidate_ports()
+        prev_up: Dict[EdgeKey, bool] = {}
+        touched: Set[NodeKey] = set()
+        for h in hosts:
+            for key in self._owned.pop(h, ()):
+                owners = self._owners[key]
+                owners.discard(h)
+                if not owners:
+                    del self._owners[key]
+                    prev_up[key] = self.graph.edges[key].get('up', True)
+                    self.graph.remove_edge(*key)
+                    touched.update(key)
+        for h in sorted(hosts):
+            for hint in self._hints.get(h, ()):
+                key = self._link_from_hint(hint)
+                if key is None:
+                    continue
+                self._owners.setdefault(key, set()).add(h)
+                self._owned.setdefault(h, set()).add(key)
+                if key in prev_up:
+                    self.graph.edges[key]['up'] = prev_up.pop(key)
+        for node in touched:
+            if self.graph.has_node(node) and self.graph.degree(node) == 0:
+                self.graph.remove_node(node)
+
+    def _link_from_hint(self, hint: Tuple[str, str, str, str]) -> Optional[EdgeKey]:
+        """Resolve a LINK hint against known devices and add its edge if new. Returns the link key."""
+        a_dev, a_if, b_dev, b_if = hint
+        da, db = self.devices.get(a_dev), self.devices.get(b_dev)
+        if da is None or db is None:
+            return None
+        a_if = self.resolve_interface(a_dev, a_if)
+        b_if = self.resolve_interface(b_dev, b_if)
+        key = tuple(sorted([(a_dev, a_if), (b_dev, b_if)]))
+        if key in self._owners:
+            return key
+        self.add_link(link_for_hint(da, a_if, db, b_if))
+        return key
+
+def build_from_devices(devices: Dict[str, Device]) -> Topology:
+    """Construct a topology using link hints from interface descriptions."""
+    topo = Topology()
+    # When we see 'LINK:R1:Gi0/0-R2:Gi0/0' on either side, create a link.
+    topo.add_devices(devices.values())
     return topo
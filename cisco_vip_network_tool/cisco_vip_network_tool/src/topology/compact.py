@@ -0,0 +1,243 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from cisco_vip_network_tool.src.model.devices import Device
+from cisco_vip_network_tool.src.model.link import NodeKey, link_for_hint
+from cisco_vip_network_tool.src.parsers.cisco_parser import extract_link_hints
+from cisco_vip_network_tool.src.topology.ifnames import InterfaceIndex
+
+class CompactTopology:
+    """Array-backed topology for very large inventories.
+
+    Devices and interface names are interned to integer IDs. Interfaces are grouped per device
+    (if_ptr/if_name, CSR style), links are columns indexed by link ID (link_a/link_b interface IDs,
+    bandwidth_kbps, latency_ms, mtu with 0 = unknown, up), and adj_ptr/adj_if/adj_link is the
+    CSR interface adjacency. Parsed Device objects are not kept. `graph` is a networkx-free
+    view for counts and lookups; to_networkx() exports the arrays as the interface graph that
+    Topology.graph holds, and to_topology(devices) wraps it for validators and visualization.
+    """
+    def __init__(self, devices: Dict[str, Device]):
+        self.hosts: List[str] = sorted(devices)
+        self.host_id: Dict[str, int] = {h: i for i, h in enumerate(self.hosts)}
+        self.types: List[str] = [devices[h].type for h in self.hosts]
+        self.names: List[str] = []                 # interned interface names
+        self.name_id: Dict[str, int] = {}
+        self.if_ptr = np.zeros(1, dtype=np.int64)
+        self.if_name = np.zeros(0, dtype=np.int32)
+        self.if_host = np.zeros(0, dtype=np.int32)
+        self.link_a = np.zeros(0, dtype=np.int32)
+        self.link_b = np.zeros(0, dtype=np.int32)
+        self.bandwidth_kbps = np.zeros(0, dtype=np.int64)
+        self.latency_ms = np.zeros(0, dtype=np.float32)
+        self.mtu = np.zeros(0, dtype=np.int32)
+        self.up = np.zeros(0, dtype=bool)
+        self.adj_ptr = np.zeros(1, dtype=np.int64)
+        self.adj_if = np.zeros(0, dtype=np.int32)
+        self.adj_link = np.zeros(0, dtype=np.int32)
+        self._resolvers: Dict[int, InterfaceIndex] = {}       # host ID -> spelling resolver, built on use
+        self.graph = CompactGraphView(self)
+
+    def _intern(self, name: str) -> int:
+        nid = self.name_id.get(name)
+        if nid is None:
+            nid = self.name_id[name] = len(self.names)
+            self.names.append(name)
+        return nid
+
+    @classmethod
+    def from_devices(cls, devices: Dict[str, Device]) -> 'CompactTopology':
+        """Build straight from parsed devices and their LINK tags, without a networkx graph."""
+        ct = cls(devices)
+        # Per-device interface name lists; LINK tags naming an unconfigured interface add it,
+        # as build_from_devices does
+        local: List[Dict[str, int]] = [dict.fromkeys(devices[h].interfaces) for h in ct.hosts]
+        indexes: Dict[str, InterfaceIndex] = {}
+        seen = set()
+        raw = []
+        for h in ct.hosts:
+            for a_dev, a_if, b_dev, b_if in extract_link_hints(devices[h]):
+                da, db = devices.get(a_dev), devices.get(b_dev)
+                if da is None or db is None:
+                    continue
+                ends = []
+                for dev, ifn in ((da, a_if), (db, b_if)):
+                    idx = indexes.get(dev.hostname)
+                    if idx is None:
+                        idx = indexes[dev.hostname] = InterfaceIndex(dev.interfaces)
+                    ends.append((dev.hostname, idx.resolve(ifn) or ifn))
+                key = tuple(sorted(ends))
+                if key in seen:
+                    continue
+                seen.add(key)
+                raw.append(link_for_hint(da, ends[0][1], db, ends[1][1]))
+                for dev_name, ifn in ends:
+                    local[ct.host_id[dev_name]].setdefault(ifn)
+        counts = np.fromiter((len(names) for names in local), dtype=np.int64, count=len(local))
+        ct.if_ptr = np.concatenate(([0], np.cumsum(counts)))
+        ct.if_name = np.fromiter((ct._intern(n) for names in local for n in names), dtype=np.int32,
+                                 count=int(ct.if_ptr[-1]))
+        ct.if_host = np.repeat(np.arange(len(ct.hosts), dtype=np.int32), counts)
+        # Local interface positions are only needed to number link ends
+        for names in local:
+            for pos, n in enumerate(names):
+                names[n] = pos
+        n = len(raw)
+        ct.link_a = np.fromiter((ct.if_ptr[ct.host_id[l.a_dev]] + local[ct.host_id[l.a_dev]][l.a_if] for l in raw),
+                                dtype=np.int32, count=n)
+        ct.link_b = np.fromiter((ct.if_ptr[ct.host_id[l.b_dev]] + local[ct.host_id[l.b_dev]][l.b_if] for l in raw),
+                                dtype=np.int32, count=n)
+        ct.bandwidth_kbps = np.fromiter((l.bandwidth_kbps for l in raw), dtype=np.int64, count=n)
+        ct.latency_ms = np.fromiter((l.latency_ms for l in raw), dtype=np.float32, count=n)
+        ct.mtu = np.fromiter((l.mtu or 0 for l in raw), dtype=np.int32, count=n)
+        ct.up = np.fromiter((l.up for l in raw), dtype=bool, count=n)
+        ct._build_adjacency()
+        return ct
+
+    @classmethod
+    def from_topology(cls, topo) -> 'CompactTopology':
+        """Snapshot an existing Topology, keeping its link up/down state."""
+        ct = cls.from_devices(topo.devices)
+        for i in range(ct.n_links):
+            data = topo.graph.edges.get((ct.interface_key(int(ct.link_a[i])), ct.interface_key(int(ct.link_b[i]))))
+            if data is not None:
+                ct.up[i] = data.get('up', True)
+        return ct
+
+    def _build_adjacency(self):
+        n_if = len(self.if_name)
+        ends = np.concatenate((self.link_a, self.link_b))
+        peers = np.concatenate((self.link_b, self.link_a))
+        ids = np.tile(np.arange(self.n_links, dtype=np.int32), 2)
+        order = np.argsort(ends, kind='stable')
+        self.adj_ptr = np.concatenate(([0], np.cumsum(np.bincount(ends, minlength=n_if))))
+        self.adj_if = peers[order]
+        self.adj_link = ids[order]
+
+    @property
+    def n_links(self) -> int:
+        return len(self.link_a)
+
+    def memory_bytes(self) -> int:
+        """Bytes held by the array columns (interned strings not included)."""
+        return sum(a.nbytes for a in (self.if_ptr, self.if_name, self.if_host, self.link_a, self.link_b,
+                                      self.bandwidth_kbps, self.latency_ms, self.mtu, self.up,
+                                      self.adj_ptr, self.adj_if, self.adj_link))
+
+    def _local_id(self, lo: int, hi: int, name: Optional[str]) -> Optional[int]:
+        nid = self.name_id.get(name) if name is not None else None
+        if nid is None:
+            return None
+        hit = np.flatnonzero(self.if_name[lo:hi] == nid)
+        return lo + int(hit[0]) if len(hit) else None
+
+    def interface_id(self, dev: str, ifname: str) -> Optional[int]:
+        """Interface ID of dev:ifname, accepting abbreviated spellings ('Gi0/0').
+
+        The exact name is tried first; otherwise (including when the spelling is interned only
+        because another device uses it) it is resolved against this device's own names.
+        """
+        h = self.host_id.get(dev)
+        if h is None:
+            return None
+        lo, hi = int(self.if_ptr[h]), int(self.if_ptr[h + 1])
+        found = self._local_id(lo, hi, ifname)
+        if found is not None:
+            return found
+        resolver = self._resolvers.get(h)
+        if resolver is None:
+            resolver = self._resolvers[h] = InterfaceIndex(self.names[n] for n in self.if_name[lo:hi].tolist())
+        return self._local_id(lo, hi, resolver.resolve(ifname))
+
+    def interface_key(self, if_id: int) -> NodeKey:
+        return self.hosts[self.if_host[if_id]], self.names[self.if_name[if_id]]
+
+    def neighbors(self, node_key: NodeKey) -> List[NodeKey]:
+        """Peer interface keys of node_key, like Topology.neighbors."""
+        i = self.interface_id(*node_key)
+        if i is None:
+            return []
+        return [self.interface_key(int(p)) for p in self.adj_if[self.adj_ptr[i]:self.adj_ptr[i + 1]]]
+
+    def link_id(self, a: NodeKey, b: NodeKey) -> Optional[int]:
+        ia, ib = self.interface_id(*a), self.interface_id(*b)
+        if ia is None or ib is None:
+            return None
+        lo, hi = self.adj_ptr[ia], self.adj_ptr[ia + 1]
+        hit = np.flatnonzero(self.adj_if[lo:hi] == ib)
+        return int(self.adj_link[lo + hit[0]]) if len(hit) else None
+
+    def set_link_state(self, a: NodeKey, b: NodeKey, up: bool) -> bool:
+        """Set the up flag of link a<->b. Returns False if no such link exists."""
+        i = self.link_id(a, b)
+        if i is None:
+            return False
+        self.up[i] = up
+        return True
+
+    def link_attrs(self, i: int) -> Dict:
+        return {'bandwidth_kbps': int(self.bandwidth_kbps[i]), 'latency_ms': float(self.latency_ms[i]),
+                'mtu': int(self.mtu[i]) or None, 'up': bool(self.up[i])}
+
+    def link_ends(self, i: int) -> Tuple[NodeKey, NodeKey]:
+        return self.interface_key(int(self.link_a[i])), self.interface_key(int(self.link_b[i]))
+
+    def to_networkx(self, devices: Optional[Dict[str, Device]] = None):
+        """Interface graph with the node/edge attributes of Topology.graph, built from the arrays.
+
+        Device nodes carry their type, plus the Device object when devices is given.
+        """
+        import networkx as nx
+        G = nx.Graph()
+        for h, kind in zip(self.hosts, self.types):
+            G.add_node(h, type=kind, **({'device': devices[h]} if devices is not None else {}))
+        G.add_edges_from(self.link_ends(i) + (self.link_attrs(i),) for i in range(self.n_links))
+        return G
+
+    def to_topology(self, devices: Dict[str, Device]):
+        """Topology over to_networkx(devices), for validators, load and visualization.
+
+        devices are the ones this was built from; validators read their interfaces. Links and
+        their states come from the arrays (see Topology.from_graph for what it cannot do).
+        """
+        from cisco_vip_network_tool.src.topology.builder import Topology
+        return Topology.from_graph(self.to_networkx(devices), devices)
+
+    def resolve_interface(self, dev: str, ifname: str) -> str:
+        """Configured name for an interface spelling on dev, like Topology.resolve_interface."""
+        i = self.interface_id(dev, ifname)
+        return ifname if i is None else self.names[self.if_name[i]]
+
+class CompactGraphView:
+    """The counting and lookup calls of Topology.graph, answered from a CompactTopology's arrays.
+
+    Nodes are the devices plus every interface that ends a link, edges are links with the same
+    attribute dicts (built per call, nothing is cached). It is enough for the topology summary and
+    events.parse_link_spec; consumers that index nodes/adj need to_networkx().
+    """
+    def __init__(self, ct: CompactTopology):
+        self._ct = ct
+
+    def number_of_nodes(self) -> int:
+        ct = self._ct
+        return len(ct.hosts) + int(np.count_nonzero(np.diff(ct.adj_ptr)))
+
+    def number_of_edges(self) -> int:
+        return self._ct.n_links
+
+    def edges(self, data: bool = False) -> Iterator[Tuple]:
+        ct = self._ct
+        for i in range(ct.n_links):
+            yield ct.link_ends(i) + ((ct.link_attrs(i),) if data else ())
+
+    def has_edge(self, a: NodeKey, b: NodeKey) -> bool:
+        return self._ct.link_id(a, b) is not None
+
+    def get_edge_data(self, a: NodeKey, b: NodeKey, default=None) -> Optional[Dict]:
+        i = self._ct.link_id(a, b)
+        return default if i is None else self._ct.link_attrs(i)
+
+    def neighbors(self, node: NodeKey) -> Iterator[NodeKey]:
+        return iter(self._ct.neighbors(node))
+
+    def degree(self, node: NodeKey) -> int:
+        i = self._ct.interface_id(*node)
+        return 0 if i is None else int(self._ct.adj_ptr[i + 1] - self._ct.adj_ptr[i])
@@ -0,0 +1,76 @@
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+
+# Full Cisco interface type names and the abbreviations seen in LINK tags / show output
+IF_TYPES = {
+    'GigabitEthernet': ('gi', 'gig', 'ge'),
+    'TenGigabitEthernet': ('te', 'ten', 'tengig'),
+    'TwentyFiveGigE': ('twe',),
+    'FortyGigabitEthernet': ('fo',),
+    'HundredGigE': ('hu',),
+    'FastEthernet': ('fa',),
+    'Ethernet': ('e', 'eth', 'et'),
+    'Port-channel': ('po',),
+    'Loopback': ('lo',),
+    'Vlan': ('vl',),
+    'Tunnel': ('tu',),
+    'Serial': ('se',),
+    'Management': ('mgmt', 'ma'),
+}
+
+_ABBREV_TO_FULL = {a: full for full, abbrevs in IF_TYPES.items() for a in abbrevs}
+_FULL_LOWER = {full.lower(): full for full in IF_TYPES}
+_NAME_SPLIT = re.compile(r"([A-Za-z][A-Za-z-]*?)(\d.*)?$")
+
+@lru_cache(maxsize=1024)
+def _full_type(prefix: str) -> str:
+    """Map an interface type prefix (any case, abbreviated or not) to its full name."""
+    low = prefix.lower()
+    if low in _FULL_LOWER:
+        return _FULL_LOWER[low]
+    if low in _ABBREV_TO_FULL:
+        return _ABBREV_TO_FULL[low]
+    # Cisco accepts any unambiguous prefix, e.g. 'Gigabit0/1'
+    matches = [full for fl, full in _FULL_LOWER.items() if fl.startswith(low)]
+    return matches[0] if len(matches) == 1 else prefix
+
+@lru_cache(maxsize=65536)
+def interface_key(name: str) -> Tuple[str, str]:
+    """Canonical comparison key: ('gigabitethernet', '0/0') for both 'Gi0/0' and 'GigabitEthernet0/0'."""
+    m = _NAME_SPLIT.match(name)
+    if not m:
+        return (name.lower(), '')
+    return (_full_type(m.group(1)).lower(), m.group(2) or '')
+
+def canonical_ifname(name: str) -> str:
+    """Expand an abbreviated interface name ('Gi0/0' -> 'GigabitEthernet0/0'); unknown types are kept."""
+    m = _NAME_SPLIT.match(name)
+    if not m:
+        return name
+    return _full_type(m.group(1)) + (m.group(2) or '')
+
+def abbreviate_ifname(name: str) -> str:
+    """Short display form ('GigabitEthernet0/0' -> 'Gi0/0')."""
+    m = _NAME_SPLIT.match(name)
+    if not m:
+        return name
+    full = _full_type(m.group(1))
+    if full not in IF_TYPES:
+        return name
+    short = IF_TYPES[full][0]
+    return short[:1].upper() + short[1:] + (m.group(2) or '')
+
+class InterfaceIndex:
+    """Per-device lookup resolving any spelling of an interface name to the configured name."""
+    def __init__(self, names: Iterable[str]):
+        self.names = set(names)
+        self._by_key: Dict[Tuple[str, str], str] = {}
+        for n in self.names:
+            self._by_key.setdefault(interface_key(n), n)
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Return the configured interface name matching name, or None if the device has none."""
+        if name in self.names:
+            return name
+        return self._by_key.get(interface_key(name))
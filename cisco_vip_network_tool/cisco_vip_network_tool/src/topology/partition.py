@@ -0,0 +1,100 @@
+import heapq
+import math
+from collections import defaultdict
+from typing import Dict, List
+import networkx as nx
+from cisco_vip_network_tool.src.topology.builder import Topology
+
+def _link_weights(topo: Topology) -> nx.Graph:
+    """Device graph over every link (up or down), weighted by the number of parallel links."""
+    G = nx.Graph()
+    G.add_nodes_from(sorted(topo.devices))
+    for u, v in topo.graph.edges():
+        if not (isinstance(u, tuple) and isinstance(v, tuple)) or u[0] == v[0]:
+            continue
+        if G.has_edge(u[0], v[0]):
+            G.edges[u[0], v[0]]['weight'] += 1
+        else:
+            G.add_edge(u[0], v[0], weight=1)
+    return G
+
+def cut_size(G: nx.Graph, assignment: Dict[str, int]) -> int:
+    """Total weight of edges whose endpoints sit in different shards."""
+    return sum(d.get('weight', 1) for u, v, d in G.edges(data=True) if assignment[u] != assignment[v])
+
+def _grow(G: nx.Graph, k: int) -> Dict[str, int]:
+    """Greedy graph growing: fill each shard from a seed, always absorbing the frontier device
+    with the most links into the shard, restarting from a fresh seed when a component runs out."""
+    target = math.ceil(G.number_of_nodes() / k)
+    assignment: Dict[str, int] = {}
+    # Low-degree seeds sit on the periphery, so shards grow inward instead of splitting the core
+    seeds = sorted(G.nodes, key=lambda n: (G.degree(n), n))
+    seed_pos = 0
+    for shard in range(k):
+        size = 0
+        gain: Dict[str, int] = defaultdict(int)
+        heap: List = []
+        while size < target:
+            node = None
+            while heap:
+                g, n = heapq.heappop(heap)
+                if n not in assignment and -g == gain[n]:
+                    node = n
+                    break
+            if node is None:
+                while seed_pos < len(seeds) and seeds[seed_pos] in assignment:
+                    seed_pos += 1
+                if seed_pos == len(seeds):
+                    return assignment
+                node = seeds[seed_pos]
+            assignment[node] = shard
+            size += 1
+            for nbr, d in G.adj[node].items():
+                if nbr not in assignment:
+                    gain[nbr] += d.get('weight', 1)
+                    heapq.heappush(heap, (-gain[nbr], nbr))
+    for node in G.nodes:
+        assignment.setdefault(node, k - 1)
+    return assignment
+
+def _refine(G: nx.Graph, assignment: Dict[str, int], k: int, imbalance: float, passes: int):
+    """Boundary refinement: move a device to the neighbouring shard holding most of its links
+    when that lowers the cut and keeps every shard within the size tolerance."""
+    sizes = [0] * k
+    for s in assignment.values():
+        sizes[s] += 1
+    avg = G.number_of_nodes() / k
+    cap = math.floor(avg * (1 + imbalance)) or 1
+    floor_ = math.ceil(avg * (1 - imbalance))
+    for _ in range(passes):
+        moved = 0
+        for node in G.nodes:
+            src = assignment[node]
+            conn: Dict[int, int] = defaultdict(int)
+            for nbr, d in G.adj[node].items():
+                conn[assignment[nbr]] += d.get('weight', 1)
+            best, best_gain = src, 0
+            for dst, w in conn.items():
+                g = w - conn.get(src, 0)
+                if dst != src and g > best_gain and sizes[dst] < cap and sizes[src] > floor_:
+                    best, best_gain = dst, g
+            if best != src:
+                assignment[node] = best
+                sizes[src] -= 1
+                sizes[best] += 1
+                moved += 1
+        if not moved:
+            break
+
+def partition_devices(topo: Topology, k: int, imbalance: float = 0.05, passes: int = 4) -> Dict[str, int]:
+    """Split topo's devices into k shards of near-equal size while keeping few links between shards.
+
+    Returns hostname -> shard index (0..k-1). Deterministic for a given topology.
+    """
+    G = _link_weights(topo)
+    k = max(1, min(k, G.number_of_nodes() or 1))
+    if k == 1:
+        return {n: 0 for n in G.nodes}
+    assignment = _grow(G, k)
+    _refine(G, assignment, k, imbalance, passes)
+    return assignment
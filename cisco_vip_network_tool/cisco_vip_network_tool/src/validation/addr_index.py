@@ -0,0 +1,141 @@
+from bisect import insort
+from socket import inet_aton
+from typing import Dict, Iterator, List, Optional, Tuple
+from ipaddress import ip_address, ip_interface
+from cisco_vip_network_tool.src.model.devices import Device
+
+WIDTH = {4: 32, 6: 128}
+
+def parse_address(text: str) -> Optional[Tuple[int, int, int]]:
+    """Parse 'a.b.c.d[/nn]' (or IPv6) into (version, ip_int, prefixlen); None if invalid.
+
+    Dotted IPv4 takes a fast path through inet_aton; everything else goes through ipaddress.
+    """
+    addr, sep, plen = text.partition('/')
+    if addr.count('.') == 3 and ':' not in addr:
+        try:
+            value = int.from_bytes(inet_aton(addr), 'big')
+            n = int(plen) if sep else 32
+        except (OSError, ValueError):
+            return None
+        return (4, value, n) if 0 <= n <= 32 else None
+    try:
+        ipi = ip_interface(text)
+    except ValueError:
+        return None
+    return ipi.version, int(ipi.ip), ipi.network.prefixlen
+
+def format_address(version: int, value: int) -> str:
+    if version == 4:
+        return f"{value >> 24}.{(value >> 16) & 255}.{(value >> 8) & 255}.{value & 255}"
+    return str(ip_address(value.to_bytes(16, 'big')))
+
+def _node_id(version: int, value: int, plen: int) -> int:
+    """Implicit binary-trie node id: a leading 1 bit followed by the plen network bits."""
+    return (1 << plen) | (value >> (WIDTH[version] - plen))
+
+class AddressIndex:
+    """Integer-keyed index of every interface address, built once per validation run.
+
+    Subnets live in an implicit binary prefix trie: node (plen, bits) has id (1 << plen) | bits,
+    so a subnet's ancestors are id >> k. Only prefix lengths actually present are probed, which
+    keeps longest-prefix and overlap queries to a handful of dict lookups per address.
+    """
+    def __init__(self):
+        self.entries: List[Tuple[int, int, int, str, str]] = []   # (version, ip_int, plen, dev, iface)
+        self.invalid: List[Tuple[str, str, str]] = []             # (dev, iface, raw ip)
+        self.svis: Dict[Tuple[str, int], int] = {}                # (dev, vlan) -> entry id, -1 if unparsable
+        self._trie: Dict[int, Dict[int, List[int]]] = {4: {}, 6: {}}  # version -> node id -> entry ids
+        self._plens: Dict[int, List[int]] = {4: [], 6: []}            # version -> sorted prefix lengths
+
+    @classmethod
+    def from_devices(cls, devices: Dict[str, Device]) -> 'AddressIndex':
+        index = cls()
+        for dev in devices.values():
+            for ifn, iface in dev.interfaces.items():
+                if iface.ip:
+                    index.add(dev.hostname, ifn, iface.ip)
+        return index
+
+    def add(self, dev: str, ifn: str, ip: str) -> int:
+        """Insert one interface address; returns its entry id (-1 if unparsable)."""
+        parsed = parse_address(ip)
+        eid = -1
+        if parsed is None:
+            self.invalid.append((dev, ifn, ip))
+        else:
+            version, value, plen = parsed
+            eid = len(self.entries)
+            self.entries.append((version, value, plen, dev, ifn))
+            nid = (1 << plen) | (value >> (WIDTH[version] - plen))
+            trie = self._trie[version]
+            bucket = trie.get(nid)
+            if bucket is None:
+                trie[nid] = [eid]
+                plens = self._plens[version]
+                if plen not in plens:
+                    insort(plens, plen)
+            else:
+                bucket.append(eid)
+        if ifn[:1] in ('V', 'v') and ifn.lower().startswith('vlan'):
+            try:
+                self.svis[(dev, int(ifn.lower().replace('vlan', '')))] = eid
+            except ValueError:
+                pass
+        return eid
+
+    def network_str(self, eid: int) -> str:
+        version, value, plen, _, _ = self.entries[eid]
+        w = WIDTH[version]
+        net = (value >> (w - plen)) << (w - plen) if plen else 0
+        return f"{format_address(version, net)}/{plen}"
+
+    def owner(self, eid: int) -> str:
+        return f"{self.entries[eid][3]}:{self.entries[eid][4]}"
+
+    def contains(self, eid: int, version: int, value: int) -> bool:
+        """True if address value lies inside the subnet of entry eid."""
+        v, net, plen, _, _ = self.entries[eid]
+        shift = WIDTH[v] - plen
+        return v == version and (value >> shift) == (net >> shift)
+
+    def lookup(self, ip: str) -> List[int]:
+        """Longest-prefix match: entry ids of the most specific subnet containing ip."""
+        parsed = parse_address(ip.split('/')[0])
+        if parsed is None:
+            return []
+        version, value, _ = parsed
+        trie = self._trie[version]
+        for plen in reversed(self._plens[version]):
+            hit = trie.get(_node_id(version, value, plen))
+            if hit:
+                return hit
+        return []
+
+    def duplicates(self) -> List[Tuple[str, str, str]]:
+        """(ip, first owner, duplicate owner) for addresses configured twice in the same subnet."""
+        seen: Dict[Tuple[int, int, int], int] = {}
+        dups = []
+        for eid, (version, value, plen, _, _) in enumerate(self.entries):
+            key = (version, value, plen)
+            if key in seen:
+                dups.append((format_address(version, value), self.owner(seen[key]), self.owner(eid)))
+            else:
+                seen[key] = eid
+        return dups
+
+    def overlaps(self) -> Iterator[Tuple[int, int]]:
+        """Yield (outer entry, inner entry) for distinct subnets where one contains the other.
+
+        Identical subnets (e.g. both ends of a point-to-point link) are not overlaps.
+        """
+        for version, trie in self._trie.items():
+            plens = self._plens[version]
+            for nid, eids in trie.items():
+                plen = nid.bit_length() - 1
+                for p in plens:
+                    if p >= plen:
+                        break
+                    outer = trie.get(nid >> (plen - p))
+                    if outer:
+                        yield outer[0], eids[0]
@@ -0,0 +1,158 @@
+from collections import defaultdict
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from cisco_vip_network_tool.src.model.devices import Device, Interface
+from cisco_vip_network_tool.src.topology.builder import Topology
+
+NO_VLANS: FrozenSet[int] = frozenset()
+
+def port_vlans(device: Device, iface: Optional[Interface]) -> Tuple[bool, FrozenSet[int]]:
+    """(carries every VLAN, explicit VLAN set) bridged by one link end.
+
+    Trunks carry their allowed list (all VLANs when unrestricted), access ports their access VLAN.
+    Ports with an IP address and router ports without switchport config are routed and bridge
+    nothing; other switch ports default to access VLAN 1, as on Cisco switches.
+    """
+    if iface is not None:
+        if iface.mode == 'trunk':
+            return iface.trunk_vlans is None, frozenset(iface.trunk_vlans or ())
+        if iface.mode == 'access' or iface.vlan is not None:
+            return False, frozenset((iface.vlan or 1,))
+        if iface.ip:
+            return False, NO_VLANS
+    return False, (frozenset((1,)) if device.type == 'switch' else NO_VLANS)
+
+class _UnionFind:
+    """Union by size with path halving over 0..n-1."""
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> bool:
+        """Merge the sets of a and b; False if they were already one set (a loop)."""
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size[rb]
+        return True
+
+def _dict_find(parent: Dict[int, int], x: int) -> int:
+    root = x
+    while parent.get(root, root) != root:
+        root = parent[root]
+    while x != root:
+        parent[x], x = root, parent[x]
+    return root
+
+def _witness(adj: List[Dict[int, List]], edge: Tuple[int, int, int, str], hosts: List[str]) -> List[str]:
+    """Shortest device cycle through `edge`: bidirectional BFS between its ends without using it.
+
+    Expanding the smaller frontier a level at a time keeps the search local on meshes, where a
+    plain BFS would sweep the whole component for every witness.
+    """
+    u, w, eid, _ = edge
+    if u == w:
+        return [hosts[u], hosts[u]]
+    prev = [{u: None}, {w: None}]
+    depth = [{u: 0}, {w: 0}]
+    frontier = [[u], [w]]
+    meet = None
+    while meet is None and frontier[0] and frontier[1]:
+        side = 0 if len(frontier[0]) <= len(frontier[1]) else 1
+        mine, mine_depth, other_depth = prev[side], depth[side], depth[1 - side]
+        nxt = []
+        best = None
+        for x in frontier[side]:
+            d = mine_depth[x] + 1
+            for a in adj:
+                for y, e in a.get(x, ()):
+                    if e == eid or y in mine:
+                        continue
+                    mine[y] = x
+                    mine_depth[y] = d
+                    nxt.append(y)
+                    if y in other_depth and (best is None or other_depth[y] < other_depth[best]):
+                        best = y
+        frontier[side] = nxt
+        meet = best
+    if meet is None:
+        return []
+    path = [meet]
+    while prev[0][path[-1]] is not None:
+        path.append(prev[0][path[-1]])
+    path.reverse()
+    x = meet
+    while prev[1][x] is not None:
+        x = prev[1][x]
+        path.append(x)
+    return [hosts[x] for x in path] + [hosts[u]]
+
+def _adjacency(edges: List[Tuple[int, int, int, str]]) -> Dict[int, List]:
+    adj: Dict[int, List] = defaultdict(list)
+    for u, w, eid, _ in edges:
+        adj[u].append((w, eid))
+        adj[w].append((u, eid))
+    return adj
+
+def find_l2_loops(topo: Topology, max_links: int = 10, max_witnesses: int = 3) -> List[Dict]:
+    """Per-VLAN bridging loops on the device-level L2 graph.
+
+    Every up link bridges the VLANs both of its ends carry (see port_vlans). Links carrying every
+    VLAN are merged once into a base union-find; loops there are reported under vlan 'all'. Each
+    VLAN then unions only its own links over the base components, so the cost is near-linear in
+    the total number of (link, VLAN) memberships. A link that joins two already-connected devices
+    closes a loop: loop_links counts them (the links spanning tree would have to block) and up to
+    max_links are listed, with up to max_witnesses shortest device cycles as evidence.
+    """
+    hosts = sorted(topo.devices)
+    hid = {h: i for i, h in enumerate(hosts)}
+    trunk_all: List[Tuple[int, int, int, str]] = []
+    per_vlan: Dict[int, List[Tuple[int, int, int, str]]] = defaultdict(list)
+    for eid, (a, b, data) in enumerate(topo.graph.edges(data=True)):
+        if not (isinstance(a, tuple) and isinstance(b, tuple)) or not data.get('up', True):
+            continue
+        if a[0] not in hid or b[0] not in hid:
+            continue
+        da, db = topo.devices[a[0]], topo.devices[b[0]]
+        all_a, va = port_vlans(da, da.interfaces.get(a[1]))
+        all_b, vb = port_vlans(db, db.interfaces.get(b[1]))
+        edge = (hid[a[0]], hid[b[0]], eid, f"{a[0]}:{a[1]}<->{b[0]}:{b[1]}")
+        if all_a and all_b:
+            trunk_all.append(edge)
+            continue
+        vlans = vb if all_a else va if all_b else va & vb
+        for v in vlans:
+            per_vlan[v].append(edge)
+
+    base = _UnionFind(len(hosts))
+    base_adj = _adjacency(trunk_all)
+    out = []
+
+    def summary(vlan, loops, adj):
+        return {'vlan': vlan, 'loop_links': len(loops), 'links': [e[3] for e in loops[:max_links]],
+                'witnesses': [_witness(adj, e, hosts) for e in loops[:max_witnesses]]}
+
+    loops = [e for e in trunk_all if not base.union(e[0], e[1])]
+    if loops:
+        out.append(summary('all', loops, [base_adj]))
+    for v in sorted(per_vlan):
+        parent: Dict[int, int] = {}
+        loops = []
+        for e in per_vlan[v]:
+            ru, rw = _dict_find(parent, base.find(e[0])), _dict_find(parent, base.find(e[1]))
+            if ru == rw:
+                loops.append(e)
+            else:
+                parent[ru] = rw
+        if loops:
+            out.append(summary(v, loops, [base_adj, _adjacency(per_vlan[v])]))
+    return out
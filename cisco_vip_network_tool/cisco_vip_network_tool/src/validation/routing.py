@@ -0,0 +1,81 @@
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from cisco_vip_network_tool.src.model.devices import Device
+from cisco_vip_network_tool.src.validation.addr_index import AddressIndex, parse_address
+
+@lru_cache(maxsize=1024)
+def _care_mask(wildcard: str) -> Optional[int]:
+    """Bits a `network <ip> <wildcard>` line compares; routers reuse a few wildcards."""
+    parsed = parse_address(wildcard)
+    return ~parsed[1] & 0xFFFFFFFF if parsed is not None and parsed[0] == 4 else None
+
+def ospf_network_statements(dev: Device) -> Tuple[List[Tuple[int, int, str, Dict]], List[Dict]]:
+    """(valid, invalid) `network` statements of dev's OSPF process.
+
+    valid entries are (care_mask, network, area, statement), most specific first, which is the
+    order IOS matches interface addresses in.
+    """
+    valid, invalid = [], []
+    for net in (dev.routing.get('ospf') or {}).get('networks', []):
+        ip, care = parse_address(net.get('ip', '')), _care_mask(net.get('wildcard', ''))
+        if ip is None or care is None or ip[0] != 4:
+            invalid.append(net)
+        else:
+            valid.append((care, ip[1] & care, net.get('area', '0'), net))
+    valid.sort(key=lambda s: -s[0].bit_count())
+    return valid, invalid
+
+def check_ospf_network_coverage(dev: Device) -> List[str]:
+    """OSPF network statements that are malformed or enable no interface of the device."""
+    if not dev.routing.get('ospf'):
+        return []
+    valid, invalid = ospf_network_statements(dev)
+    issues = [f"{dev.hostname} OSPF network {n.get('ip')} {n.get('wildcard')} area {n.get('area')} is malformed"
+              for n in invalid]
+    addrs = []
+    for iface in dev.interfaces.values():
+        parsed = parse_address(iface.ip) if iface.ip else None
+        if parsed is not None and parsed[0] == 4:
+            addrs.append(parsed[1])
+    # Statements share a handful of masks: mask each address once per mask instead of per statement
+    covered = {(care, a & care) for care in {s[0] for s in valid} for a in addrs}
+    for care, net, area, stmt in valid:
+        if (care, net) not in covered:
+            issues.append(f"{dev.hostname} OSPF network {stmt['ip']} {stmt['wildcard']} area {area} "
+                          f"matches no interface")
+    return issues
+
+def check_bgp_neighbor_symmetry(devices: Dict[str, Device], index: AddressIndex) -> List[str]:
+    """BGP sessions between inventory devices that are one-sided or expect the wrong AS.
+
+    Neighbors that are not an address of any device (external peers) are not checked.
+    """
+    owner: Dict[int, str] = {}
+    addrs: Dict[str, set] = {}
+    for version, value, _, dev, _ in index.entries:
+        if version == 4:
+            owner.setdefault(value, dev)
+            addrs.setdefault(dev, set()).add(value)
+    issues = []
+    for dev in devices.values():
+        bgp = dev.routing.get('bgp')
+        if not bgp:
+            continue
+        for nb in bgp.get('neighbors', []):
+            parsed = parse_address(nb['neighbor'])
+            peer = owner.get(parsed[1]) if parsed is not None and parsed[0] == 4 else None
+            if peer is None or peer == dev.hostname:
+                continue
+            peer_bgp = devices[peer].routing.get('bgp')
+            where = f"{dev.hostname} neighbor {nb['neighbor']} ({peer})"
+            if not peer_bgp:
+                issues.append(f"{where}: {peer} does not run BGP")
+                continue
+            if str(nb['asn']) != str(peer_bgp.get('asn')):
+                issues.append(f"{where}: remote-as {nb['asn']} but {peer} is in AS {peer_bgp.get('asn')}")
+            mine = addrs.get(dev.hostname, set())
+            back = [p for p in (parse_address(n['neighbor']) for n in peer_bgp.get('neighbors', []))
+                    if p is not None and p[1] in mine]
+            if not back:
+                issues.append(f"{where}: {peer} has no neighbor statement for {dev.hostname}")
+    return issues
@@ -0,0 +1,195 @@
+import hashlib
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from cisco_vip_network_tool.src.model.devices import Device
+from cisco_vip_network_tool.src.topology.builder import Topology
+from cisco_vip_network_tool.src.validation.addr_index import AddressIndex
+from cisco_vip_network_tool.src.profiling.profiler import NULL_PROFILER, StageProfiler
+
+SCOPES = ('device', 'link', 'global')
+
+@dataclass(frozen=True)
+class Rule:
+    """A registered check.
+
+    device rules are fn(dev) and must be module-level functions (they may run in worker
+    processes); link rules are fn(a, b, data, dev_a, dev_b) for each interface link; global
+    rules are fn(ctx) with a RuleContext. All return a list of findings.
+    """
+    name: str
+    scope: str
+    fn: Callable
+    description: str = ''
+
+RULES: Dict[str, Rule] = {}     # registration order is report order
+
+def register(name: str, scope: str, description: str = ''):
+    """Decorator adding fn to RULES under name."""
+    if scope not in SCOPES:
+        raise ValueError(f"rule {name}: scope must be one of {SCOPES}, got {scope!r}")
+
+    def wrap(fn):
+        RULES[name] = Rule(name, scope, fn, description or (fn.__doc__ or '').strip().split('\n')[0])
+        return fn
+    return wrap
+
+class RuleContext:
+    """What global rules see: the devices, the topology and a shared AddressIndex built on first use."""
+    def __init__(self, devices: Dict[str, Device], topo: Topology, profiler: StageProfiler = NULL_PROFILER):
+        self.devices = devices
+        self.topo = topo
+        self.prof = profiler
+        self._index: Optional[AddressIndex] = None
+
+    @property
+    def index(self) -> AddressIndex:
+        if self._index is None:
+            with self.prof.stage('address_index'):
+                self._index = AddressIndex.from_devices(self.devices)
+        return self._index
+
+def device_fingerprint(dev: Device) -> str:
+    """Content hash of a parsed device (its pickle); equal configs give equal fingerprints."""
+    return hashlib.blake2b(pickle.dumps(dev, protocol=pickle.HIGHEST_PROTOCOL), digest_size=16).hexdigest()
+
+class RuleCache:
+    """Rule findings kept between validation runs.
+
+    Device findings are keyed by device fingerprint, link findings by link plus the fingerprints
+    of both ends, and global findings by a hash of every fingerprint and the down links, so only
+    changed devices (and links touching them) are re-checked. Fingerprints are memoized per
+    Device object, which the daemon keeps for unchanged files. Entries not used by the last run
+    are dropped.
+    """
+    def __init__(self):
+        self.device: Dict[str, Dict[str, list]] = {}
+        self.link: Dict[Tuple, Dict[str, list]] = {}
+        self.inventory: Dict[str, Tuple[str, list]] = {}      # global rule -> (inventory key, findings)
+        self._fps: Dict[int, Tuple[Device, str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def fingerprint(self, dev: Device) -> str:
+        hit = self._fps.get(id(dev))
+        if hit is not None and hit[0] is dev:
+            return hit[1]
+        fp = device_fingerprint(dev)
+        self._fps[id(dev)] = (dev, fp)
+        return fp
+
+    def forget_except(self, devices: Dict[str, Device], fps: Dict[str, str], links: set):
+        live = set(fps.values())
+        self.device = {fp: v for fp, v in self.device.items() if fp in live}
+        self.link = {k: v for k, v in self.link.items() if k in links}
+        self._fps = {id(d): (d, fps[h]) for h, d in devices.items()}
+
+def _check_devices(items: List[Tuple[str, Device]], rules: Sequence[Rule]) -> List[Tuple[str, Dict[str, list]]]:
+    """Worker entry point: run the device rules on a batch of (key, device)."""
+    return [(key, {r.name: r.fn(dev) for r in rules}) for key, dev in items]
+
+def _batches(items: List, size: int) -> List[List]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def _run_device_rules(todo: List[Tuple[str, Device]], rules: Sequence[Rule], workers: int, batch_size: int,
+                      prof: StageProfiler) -> Dict[str, Dict[str, list]]:
+    batches = _batches(todo, max(1, batch_size))
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    if workers > 1 and len(batches) > 1:
+        with prof.stage('device_rules'):
+            with ProcessPoolExecutor(max_workers=min(workers, len(batches))) as pool:
+                return {k: v for batch in pool.map(partial(_check_devices, rules=rules), batches) for k, v in batch}
+    out: Dict[str, Dict[str, list]] = {key: {} for key, _ in todo}
+    for rule in rules:
+        with prof.stage(rule.name):
+            for key, dev in todo:
+                out[key][rule.name] = rule.fn(dev)
+    return out
+
+def run_rules(devices: Dict[str, Device], topo: Topology, names: Optional[Sequence[str]] = None,
+              cache: Optional[RuleCache] = None, workers: int = 1, batch_size: int = 64,
+              profiler: Optional[StageProfiler] = None) -> Iterator[Tuple[str, object]]:
+    """Yield (rule, finding) rule by rule, in RULES order (or the order of names; repeats run once).
+
+    Device rules run first for all devices (in a process pool when workers > 1; 0 = one per
+    CPU). With a cache only devices, links and inventories it has not seen are checked; without
+    one nothing is hashed and every rule runs.
+    """
+    prof = profiler or NULL_PROFILER
+    unknown = [n for n in names or () if n not in RULES]
+    if unknown:
+        raise KeyError(f"unknown rules: {', '.join(unknown)} (known: {', '.join(RULES)})")
+    rules = [RULES[n] for n in dict.fromkeys(names)] if names else list(RULES.values())
+    dev_rules = [r for r in rules if r.scope == 'device']
+    if cache is not None:
+        with prof.stage('fingerprint'):
+            keys = {h: cache.fingerprint(dev) for h, dev in devices.items()}
+        todo, seen = [], set()
+        for h, dev in devices.items():
+            key = keys[h]
+            have = cache.device.get(key)
+            if key not in seen and (have is None or any(r.name not in have for r in dev_rules)):
+                todo.append((key, dev))
+                seen.add(key)
+        cache.misses += len(todo)
+        cache.hits += len(devices) - len(todo)
+        for key, found in _run_device_rules(todo, dev_rules, workers, batch_size, prof).items():
+            cache.device.setdefault(key, {}).update(found)
+        by_device = {h: cache.device[keys[h]] for h in devices}
+    else:
+        keys = {h: h for h in devices}
+        by_device = _run_device_rules(list(devices.items()), dev_rules, workers, batch_size, prof) if dev_rules else {}
+
+    ctx = RuleContext(devices, topo, prof)
+    links = [(a, b, data) for a, b, data in topo.graph.edges(data=True)
+             if isinstance(a, tuple) and isinstance(b, tuple)]
+    live_links = set()
+    inventory = None
+    if cache is not None and any(r.scope == 'global' for r in rules):
+        h = hashlib.blake2b(digest_size=16)
+        for host in sorted(keys):
+            h.update(keys[host].encode())
+        for a, b, data in links:
+            if not data.get('up', True):
+                h.update(repr((a, b)).encode())
+        inventory = h.hexdigest()
+    for rule in rules:
+        if rule.scope == 'device':
+            for host in devices:
+                for finding in by_device[host][rule.name]:
+                    yield rule.name, finding
+        elif rule.scope == 'link':
+            found = []
+            with prof.stage(rule.name):
+                for a, b, data in links:
+                    da, db = devices.get(a[0]), devices.get(b[0])
+                    if cache is None:
+                        found.extend(rule.fn(a, b, data, da, db))
+                        continue
+                    lk = (a, b, keys.get(a[0]), keys.get(b[0]), data.get('up', True))
+                    live_links.add(lk)
+                    entry = cache.link.setdefault(lk, {})
+                    if rule.name not in entry:
+                        entry[rule.name] = rule.fn(a, b, data, da, db)
+                    found.extend(entry[rule.name])
+            for finding in found:
+                yield rule.name, finding
+        else:
+            hit = cache.inventory.get(rule.name) if cache is not None else None
+            if hit is not None and hit[0] == inventory:
+                found = hit[1]
+            else:
+                with prof.stage(rule.name):
+                    found = rule.fn(ctx)
+                if cache is not None:
+                    cache.inventory[rule.name] = (inventory, found)
+            for finding in found:
+                yield rule.name, finding
+    if cache is not None:
+        if not any(r.scope == 'link' for r in rules):
+            live_links = set(cache.link)
+        cache.forget_except(devices, keys, live_links)
@@ -1,93 +1,113 @@
-from typing import Dict, List, Tuple, Set
-from ipaddress import ip_interface, ip_network
-import networkx as nx
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Set
 from cisco_vip_network_tool.src.model.devices import Device
 from cisco_vip_network_tool.src.topology.builder import Topology
 from cisco_vip_network_tool.src.parsers.cisco_parser import parse_config, extract_link_hints
+from cisco_vip_network_tool.src.validation.addr_index import AddressIndex, parse_address
+from cisco_vip_network_tool.src.validation.l2 import find_l2_loops
+from cisco_vip_network_tool.src.validation.routing import check_bgp_neighbor_symmetry, check_ospf_network_coverage
+from cisco_vip_network_tool.src.validation.rules import RULES, RuleCache, register, run_rules
+from cisco_vip_network_tool.src.profiling.profiler import StageProfiler
 
-def find_duplicate_ips(devices: Dict[str, Device]) -> List[Tuple[str, str, str]]:
+def find_duplicate_ips(devices: Dict[str, Device], index: Optional[AddressIndex] = None) -> List[Tuple[str, str, str]]:
     """Return list of (ip, dev, iface) duplicates within the same / subnet."""
-    ip_map = {}
-    dups = []
-    for dev in devices.values():
-        for ifn, iface in dev.interfaces.items():
-            if iface.ip:
-                ipi = ip_interface(iface.ip)
-                key = (str(ipi.ip), str(ipi.network))
-                if key in ip_map:
-                    dups.append((str(ipi.ip), ip_map[key], f"{dev.hostname}:{ifn}"))
-                else:
-                    ip_map[key] = f"{dev.hostname}:{ifn}"
-    return dups
+    index = index or AddressIndex.from_devices(devices)
+    return index.duplicates()
+
+def device_vlan_labels(dev: Device) -> List[str]:
+    """Warn if an interface references a VLAN undefined on its device."""
+    return [f"{dev.hostname}:{ifn} references VLAN {iface.vlan} which is undefined on this device"
+            for ifn, iface in dev.interfaces.items() if iface.vlan is not None and iface.vlan not in dev.vlans]
 
 def check_vlan_labels(devices: Dict[str, Device]) -> List[str]:
     """Warn if an interface references an undefined VLAN."""
-    issues = []
-    for dev in devices.values():
-        for ifn, iface in dev.interfaces.items():
-            if iface.vlan is not None and iface.vlan not in dev.vlans:
-                issues.append(f"{dev.hostname}:{ifn} references VLAN {iface.vlan} which is undefined on this device")
-    return issues
+    return [issue for dev in devices.values() for issue in device_vlan_labels(dev)]
 
-def check_wrong_gateways(devices: Dict[str, Device]) -> List[str]:
+def check_wrong_gateways(devices: Dict[str, Device], index: Optional[AddressIndex] = None) -> List[str]:
     """For SVIs (e.g., VlanX with IP), ensure default gateway (if set) belongs to that VLAN subnet."""
     issues = []
+    index = index or AddressIndex.from_devices(devices)
     # Heuristic: devices.default_gateways maps VLAN->gw
     for dev in devices.values():
         for vlan, gw in dev.default_gateways.items():
-            # find SVI interface ip for vlan
-            svi_ip = None
-            for ifn, iface in dev.interfaces.items():
-                if ifn.lower().startswith('vlan') and iface.ip:
-                    try:
-                        vid = int(ifn.lower().replace('vlan', ''))
-                        if vid == vlan:
-                            svi_ip = iface.ip
-                    except Exception:
-                        pass
-            if not svi_ip:
+            # SVI interface for vlan, looked up in the shared address index
+            svi = index.svis.get((dev.hostname, vlan))
+            if svi is None:
                 issues.append(f"{dev.hostname} sets default-gw for VLAN {vlan} but has no SVI")
                 continue
-            try:
-                net = ip_interface(svi_ip).network
-                if ip_interface(gw).ip not in net:
-                    issues.append(f"{dev.hostname} gateway {gw} not in VLAN{vlan} subnet {net}")
-            except Exception:
+            parsed = parse_address(gw)
+            if svi < 0 or parsed is None:
                 issues.append(f"{dev.hostname} invalid gateway format {gw}")
+            elif not index.contains(svi, parsed[0], parsed[1]):
+                issues.append(f"{dev.hostname} gateway {gw} not in VLAN{vlan} subnet {index.network_str(svi)}")
     return issues
 
+def device_gateway_issues(dev: Device) -> List[str]:
+    """check_wrong_gateways for one device (its SVIs are all the check looks at)."""
+    return check_wrong_gateways({dev.hostname: dev}) if dev.default_gateways else []
+
+def find_overlapping_subnets(devices: Dict[str, Device], index: Optional[AddressIndex] = None) -> List[str]:
+    """Report distinct interface subnets where one contains another (e.g. a /24 inside a /16)."""
+    index = index or AddressIndex.from_devices(devices)
+    return [f"{index.network_str(o)} ({index.owner(o)}) overlaps {index.network_str(i)} ({index.owner(i)})"
+            for o, i in index.overlaps()]
+
+def check_address_format(devices: Dict[str, Device], index: Optional[AddressIndex] = None) -> List[str]:
+    """Report interface addresses that cannot be parsed."""
+    index = index or AddressIndex.from_devices(devices)
+    return [f"{dev}:{ifn} has invalid address {ip}" for dev, ifn, ip in index.invalid]
+
+def link_mtu_mismatch(a, b, data: Dict, da: Device, db: Device) -> List[str]:
+    """MTU mismatch between the two interfaces of one link."""
+    if data.get('mtu') is None or da is None or db is None:
+        return []
+    ia, ib = da.interfaces.get(a[1]).mtu, db.interfaces.get(b[1]).mtu
+    if ia and ib and ia != ib:
+        return [f"MTU mismatch {a[0]}:{a[1]}({ia}) <-> {b[0]}:{b[1]}({ib})"]
+    return []
+
 def check_mtu_mismatches(topo: Topology) -> List[str]:
     """Detect links whose endpoint interface MTUs do not match."""
     issues = []
+    nodes = topo.graph.nodes
     for (a, b, data) in topo.graph.edges(data=True):
-        mtu = data.get('mtu')
-        if mtu is None:
-            continue
-        # Retrieve actual interface MTUs from node objects
-        a_dev, a_if = a
-        b_dev, b_if = b
-        da = topo.graph.nodes[a_dev]['device']
-        db = topo.graph.nodes[b_dev]['device']
-        ia = da.interfaces.get(a_if).mtu
-        ib = db.interfaces.get(b_if).mtu
-        if ia and ib and ia != ib:
-            issues.append(f"MTU mismatch {a_dev}:{a_if}({ia}) <-> {b_dev}:{b_if}({ib})")
+        if data.get('mtu') is not None:
+            issues.extend(link_mtu_mismatch(a, b, data, nodes[a[0]]['device'], nodes[b[0]]['device']))
     return issues
 
-def detect_layer2_loops(topo: Topology) -> List[List[str]]:
-    """Detect cycles as potential L2 loops. Returns list of cycles (nodes)."""
-    try:
-        cycles = list(nx.cycle_basis(topo.graph))
-        return [[f"{n[0]}:{n[1]}" for n in cycle] for cycle in cycles]
-    except Exception:
-        return []
+def detect_layer2_loops(topo: Topology, max_links: int = 10, max_witnesses: int = 3) -> List[Dict]:
+    """Per-VLAN device-level L2 loops: {'vlan', 'loop_links', 'links', 'witnesses'} (see l2.find_l2_loops)."""
+    return find_l2_loops(topo, max_links=max_links, max_witnesses=max_witnesses)
+
+# Registered in report order. Device rules must be module-level functions of one Device (they
+# may run in worker processes); see rules.Rule for the link and global signatures.
+register('duplicate_ips', 'global', 'Addresses configured twice')(lambda ctx: find_duplicate_ips(ctx.devices, ctx.index))
+register('vlan_label_issues', 'device')(device_vlan_labels)
+register('gateway_issues', 'device')(device_gateway_issues)
+register('subnet_overlaps', 'global', 'Subnets nested in other subnets')(
+    lambda ctx: find_overlapping_subnets(ctx.devices, ctx.index))
+register('address_format_issues', 'global', 'Unparsable interface addresses')(
+    lambda ctx: check_address_format(ctx.devices, ctx.index))     # the shared index already parsed them
+register('mtu_mismatches', 'link')(link_mtu_mismatch)
+register('l2_loops', 'global', 'Per-VLAN layer-2 loops')(lambda ctx: detect_layer2_loops(ctx.topo))
+register('bgp_neighbor_symmetry', 'global', 'One-sided BGP sessions and remote-as mismatches')(
+    lambda ctx: check_bgp_neighbor_symmetry(ctx.devices, ctx.index))
+register('ospf_network_coverage', 'device')(check_ospf_network_coverage)
+
+CHECKS = tuple(RULES)
+
+def iter_config_issues(devices: Dict[str, Device], topo: Topology, profiler: Optional[StageProfiler] = None,
+                       rules: Optional[Sequence[str]] = None, cache: Optional[RuleCache] = None,
+                       workers: int = 1, batch_size: int = 64) -> Iterator[Tuple[str, object]]:
+    """Yield (check, finding) pairs check by check, so callers can stream them out (see rules.run_rules)."""
+    return run_rules(devices, topo, names=rules, cache=cache, workers=workers, batch_size=batch_size,
+                     profiler=profiler)
 
-def config_issues_report(devices: Dict[str, Device], topo: Topology) -> Dict:
-    """Aggregate all checks into a structured report."""
-    return {
-        'duplicate_ips': find_duplicate_ips(devices),
-        'vlan_label_issues': check_vlan_labels(devices),
-        'gateway_issues': check_wrong_gateways(devices),
-        'mtu_mismatches': check_mtu_mismatches(topo),
-        'l2_loops': detect_layer2_loops(topo),
-    }
+def config_issues_report(devices: Dict[str, Device], topo: Topology, profiler: Optional[StageProfiler] = None,
+                         rules: Optional[Sequence[str]] = None, cache: Optional[RuleCache] = None,
+                         workers: int = 1, batch_size: int = 64) -> Dict:
+    """Aggregate the registered checks into a structured report; each check is a profiler stage."""
+    report = {key: [] for key in (rules or CHECKS)}
+    for key, finding in iter_config_issues(devices, topo, profiler, rules=rules, cache=cache, workers=workers,
+                                           batch_size=batch_size):
+        report[key].append(finding)
+    return report
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import re
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+from cisco_vip_network_tool.src.topology.builder import Topology
+
+Pos = Tuple[float, float]
+
+DEFAULT_LAYOUT_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'cisco_vip_network_tool', 'layout')
+
+SLOT_X = 40.0       # horizontal distance between neighbouring devices in a row
+SLOT_Y = 60.0       # vertical distance between wrapped rows of one tier
+TIER_GAP = 160.0    # extra vertical gap between tiers
+ROW_MAX = 250       # devices per row before a tier wraps
+
+_SITE = re.compile(r"^([A-Za-z0-9]+)[-_.]")
+
+def site_of(hostname: str) -> str:
+    """Site prefix of a hostname ('NYC-SW12' -> 'NYC'); '' if it has none."""
+    m = _SITE.match(hostname)
+    return m.group(1) if m else ''
+
+def collapse(topo: Topology, link_loads: Optional[Dict] = None) -> Tuple[Dict[str, Dict], Dict[Tuple[str, str], Dict]]:
+    """Device nodes and device-pair links aggregated from the interface graph.
+
+    Links: (a, b) with a <= b -> {'links', 'down', 'capacity_kbps' (up links), 'load_kbps', 'members'}.
+    link_loads keys may be in either orientation, as compute_link_loads returns them.
+    """
+    nodes = {h: {'type': d.type, 'site': site_of(h), 'interfaces': len(d.interfaces)} for h, d in topo.devices.items()}
+    loads = {}
+    for (u, v), kbps in (link_loads or {}).items():
+        if isinstance(u, tuple) and isinstance(v, tuple):
+            loads[(u, v)] = loads[(v, u)] = kbps
+    links: Dict[Tuple[str, str], Dict] = {}
+    for a, b, data in topo.graph.edges(data=True):
+        if not (isinstance(a, tuple) and isinstance(b, tuple)) or a[0] not in nodes or b[0] not in nodes:
+            continue
+        key = (a[0], b[0]) if a[0] <= b[0] else (b[0], a[0])
+        agg = links.get(key)
+        if agg is None:
+            agg = links[key] = {'links': 0, 'down': 0, 'capacity_kbps': 0, 'load_kbps': 0, 'members': []}
+        agg['links'] += 1
+        if data.get('up', True):
+            agg['capacity_kbps'] += data.get('bandwidth_kbps') or 0
+        else:
+            agg['down'] += 1
+        agg['load_kbps'] += loads.get((a, b), 0)
+        if len(agg['members']) < 4:
+            agg['members'].append(f"{a[1]}<->{b[1]}")
+    return nodes, links
+
+def tiers(nodes: Dict[str, Dict], links: Dict[Tuple[str, str], Dict]) -> Dict[str, int]:
+    """Hop distance from the nearest router (routers are tier 0).
+
+    Components without a router are rooted at their best-connected device, one tier down.
+    """
+    adj: Dict[str, List[str]] = {h: [] for h in nodes}
+    for a, b in links:
+        if a != b:
+            adj[a].append(b)
+            adj[b].append(a)
+    tier: Dict[str, int] = {}
+
+    def bfs(roots: List[str], start: int):
+        q = deque(roots)
+        for r in roots:
+            tier[r] = start
+        while q:
+            x = q.popleft()
+            for y in adj[x]:
+                if y not in tier:
+                    tier[y] = tier[x] + 1
+                    q.append(y)
+
+    bfs(sorted(h for h, n in nodes.items() if n['type'] == 'router'), 0)
+    for h in sorted(nodes, key=lambda h: (-len(adj[h]), h)):
+        if h not in tier:
+            bfs([h], 1)
+    return tier
+
+def hierarchical_layout(nodes: Dict[str, Dict], links: Dict[Tuple[str, str], Dict],
+                        cache: Optional[Dict[str, Pos]] = None) -> Dict[str, Pos]:
+    """Layered layout: one band per tier, devices grouped by site and ordered by the mean position
+    of their neighbours in the tier above (one barycenter sweep), long tiers wrapped into rows.
+
+    Devices found in `cache` keep their cached position; new devices take their computed slot,
+    or the next free slot to the right if a cached device already sits there. O(N log N + E).
+    """
+    tier = tiers(nodes, links)
+    adj: Dict[str, List[str]] = {h: [] for h in nodes}
+    for a, b in links:
+        if a != b:
+            adj[a].append(b)
+            adj[b].append(a)
+    by_tier: Dict[int, List[str]] = {}
+    for h, t in tier.items():
+        by_tier.setdefault(t, []).append(h)
+    width = min(ROW_MAX, max((len(v) for v in by_tier.values()), default=1))
+    order: Dict[str, float] = {}
+    pos: Dict[str, Pos] = {}
+    y = 0.0
+    for t in sorted(by_tier):
+        members = by_tier[t]
+
+        def key(h):
+            above = [order[n] for n in adj[h] if n in order and tier[n] < t]
+            return (nodes[h]['site'], sum(above) / len(above) if above else float('inf'), h)
+
+        members.sort(key=key)
+        rows = [members[i:i + ROW_MAX] for i in range(0, len(members), ROW_MAX)]
+        for r, row in enumerate(rows):
+            offset = (width - len(row)) / 2.0
+            for i, h in enumerate(row):
+                pos[h] = ((offset + i) * SLOT_X, y + r * SLOT_Y)
+                order[h] = offset + i
+        y += len(rows) * SLOT_Y + TIER_GAP
+    if not cache:
+        return pos
+    out = {h: tuple(cache[h]) for h in nodes if h in cache}
+    taken = set(out.values())
+    for h in sorted(nodes, key=lambda h: pos[h]):
+        if h in out:
+            continue
+        x, yy = pos[h]
+        while (x, yy) in taken:
+            x += SLOT_X
+        out[h] = (x, yy)
+        taken.add((x, yy))
+    return out
+
+def layout_cache_path(conf_dir: str, cache_dir: str = DEFAULT_LAYOUT_DIR) -> str:
+    """Per-inventory layout cache file: keyed by the absolute configs directory."""
+    key = hashlib.sha256(os.path.abspath(conf_dir).encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{key}.json")
+
+def load_layout_cache(path: Optional[str]) -> Dict[str, Pos]:
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as fh:
+            return {h: tuple(p) for h, p in json.load(fh).get('positions', {}).items()}
+    except (OSError, ValueError):
+        return {}
+
+def save_layout_cache(path: Optional[str], pos: Dict[str, Pos]):
+    if not path:
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as fh:
+        json.dump({'version': 1, 'positions': {h: list(p) for h, p in pos.items()}}, fh)
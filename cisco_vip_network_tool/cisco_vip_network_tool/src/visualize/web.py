@@ -0,0 +1,165 @@
+import time
+from html import escape
+from typing import Dict, List, Optional, Tuple
+from cisco_vip_network_tool.src.topology.builder import Topology
+from cisco_vip_network_tool.src.visualize.layout import (
+    Pos, SLOT_X, collapse, hierarchical_layout, load_layout_cache, save_layout_cache)
+
+CLUSTER_SLOTS = 32          # devices of one row/site merged into one node in the overview
+DOWN_COLOR = '#9e9e9e'
+NO_LOAD_COLOR = '#5b8def'
+NODE_COLORS = {'router': '#1f4e79', 'switch': '#2e8b57'}
+
+def link_color(agg: Dict) -> Tuple[str, bool]:
+    """(stroke colour, dashed) of an aggregated link: grey dashed if every member is down, dashed
+    if some are, coloured by utilisation (load / up capacity) otherwise."""
+    if agg['down'] == agg['links']:
+        return DOWN_COLOR, True
+    cap = agg['capacity_kbps']
+    if not agg['load_kbps'] or not cap:
+        return NO_LOAD_COLOR, agg['down'] > 0
+    util = agg['load_kbps'] / cap
+    color = '#2ca02c' if util < 0.5 else '#e6b800' if util < 0.8 else '#ff7f0e' if util < 1.0 else '#d62728'
+    return color, agg['down'] > 0
+
+def _link_title(a: str, b: str, agg: Dict) -> str:
+    text = f"{a} <-> {b}: {agg['links']} link(s)"
+    if agg['down']:
+        text += f", {agg['down']} down"
+    if agg['capacity_kbps']:
+        text += f", load {agg['load_kbps']}/{agg['capacity_kbps']} kbps"
+    return text + ('\n' + '\n'.join(agg['members']) if agg['members'] else '')
+
+def clusters(nodes: Dict[str, Dict], pos: Dict[str, Pos]) -> Dict[str, Tuple]:
+    """Overview grouping: device -> (row y, site, block of CLUSTER_SLOTS slots)."""
+    return {h: (pos[h][1], nodes[h]['site'], int(pos[h][0] // (SLOT_X * CLUSTER_SLOTS))) for h in nodes}
+
+def _svg_links(out: List[str], links: Dict, pos: Dict[str, Pos], titles: bool):
+    for (a, b), agg in links.items():
+        (x1, y1), (x2, y2) = pos[a], pos[b]
+        color, dashed = link_color(agg)
+        width = 1 + min(agg['links'], 8) * 0.5
+        dash = ' stroke-dasharray="6,4"' if dashed else ''
+        title = f"<title>{escape(_link_title(a, b, agg))}</title>" if titles else ''
+        out.append(f'<line x1="{x1:.0f}" y1="{y1:.0f}" x2="{x2:.0f}" y2="{y2:.0f}" stroke="{color}" '
+                   f'stroke-width="{width:.1f}"{dash}>{title}</line>')
+
+def render_svg(nodes: Dict[str, Dict], links: Dict, pos: Dict[str, Pos], lod: bool = False) -> str:
+    """SVG of the device graph; with lod, an extra overview group of merged clusters and links."""
+    xs = [p[0] for p in pos.values()] or [0.0]
+    ys = [p[1] for p in pos.values()] or [0.0]
+    pad = 60
+    x0, y0 = min(xs) - pad, min(ys) - pad
+    w, h = max(xs) - x0 + pad, max(ys) - y0 + pad
+    out = [f'<svg xmlns="http://www.w3.org/2000/svg" id="topo" viewBox="{x0:.0f} {y0:.0f} {w:.0f} {h:.0f}" '
+           f'font-family="sans-serif" font-size="9">']
+    out.append('<g class="detail">')
+    _svg_links(out, links, pos, titles=True)
+    for host, n in nodes.items():
+        x, y = pos[host]
+        color = NODE_COLORS.get(n['type'], '#555')
+        title = escape(f"{host} ({n['type']}, {n['interfaces']} interfaces{', site ' + n['site'] if n['site'] else ''})")
+        if n['type'] == 'router':
+            shape = f'<rect x="{x - 7:.0f}" y="{y - 7:.0f}" width="14" height="14" fill="{color}">'
+        else:
+            shape = f'<circle cx="{x:.0f}" cy="{y:.0f}" r="6" fill="{color}">'
+        tag = 'rect' if n['type'] == 'router' else 'circle'
+        out.append(f'{shape}<title>{title}</title></{tag}>'
+                   f'<text class="label" x="{x:.0f}" y="{y + 16:.0f}" text-anchor="middle">{escape(host)}</text>')
+    out.append('</g>')
+    if lod:
+        out.append('<g class="overview">')
+        group = clusters(nodes, pos)
+        members: Dict[Tuple, List[str]] = {}
+        for host, key in group.items():
+            members.setdefault(key, []).append(host)
+        cpos = {k: (sum(pos[h][0] for h in hs) / len(hs), k[0]) for k, hs in members.items()}
+        cid = {k: f"c{i}" for i, k in enumerate(members)}
+        clinks: Dict[Tuple[str, str], Dict] = {}
+        for (a, b), agg in links.items():
+            ka, kb = cid[group[a]], cid[group[b]]
+            if ka == kb:
+                continue
+            key = (ka, kb) if ka <= kb else (kb, ka)
+            c = clinks.setdefault(key, {'links': 0, 'down': 0, 'capacity_kbps': 0, 'load_kbps': 0, 'members': []})
+            for f in ('links', 'down', 'capacity_kbps', 'load_kbps'):
+                c[f] += agg[f]
+        _svg_links(out, clinks, {cid[k]: p for k, p in cpos.items()}, titles=False)
+        for k, hs in members.items():
+            x, y = cpos[k]
+            r = 6 + min(len(hs), 400) ** 0.5 * 1.5
+            routers = sum(1 for h in hs if nodes[h]['type'] == 'router')
+            color = NODE_COLORS['router'] if routers * 2 >= len(hs) else NODE_COLORS['switch']
+            label = f"{k[1] + ' ' if k[1] else ''}{len(hs)}"
+            title = escape(f"{len(hs)} devices: {', '.join(sorted(hs)[:8])}{' ...' if len(hs) > 8 else ''}")
+            out.append(f'<circle cx="{x:.0f}" cy="{y:.0f}" r="{r:.0f}" fill="{color}" fill-opacity="0.8">'
+                       f'<title>{title}</title></circle>'
+                       f'<text x="{x:.0f}" y="{y + r + 12:.0f}" text-anchor="middle" font-size="14">{escape(label)}</text>')
+        out.append('</g>')
+    out.append('</svg>')
+    return '\n'.join(out)
+
+_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>
+ html, body {{ margin: 0; height: 100%; overflow: hidden; font-family: sans-serif; }}
+ #topo {{ width: 100vw; height: 100vh; cursor: grab; background: #fafafa; }}
+ #info {{ position: fixed; top: 8px; left: 8px; background: #fffd; padding: 6px 10px; border: 1px solid #ccc; font-size: 12px; }}
+ .hide {{ display: none; }}
+</style></head><body>
+<div id="info">{summary}<br>wheel: zoom, drag: pan. Links: green/yellow/orange/red by utilisation, blue = no load data, dashed = down.</div>
+{svg}
+<script>
+(function () {{
+  var svg = document.getElementById('topo'), detail = svg.querySelector('.detail'), overview = svg.querySelector('.overview');
+  var labels = svg.querySelectorAll('.label'), vb = svg.viewBox.baseVal, full = vb.width;
+  var DETAIL = {detail_width}, LABELS = {label_width}, shown = null, labelled = null;
+  function lod() {{
+    var d = !overview || vb.width <= DETAIL, l = vb.width <= LABELS;
+    if (d !== shown) {{ detail.classList.toggle('hide', !d); if (overview) overview.classList.toggle('hide', d); shown = d; }}
+    if (l !== labelled) {{ for (var i = 0; i < labels.length; i++) labels[i].classList.toggle('hide', !l); labelled = l; }}
+  }}
+  svg.addEventListener('wheel', function (e) {{
+    e.preventDefault();
+    var k = e.deltaY > 0 ? 1.2 : 1 / 1.2, r = svg.getBoundingClientRect();
+    var px = vb.x + (e.clientX - r.left) / r.width * vb.width, py = vb.y + (e.clientY - r.top) / r.height * vb.height;
+    vb.x = px - (px - vb.x) * k; vb.y = py - (py - vb.y) * k; vb.width *= k; vb.height *= k; lod();
+  }}, {{passive: false}});
+  var drag = null;
+  svg.addEventListener('mousedown', function (e) {{ drag = [e.clientX, e.clientY]; }});
+  window.addEventListener('mouseup', function () {{ drag = null; }});
+  window.addEventListener('mousemove', function (e) {{
+    if (!drag) return;
+    var r = svg.getBoundingClientRect();
+    vb.x -= (e.clientX - drag[0]) / r.width * vb.width; vb.y -= (e.clientY - drag[1]) / r.height * vb.height;
+    drag = [e.clientX, e.clientY];
+  }});
+  lod();
+}})();
+</script></body></html>
+"""
+
+def render_topology(topo: Topology, out_path: str, fmt: str = 'html', link_loads: Optional[Dict] = None,
+                    layout_cache: Optional[str] = None) -> Dict:
+    """Write a device-level SVG or interactive HTML view of topo; returns counts and timing.
+
+    Interfaces collapse into devices (parallel links into one weighted line), the layout is
+    hierarchical (layout.hierarchical_layout) and reuses positions from layout_cache, which is
+    then updated. HTML pages show merged clusters when zoomed out and devices, then labels, when
+    zoomed in.
+    """
+    t0 = time.perf_counter()
+    nodes, links = collapse(topo, link_loads)
+    pos = hierarchical_layout(nodes, links, load_layout_cache(layout_cache))
+    save_layout_cache(layout_cache, pos)
+    lod = fmt == 'html' and len(nodes) > CLUSTER_SLOTS
+    svg = render_svg(nodes, links, pos, lod=lod)
+    with open(out_path, 'w') as fh:
+        if fmt == 'html':
+            down = sum(1 for agg in links.values() if agg['down'])
+            summary = escape(f"{len(nodes)} devices, {len(links)} device links ({down} with down members)")
+            fh.write(_HTML.format(title='Network Topology', summary=summary, svg=svg,
+                                  detail_width=SLOT_X * CLUSTER_SLOTS * 8, label_width=SLOT_X * 40))
+        else:
+            fh.write(svg)
+    return {'devices': len(nodes), 'links': len(links), 'seconds': round(time.perf_counter() - t0, 3)}
@@ -0,0 +1,4 @@
+import os
+
+PKG = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))     # package root, holds configs/
+SAMPLE_DIR = os.path.join(PKG, 'configs', 'sample')
@@ -0,0 +1,24 @@
+from cisco_vip_network_tool.src.parsers.ingest import ingest_configs
+from cisco_vip_network_tool.src.topology.builder import build_from_devices
+from cisco_vip_network_tool.src.simulation.aio import AsyncBroker, run_asyncio_simulation
+from conftest import SAMPLE_DIR
+
+
+def test_async_broker_keeps_send_recv_semantics():
+    broker = AsyncBroker()
+    broker.register(('R1', 'Gi0/0'))
+    broker.register(('R1', 'Gi0/1'))
+    broker.send(('R1', 'Gi0/1'), {'n': 1})
+    broker.send(('R1', 'Gi0/0'), {'n': 2})
+    broker.send(('R9', 'Gi0/0'), {'n': 3})
+    assert broker.recv(('R1', 'Gi0/0')) == {'n': 2}
+    assert broker.recv(('R1', 'Gi0/0')) is None
+    assert broker.recv(('R1', 'Gi0/1')) == {'n': 1}
+
+
+def test_asyncio_runtime_exchanges_hellos():
+    devices = ingest_configs(SAMPLE_DIR).devices
+    stats = run_asyncio_simulation(devices, build_from_devices(devices), duration_s=0.25)
+    assert set(stats) == {'R1', 'R2', 'SW1'}
+    assert stats['R1'] == {'sent': 1, 'recv': 1, 'dropped': 1}
+    assert stats['SW1'] == {'sent': 2, 'recv': 2, 'dropped': 0}
@@ -0,0 +1,84 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+from cisco_vip_network_tool.src import cli
+from cisco_vip_network_tool.src.cli import parse_args, plan, requested_outputs
+from conftest import PKG, SAMPLE_DIR
+
+
+def test_stage_plan_runs_only_what_outputs_need():
+    assert plan(['validate']) == ['parse', 'build', 'validate']
+    assert plan(['topology']) == ['parse', 'topology']
+    assert plan(['load', 'topology']) == ['parse', 'build', 'topology', 'endpoints', 'load']
+    assert plan(['what_if', 'simulate']) == ['parse', 'build', 'endpoints', 'what_if', 'simulate']
+
+
+def test_subcommands_and_legacy_flags_agree():
+    sub = parse_args(['load', '--configs', SAMPLE_DIR, '--load-series', '--reroute-k', '2'])
+    legacy = parse_args(['--configs', SAMPLE_DIR, '--analyze-load', '--load-series', '--reroute-k', '2'])
+    assert vars(sub) == vars(legacy)
+    assert requested_outputs(sub) == ['load', 'load_series']
+    args = parse_args(['what-if', '--configs', SAMPLE_DIR, 'all', 'R1-Gi0/0-R2-Gi0/0'])
+    assert args.what_if == ['all', 'R1-Gi0/0-R2-Gi0/0'] and requested_outputs(args) == ['what_if']
+    assert args.runtime == 'threads' and args.viz_format == 'png'
+    args = parse_args(['dataplane', '--configs', SAMPLE_DIR, '--packet-size', '9000', '--dont-fragment'])
+    assert requested_outputs(args) == ['dataplane'] and (args.packet_size, args.dont_fragment) == (9000, True)
+    assert plan(['dataplane']) == ['parse', 'build', 'endpoints', 'dataplane']
+
+
+def test_incompatible_ipc_and_runtime_are_rejected(capsys):
+    for argv in (['simulate', '--configs', SAMPLE_DIR, '--ipc', 'tcp', '--runtime', 'asyncio'],
+                 ['--configs', SAMPLE_DIR, '--simulate', '--ipc', 'tcp', '--runtime', 'des']):
+        with pytest.raises(SystemExit) as exc:
+            parse_args(argv)
+        assert exc.value.code == 2 and '--ipc tcp' in capsys.readouterr().err
+    assert parse_args(['simulate', '--configs', SAMPLE_DIR, '--ipc', 'tcp']).ipc == 'tcp'
+
+
+def test_sim_fault_is_parsed_and_needs_a_virtual_clock(capsys):
+    args = parse_args(['simulate', '--configs', SAMPLE_DIR, '--runtime', 'des', '--sim-fault', '2.5:R1-Gi0/0-R2-Gi0/0'])
+    assert args.sim_fault == [(2.5, 'R1-Gi0/0-R2-Gi0/0')]
+    for argv in (['simulate', '--configs', SAMPLE_DIR, '--runtime', 'des', '--sim-fault', 'R1-Gi0/0-R2-Gi0/0'],
+                 ['simulate', '--configs', SAMPLE_DIR, '--runtime', 'des', '--sim-fault', 'soon:R1-Gi0/0-R2-Gi0/0'],
+                 ['simulate', '--configs', SAMPLE_DIR, '--sim-fault', '1:R1-Gi0/0-R2-Gi0/0'],
+                 ['--configs', SAMPLE_DIR, '--simulate', '--runtime', 'asyncio', '--sim-fault', '1:R1-Gi0/0-R2-Gi0/0']):
+        with pytest.raises(SystemExit) as exc:
+            parse_args(argv)
+        assert exc.value.code == 2 and '--sim-fault' in capsys.readouterr().err
+
+def test_unknown_rules_are_a_usage_error(capsys):
+    with pytest.raises(SystemExit) as exc:
+        parse_args(['validate', '--configs', SAMPLE_DIR, '--rules', 'mtu_mismatches,no_such_rule'])
+    assert exc.value.code == 2 and 'no_such_rule' in capsys.readouterr().err
+
+
+def test_bucket_minutes_must_divide_the_day(capsys):
+    for value in ('7', '0', '-5'):
+        with pytest.raises(SystemExit) as exc:
+            parse_args(['load', '--configs', SAMPLE_DIR, '--load-series', '--bucket-minutes', value])
+        assert exc.value.code == 2 and '--bucket-minutes' in capsys.readouterr().err
+    assert parse_args(['load', '--configs', SAMPLE_DIR, '--bucket-minutes', '120']).bucket_minutes == 120
+
+def test_dataplane_sizes_are_checked_by_the_parser(capsys):
+    for option, value in (('--dataplane-batch', '0'), ('--packet-size', '19'), ('--packet-size', '-1500')):
+        with pytest.raises(SystemExit) as exc:
+            parse_args(['dataplane', '--configs', SAMPLE_DIR, option, value])
+        assert exc.value.code == 2 and option in capsys.readouterr().err
+    args = parse_args(['dataplane', '--configs', SAMPLE_DIR, '--dataplane-batch', '1', '--packet-size', '20'])
+    assert (args.dataplane_batch, args.packet_size) == (1, 20)
+    from cisco_vip_network_tool.src.simulation.dataplane import IP_HEADER
+    assert cli.IP_HEADER == IP_HEADER
+
+
+def test_validate_skips_endpoints_and_heavy_imports(tmp_path):
+    code = ("import sys; from cisco_vip_network_tool.src import cli; "
+            f"cli.main(['validate', '--configs', {SAMPLE_DIR!r}, '--report', {str(tmp_path / 'r.jsonl')!r}, "
+            f"'--profile', {str(tmp_path / 'p.json')!r}, '--no-cache']); "
+            "print(sorted(m for m in ('matplotlib', 'numpy', 'yaml') if m in sys.modules))")
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(PKG))
+    out = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True, check=True).stdout
+    assert out.strip().splitlines()[-1] == '[]'
+    stages = json.loads((tmp_path / 'p.json').read_text())['stages']
+    assert 'parse' in stages and 'validate' in stages and 'endpoints' not in stages
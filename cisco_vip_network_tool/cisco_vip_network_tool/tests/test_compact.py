@@ -0,0 +1,68 @@
+import os
+import subprocess
+import sys
+from cisco_vip_network_tool.src.model.devices import Device, Interface
+from cisco_vip_network_tool.src.parsers.ingest import ingest_configs
+from cisco_vip_network_tool.src.topology.builder import build_from_devices
+from cisco_vip_network_tool.src.topology.compact import CompactTopology
+from cisco_vip_network_tool.src.validation.validators import config_issues_report
+from cisco_vip_network_tool.src.visualize.web import render_topology
+from conftest import PKG, SAMPLE_DIR
+
+R1_R2 = (('R1', 'GigabitEthernet0/0'), ('R2', 'GigabitEthernet0/0'))
+
+
+def _edges(edges):
+    return {tuple(sorted((u, v))): d for u, v, d in edges}
+
+
+def test_compact_matches_networkx_topology():
+    devices = ingest_configs(SAMPLE_DIR).devices
+    topo = build_from_devices(devices)
+    topo.set_link_state(*R1_R2, False)
+    ct = CompactTopology.from_topology(topo)
+    view = ct.graph
+    assert (view.number_of_nodes(), view.number_of_edges()) == (topo.graph.number_of_nodes(), topo.graph.number_of_edges())
+    assert _edges(view.edges(data=True)) == _edges(topo.graph.edges(data=True))
+    assert view.get_edge_data(('R2', 'Gi0/0'), ('R1', 'Gi0/0')) == topo.graph.get_edge_data(*R1_R2)
+    assert list(view.neighbors(('R2', 'Gi0/1'))) == [('SW1', 'GigabitEthernet0/1')]
+    assert ct.link_attrs(ct.link_id(*R1_R2)) == {'bandwidth_kbps': 100000, 'latency_ms': 1.0, 'mtu': 1400, 'up': False}
+
+    exported = ct.to_networkx()
+    assert _edges(exported.edges(data=True)) == _edges(topo.graph.edges(data=True))
+    assert set(exported.nodes) == set(topo.graph.nodes) and exported.nodes['SW1'] == {'type': 'switch'}
+
+
+def test_exported_topology_serves_validators_and_viz(tmp_path):
+    devices = ingest_configs(SAMPLE_DIR).devices
+    topo = build_from_devices(devices)
+    ct = CompactTopology.from_devices(devices)
+    exported = ct.to_topology(devices)
+    assert config_issues_report(devices, exported) == config_issues_report(devices, topo)
+    assert exported.graph.nodes['R1']['device'] is devices['R1']
+    stats = render_topology(exported, str(tmp_path / 't.svg'), fmt='svg')
+    assert (stats['devices'], stats['links']) == (len(devices), topo.device_graph().number_of_edges())
+
+
+def test_abbreviated_name_interned_by_another_device_still_resolves():
+    # 'Gi0/1' is a configured name on A, so it is interned; on B it must resolve to GigabitEthernet0/1
+    devices = {
+        'A': Device(hostname='A', type='switch', interfaces={
+            'Gi0/1': Interface(name='Gi0/1', description='LINK:A:Gi0/1-B:Gi0/1')}),
+        'B': Device(hostname='B', type='switch', interfaces={
+            'GigabitEthernet0/1': Interface(name='GigabitEthernet0/1')}),
+    }
+    ct = CompactTopology.from_devices(devices)
+    assert ct.interface_key(ct.interface_id('B', 'Gi0/1')) == ('B', 'GigabitEthernet0/1')
+    assert ct.interface_id('B', 'Gi0/7') is None
+    assert ct.graph.has_edge(('A', 'Gi0/1'), ('B', 'Gi0/1'))
+
+
+def test_topology_command_uses_compact_store():
+    code = ("import sys; from cisco_vip_network_tool.src import cli; "
+            f"cli.main(['topology', '--configs', {SAMPLE_DIR!r}, '--no-cache', '--inject-fault', 'link:R1-Gi0/0-R2-Gi0/0']); "
+            "print('networkx' in sys.modules)")
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(PKG))
+    out = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True, check=True).stdout
+    lines = out.strip().splitlines()
+    assert lines[-3:] == ['[fault] link link:R1-Gi0/0-R2-Gi0/0 DOWN', '[topology] built with 7 nodes and 2 links', 'False']
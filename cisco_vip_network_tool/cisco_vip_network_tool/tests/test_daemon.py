@@ -0,0 +1,77 @@
+import json
+import os
+import shutil
+import urllib.request
+from cisco_vip_network_tool.src.daemon.server import Daemon, query_unix
+from conftest import SAMPLE_DIR
+
+
+def _http(daemon, path, method='GET'):
+    host, port = daemon.http_address
+    req = urllib.request.Request(f"http://{host}:{port}{path}", method=method)
+    try:
+        with urllib.request.urlopen(req) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as err:
+        return err.code, json.loads(err.read())
+
+
+def test_daemon_answers_queries_and_applies_file_changes(tmp_path):
+    conf = tmp_path / 'configs'
+    shutil.copytree(SAMPLE_DIR, conf)
+    sock = str(tmp_path / 'd.sock')
+    daemon = Daemon(str(conf), http='127.0.0.1:0', unix_path=sock, poll_interval=0, log=lambda m: None)
+    daemon.start()
+    try:
+        status, body = _http(daemon, '/status')
+        assert status == 200 and body['devices'] == 3 and body['links'] == 2
+        _, body = _http(daemon, '/validate')
+        assert len(body['issues']['mtu_mismatches']) == 1
+        _, body = _http(daemon, '/path?src=R1&dst=SW1')
+        assert body['paths'][0]['hops'] == ['R1', 'R2', 'SW1']
+        assert _http(daemon, '/path?src=R1&dst=NOPE')[0] == 400
+        assert _http(daemon, '/nope')[0] == 404
+        assert _http(daemon, '/reload')[0] == 405
+
+        # Fix the MTU on R2 and drop SW1: only those files are re-read.
+        r2 = (conf / 'R2.config.dump').read_text().replace(' mtu 1400\n', ' mtu 1500\n')
+        (conf / 'R2.config.dump').write_text(r2)
+        (conf / 'SW1.config.dump').unlink()
+        status, body = _http(daemon, '/reload', method='POST')
+        assert status == 200 and body['update']['reparsed'] == 1 and body['update']['removed'] == 1
+        _, body = _http(daemon, '/validate')
+        assert body['issues']['mtu_mismatches'] == []
+        assert query_unix(sock, 'status')['devices'] == 2
+
+        # Faults over the socket; what-if leaves state alone.
+        body = query_unix(sock, 'fault', link='R1-Gi0/0-R2-Gi0/0')
+        assert body['status'] == 200 and body['up'] is False
+        assert query_unix(sock, 'path', src='R1', dst='R2')['paths'] == []
+        assert query_unix(sock, 'fault', link='R1-Gi0/0-R2-Gi0/0', state='up')['up'] is True
+        body = query_unix(sock, 'what-if', spec='R1-Gi0/0-R2-Gi0/0')
+        assert body['scenarios'] == 1 and body['results'][0]['isolated_count'] == 1
+        assert query_unix(sock, 'status')['links'] == 1
+        assert query_unix(sock, 'fault', link='R9-Gi0-R1-Gi0')['status'] == 400
+    finally:
+        daemon.stop()
+    assert not os.path.exists(sock)
+
+
+def test_concurrent_reloads_apply_each_change_once(tmp_path):
+    import threading
+    from cisco_vip_network_tool.src.daemon.state import NetworkState
+    conf = tmp_path / 'configs'
+    shutil.copytree(SAMPLE_DIR, conf)
+    state = NetworkState(str(conf))
+    state.load()
+    r2 = (conf / 'R2.config.dump').read_text().replace(' mtu 1400\n', ' mtu 1500\n')
+    (conf / 'R2.config.dump').write_text(r2)
+    os.utime(conf / 'R2.config.dump', ns=(1, 1))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(state.apply_changes())) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(r is None for r in results) == [False, True, True, True]
+    assert state.topo.graph.edges[('R1', 'GigabitEthernet0/0'), ('R2', 'GigabitEthernet0/0')]['mtu'] == 1500
@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+from cisco_vip_network_tool.benchmarks.synth import generate
+from cisco_vip_network_tool.src.model.devices import Endpoint
+from cisco_vip_network_tool.src.parsers.endpoints import load_endpoints
+from cisco_vip_network_tool.src.parsers.ingest import ingest_configs
+from cisco_vip_network_tool.src.topology.builder import build_from_devices
+from cisco_vip_network_tool.src.simulation import dataplane
+from cisco_vip_network_tool.src.simulation.dataplane import (FATES, IP_HEADER, DataPlane, fragments, packet_batches,
+                                                              run_dataplane)
+from cisco_vip_network_tool.src.simulation.events import inject_link_fault
+from conftest import SAMPLE_DIR
+
+R1_R2 = (('R1', 'GigabitEthernet0/0'), ('R2', 'GigabitEthernet0/0'))
+R2_SW1 = (('R2', 'GigabitEthernet0/1'), ('SW1', 'GigabitEthernet0/1'))
+ENDPOINTS = {
+    'hostA': Endpoint(name='hostA', vlan=10, ip='192.168.10.10/24', gw='192.168.10.1/24', app_profile='HTTP'),
+    'hostC': Endpoint(name='hostC', vlan=10, ip='192.168.10.12/24', gw='192.168.10.254/24', app_profile='HTTP'),
+    'hostX': Endpoint(name='hostX', vlan=99, ip='10.9.9.9/24', gw='10.9.9.1/24', app_profile='HTTP'),
+}
+
+
+def test_fragmentation_df_and_link_down_on_sample():
+    topo = build_from_devices(ingest_configs(SAMPLE_DIR).devices)
+    dp = DataPlane(topo, ENDPOINTS)
+    # hostA crosses SW1 -> R2 (MTU 1500) -> R1 (MTU 1400); hostC's gateway is on SW1; hostX has none
+    fates = dp.forward(np.array([0, 0, 1, 2]), np.array([1500, 1000, 1500, 64]))
+    assert [FATES[f] for f in fates] == ['delivered', 'delivered', 'delivered', 'no_route']
+    assert list(dp.link_counters()) == [(R1_R2, 1500 + IP_HEADER + 1000, 3), (R2_SW1, 2500, 2)]
+    assert dp.fragmented == 1
+
+    dp = DataPlane(topo, ENDPOINTS, df=True)
+    dp.forward(np.array([0, 0]), np.array([1500, 1400]))
+    assert dp.summary()['mtu'] == 1 and dict((l, b) for l, b, _ in dp.link_counters()) == {R2_SW1: 2900, R1_R2: 1400}
+
+    # A link failing after routing drops the flow until it is rerouted (here: there is no detour)
+    dp.reset()
+    inject_link_fault(topo, 'R2-Gi0/1-SW1-Gi0/1')
+    dp.forward(np.array([0]), np.array([100]))
+    assert dp.summary()['link_down'] == 1 and not list(dp.link_counters())
+    dp.reroute()
+    dp.reset()
+    dp.forward(np.array([0]), np.array([100]))
+    assert dp.summary()['no_route'] == 1
+
+
+def _walk(dp, flow, size):
+    """Reference: one packet forwarded hop by hop in Python."""
+    row = dp.flow_row[flow]
+    if row < 0 or not dp.routed[row]:
+        return 'no_route', {}
+    seen, mtu = {}, dataplane.NO_LIMIT
+    for link in dp.hop_link[row][:dp.hops[row]]:
+        data = dp.topo.graph.edges[dp.links[link]]
+        if not data['up']:
+            return 'link_down', seen
+        mtu = min(mtu, data.get('mtu') or dataplane.NO_LIMIT)
+        if dp.df and size > mtu:
+            return 'mtu', seen
+        n = int(fragments(np.array(size), np.array(mtu)))
+        seen[link] = (size + (n - 1) * IP_HEADER, n)
+    return 'delivered', seen
+
+
+def test_batches_match_per_packet_walk(tmp_path, monkeypatch):
+    generate(str(tmp_path), routers=8, switches=16, links_per_device=3, vlans=10, endpoints=200, seed=4,
+             mtu_mismatch=0.3)
+    topo = build_from_devices(ingest_configs(str(tmp_path)).devices)
+    endpoints = load_endpoints(str(tmp_path))
+    rng = np.random.default_rng(7)
+    flows = rng.integers(0, len(endpoints), 3000)
+    sizes = rng.choice([64, 576, 1200, 1500, 9000], 3000)
+    for df in (False, True):
+        dp = DataPlane(topo, endpoints, df=df)
+        again = DataPlane(topo, endpoints, df=df)
+        link = dp.links[int(dp.hop_link[dp.hops.argmax(), 0])]
+        topo.set_link_state(*link, up=False)
+        fates = dp.forward(flows, sizes)
+        want_bytes = np.zeros(len(dp.links))
+        want_packets = np.zeros(len(dp.links))
+        for i, (f, s) in enumerate(zip(flows.tolist(), sizes.tolist())):
+            fate, seen = _walk(dp, f, s)
+            assert FATES[fates[i]] == fate
+            for l, (b, n) in seen.items():
+                want_bytes[l] += b
+                want_packets[l] += n
+        assert (dp.link_bytes == want_bytes).all() and (dp.link_packets == want_packets).all()
+        # Sorting into groups instead of counting gives the same result, as do smaller batches
+        monkeypatch.setattr(dataplane, 'DENSE_GROUPS', 0)
+        for i in range(0, len(flows), 700):
+            again.forward(flows[i:i + 700], sizes[i:i + 700])
+        monkeypatch.undo()
+        assert again.summary() == dp.summary() and (again.link_bytes == dp.link_bytes).all()
+        topo.set_link_state(*link, up=True)
+
+
+def test_run_dataplane_restores_faulted_links():
+    topo = build_from_devices(ingest_configs(SAMPLE_DIR).devices)
+    dp, summary = run_dataplane(topo, ENDPOINTS, packets=10000, batch_size=3000, packet_size=1400,
+                                faults=['R1-Gi0/0-R2-Gi0/0', 'R9-Gi0/0-R2-Gi0/0'])
+    assert summary['packets'] == 10000 and summary['fragmented'] == 0
+    assert summary['faults_not_found'] == ['R9-Gi0/0-R2-Gi0/0']
+    assert summary['delivered'] + summary['link_down'] + summary['no_route'] == 10000
+    assert summary['link_down'] == int(dp.flow_fates[0, FATES.index('link_down')]) > 0
+    assert topo.graph.edges[R1_R2]['up']
+
+
+def test_packet_batches_rejects_empty_batches():
+    with pytest.raises(ValueError):
+        list(packet_batches(4, 100, batch_size=0))
+    assert [len(f) for f, _ in packet_batches(4, 5, batch_size=2)] == [2, 2, 1]
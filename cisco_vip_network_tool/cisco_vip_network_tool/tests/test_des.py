@@ -0,0 +1,26 @@
+from cisco_vip_network_tool.src.parsers.ingest import ingest_configs
+from cisco_vip_network_tool.src.topology.builder import build_from_devices
+from cisco_vip_network_tool.src.simulation.des import run_des_simulation
+from conftest import SAMPLE_DIR
+
+
+def test_des_replays_hellos_and_faults_deterministically():
+    devices = ingest_configs(SAMPLE_DIR).devices
+    runs = []
+    for _ in range(2):
+        topo = build_from_devices(devices)
+        runs.append(run_des_simulation(devices, topo, duration_s=60.0,
+                                       faults=[(30.5, 'R2-Gi0/1-SW1-Gi0/1')]))
+    assert runs[0] == runs[1]
+    # 61 hello rounds (t=0..60s; the last one lands after the window). R1<->R2 HELLOs are
+    # dropped on the 1400-byte MTU link, R2<->SW1 exchange HELLO + ACK until the fault at t=30.5s.
+    assert runs[0]['R1'] == {'sent': 61, 'recv': 60, 'dropped': 60}
+    assert runs[0]['SW1'] == {'sent': 31 + 31, 'recv': 31 + 31, 'dropped': 0}
+    assert runs[0]['R2'] == {'sent': 61 + 31 + 31, 'recv': 60 + 31 + 31, 'dropped': 60}
+
+
+def test_hello_size_follows_packet_size():
+    devices = ingest_configs(SAMPLE_DIR).devices
+    stats = run_des_simulation(devices, build_from_devices(devices), duration_s=10.0, packet_size=1400)
+    # 1400-byte HELLOs fit the R1<->R2 link, so both sides answer
+    assert stats['R1'] == {'sent': 11 + 10, 'recv': 10 + 10, 'dropped': 0}
@@ -0,0 +1,43 @@
+from cisco_vip_network_tool.src.model.devices import Device, Endpoint, Interface
+from cisco_vip_network_tool.src.parsers.ingest import ingest_configs
+from cisco_vip_network_tool.src.topology.builder import build_from_devices
+from cisco_vip_network_tool.src.simulation.failures import FailureAnalyzer, what_if
+from conftest import SAMPLE_DIR
+
+
+def _square_with_tail():
+    # A-B-C-D-A ring, plus E hanging off D; gateway SVI on A, endpoints attach on E
+    devs = {h: Device(hostname=h, type='switch') for h in 'ABCDE'}
+    for i, (a, b) in enumerate([('A', 'B'), ('B', 'C'), ('C', 'D'), ('D', 'A'), ('D', 'E')]):
+        devs[a].interfaces[f'Gi0/{i}'] = Interface(name=f'Gi0/{i}', description=f'LINK:{a}:Gi0/{i}-{b}:Gi0/{i}',
+                                                   bandwidth_kbps=2000)
+        devs[b].interfaces[f'Gi0/{i}'] = Interface(name=f'Gi0/{i}', bandwidth_kbps=2000)
+    devs['A'].interfaces['Vlan10'] = Interface(name='Vlan10', ip='10.0.10.1/24')
+    devs['E'].interfaces['Fa0/1'] = Interface(name='Fa0/1', vlan=10)
+    eps = {f'h{i}': Endpoint(name=f'h{i}', vlan=10, ip=f'10.0.10.{i + 10}/24', gw='10.0.10.1/24', app_profile='Video')
+           for i in range(2)}
+    return devs, eps
+
+
+def test_n1_sweep_reports_partitions_and_reroutes():
+    devs, eps = _square_with_tail()
+    topo = build_from_devices(devs)
+    fa = FailureAnalyzer(topo, eps)
+    results = {r['scenario']: r for r in fa.sweep(fa.single_link_scenarios())}
+    tail = results['D-Gi0/4-E-Gi0/4']
+    assert (tail['isolated_devices'], tail['lost_device_pairs'], tail['unserved_kbps']) == (['E'], 4, 10000)
+    # A-D carries the 10 Mbps of peak Video demand; losing it pushes it around the ring
+    ad = results['A-Gi0/3-D-Gi0/3']
+    assert (ad['isolated_count'], ad['rerouted_kbps']) == (0, 10000)
+    assert len(ad['new_overloads']) == 3  # A-B, B-C, C-D
+    assert all(r['isolated_count'] == 0 for k, r in results.items() if k != tail['scenario'])
+    assert topo.graph.edges[('A', 'Gi0/3'), ('D', 'Gi0/3')]['up'] is True
+
+
+def test_double_failure_and_bad_spec():
+    devices = ingest_configs(SAMPLE_DIR).devices
+    topo = build_from_devices(devices)
+    results = what_if(topo, ['R1-Gi0/0-R2-Gi0/0+R2-Gi0/1-SW1-Gi0/1', 'R9-Gi0/0-R2-Gi0/0'])
+    assert results[0]['lost_device_pairs'] == 3
+    assert results[0]['isolated_devices'] == ['R2', 'SW1']
+    assert results[1] == {'scenario': 'R9-Gi0/0-R2-Gi0/0', 'error': 'link not found'}
@@ -0,0 +1,41 @@
+import os
+import shutil
+from cisco_vip_network_tool.src.parsers.ingest import ingest_configs
+from cisco_vip_network_tool.src.parsers.cache import ParseCache
+from conftest import SAMPLE_DIR
+
+
+def test_ingest_reports_duplicates_and_errors(tmp_path):
+    for name in ('R1', 'R2', 'SW1'):
+        shutil.copy(os.path.join(SAMPLE_DIR, f'{name}.config.dump'), tmp_path)
+    shutil.copy(os.path.join(SAMPLE_DIR, 'R1.config.dump'), tmp_path / 'R1-copy.config.dump')
+    os.mkdir(tmp_path / 'broken.config.dump')
+    (tmp_path / 'empty.config.dump').write_text('')
+
+    serial = ingest_configs(str(tmp_path), workers=1)
+    pooled = ingest_configs(str(tmp_path), workers=2, batch_size=1)
+
+    assert serial == pooled
+    assert list(serial.devices) == ['R1', 'R2', 'SW1', 'UNKNOWN']
+    assert serial.duplicates == [('R1', str(tmp_path / 'R1-copy.config.dump'), str(tmp_path / 'R1.config.dump'))]
+    assert [p for p, _ in serial.errors] == [str(tmp_path / 'broken.config.dump')]
+
+
+def test_parse_cache_hits_and_eviction(tmp_path):
+    conf = tmp_path / 'conf'
+    conf.mkdir()
+    for name in ('R1', 'R2', 'SW1'):
+        shutil.copy(os.path.join(SAMPLE_DIR, f'{name}.config.dump'), conf)
+    cache_dir = str(tmp_path / 'cache')
+
+    cold = ingest_configs(str(conf), cache_dir=cache_dir)
+    warm = ingest_configs(str(conf), cache_dir=cache_dir)
+    assert (cold.cache_hits, warm.cache_hits) == (0, 3)
+    assert warm.devices == cold.devices
+
+    (conf / 'R2.config.dump').write_text((conf / 'R2.config.dump').read_text().replace('mtu 1400', 'mtu 1500'))
+    changed = ingest_configs(str(conf), cache_dir=cache_dir)
+    assert changed.cache_hits == 2
+    assert changed.devices['R2'].interfaces['GigabitEthernet0/0'].mtu == 1500
+
+    assert ParseCache(cache_dir, max_bytes=0).evict() == 4
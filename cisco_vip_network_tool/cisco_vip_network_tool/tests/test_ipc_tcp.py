@@ -0,0 +1,46 @@
+import time
+from cisco_vip_network_tool.src.parsers.ingest import ingest_configs
+from cisco_vip_network_tool.src.topology.builder import build_from_devices
+from cisco_vip_network_tool.src.simulation.ipc_tcp import (
+    TcpBrokerHub, TcpBroker, encode_record, decode_records, run_tcp_simulation)
+from conftest import SAMPLE_DIR
+
+
+def test_record_encoding_round_trip():
+    hello = {'type': 'HELLO', 'from': {'dev': 'R1', 'if': 'Gi0/0'}}
+    other = {'type': 'LSA', 'from': {'dev': 'R1', 'if': 'Gi0/0'}, 'seq': 7}
+    buf = encode_record(('R2', 'Gi0/0'), hello) + encode_record(('R2', 'Gi0/1'), other)
+    assert len(encode_record(('R2', 'Gi0/0'), hello)) == 1 + 4 * 2 + len('R2Gi0/0R1Gi0/0')
+    assert [(d, m) for _, d, m in decode_records(buf)] == [(('R2', 'Gi0/0'), hello), (('R2', 'Gi0/1'), other)]
+
+
+def test_brokers_exchange_batched_messages_over_loopback():
+    hub = TcpBrokerHub()
+    a, b = TcpBroker(hub.address, batch_size=50), TcpBroker(hub.address)
+    a.register(('R1', 'Gi0/0'))
+    b.register(('R2', 'Gi0/0'))
+    a.flush()
+    b.flush()
+    deadline = time.time() + 5
+    while len(hub.routes) < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    for _ in range(200):
+        a.send(('R2', 'Gi0/0'), {'type': 'HELLO', 'from': {'dev': 'R1', 'if': 'Gi0/0'}})
+    a.flush()
+    got = [b.recv(('R2', 'Gi0/0'), timeout=2) for _ in range(200)]
+    assert all(m == {'type': 'HELLO', 'from': {'dev': 'R1', 'if': 'Gi0/0'}} for m in got)
+    assert hub.stats()['messages'] == 200
+    assert hub.stats()['frames'] == 4
+    a.close()
+    b.close()
+    hub.close()
+
+
+def test_tcp_simulation_across_processes():
+    devices = ingest_configs(SAMPLE_DIR).devices
+    logs = []
+    stats = run_tcp_simulation(devices, build_from_devices(devices), log_cb=logs.append,
+                               duration_s=0.3, processes=2)
+    assert set(stats) == {'R1', 'R2', 'SW1'}
+    assert stats['SW1']['recv'] >= 1 and stats['R1']['dropped'] >= 1
+    assert any('msg/s' in line for line in logs)
@@ -0,0 +1,130 @@
+import pytest
+from cisco_vip_network_tool.src.model.devices import Device, Endpoint, Interface
+from cisco_vip_network_tool.src.parsers.ingest import ingest_configs
+from cisco_vip_network_tool.src.topology.builder import build_from_devices
+from cisco_vip_network_tool.src.load.engine import engine_for
+from cisco_vip_network_tool.src.load.load_manager import (capacity_analysis, compute_link_loads, compute_load_series,
+                                                          unrouted_demand)
+from cisco_vip_network_tool.src.load.profiles import parse_profiles
+from cisco_vip_network_tool.src.simulation.events import inject_link_fault
+from conftest import SAMPLE_DIR
+
+R1_R2 = (('R1', 'GigabitEthernet0/0'), ('R2', 'GigabitEthernet0/0'))
+R2_SW1 = (('R2', 'GigabitEthernet0/1'), ('SW1', 'GigabitEthernet0/1'))
+
+
+def test_demand_is_routed_over_backbone_links():
+    topo = build_from_devices(ingest_configs(SAMPLE_DIR).devices)
+    endpoints = {
+        'hostA': Endpoint(name='hostA', vlan=10, ip='192.168.10.10/24', gw='192.168.10.1/24', app_profile='HTTP'),
+        'hostB': Endpoint(name='hostB', vlan=10, ip='192.168.10.11/24', gw='192.168.10.1/24', app_profile='VoIP'),
+        'hostC': Endpoint(name='hostC', vlan=10, ip='192.168.10.12/24', gw='192.168.10.254/24', app_profile='HTTP'),
+    }
+    loads = compute_link_loads(topo, endpoints, peak=True)
+    backbone = {tuple(sorted(k)): v for k, v in loads.items() if isinstance(k[0], tuple)}
+    assert backbone == {R1_R2: 1700, R2_SW1: 1700}
+    assert loads[('HOST:hostC', 'SW1:Vlan10')] == 1500
+
+    assert unrouted_demand(topo, endpoints) == {}
+
+    inject_link_fault(topo, 'R1-Gi0/0-R2-Gi0/0')
+    loads = compute_link_loads(topo, endpoints, peak=False, include_access=False)
+    assert loads == {}
+    assert unrouted_demand(topo, endpoints, peak=True) == {'hostA': 1500.0, 'hostB': 200.0}
+
+
+def test_multi_switch_vlan_spreads_endpoints_over_access_switches():
+    """R (gateway SVI for VLAN 10) with two access switches; SW2 has three access ports, SW1 one."""
+    def switch(h, n_access):
+        ports = {f"Gi0/{i}": Interface(name=f"Gi0/{i}", vlan=10, mode='access') for i in range(1, n_access + 1)}
+        ports['Gi0/0'] = Interface(name='Gi0/0', description=f"LINK:{h}:Gi0/0-R:{h}")
+        return Device(hostname=h, type='switch', interfaces=ports)
+    devices = {'R': Device(hostname='R', type='router', interfaces={'Vlan10': Interface(name='Vlan10', ip='10.0.10.1/24')}),
+               'SW1': switch('SW1', 1), 'SW2': switch('SW2', 3)}
+    topo = build_from_devices(devices)
+    endpoints = {f"h{i}": Endpoint(name=f"h{i}", vlan=10, ip=f"10.0.10.{i + 10}/24", gw='10.0.10.1/24',
+                                   app_profile='VoIP') for i in range(400)}
+    loads = compute_link_loads(topo, endpoints, include_access=False)
+    by_switch = {u[0] if u[0] != 'R' else v[0]: kbps for (u, v), kbps in loads.items()}
+    assert set(by_switch) == {'SW1', 'SW2'} and sum(by_switch.values()) == 400 * 100
+    assert 2 < by_switch['SW2'] / by_switch['SW1'] < 4.5      # about 3:1, the access port ratio
+    assert compute_link_loads(topo, endpoints, include_access=False) == loads
+
+    inject_link_fault(topo, 'R-SW1-SW1-Gi0/0')
+    lost = unrouted_demand(topo, endpoints)
+    assert sum(lost.values()) == by_switch['SW1']
+
+
+def _ring():
+    """R1-R2-R3-R4-R1 ring plus a second R1-R2 link; every link at the default 100 Mbps."""
+    ports = {'R1': [('Gi0', 'R2:Gi0'), ('Gi1', 'R4:Gi1'), ('Gi2', 'R2:Gi2')],
+             'R2': [('Gi0', 'R1:Gi0'), ('Gi1', 'R3:Gi0'), ('Gi2', 'R1:Gi2')],
+             'R3': [('Gi0', 'R2:Gi1'), ('Gi1', 'R4:Gi0')],
+             'R4': [('Gi0', 'R3:Gi1'), ('Gi1', 'R1:Gi1')]}
+    return build_from_devices({h: Device(hostname=h, type='router', interfaces={
+        ifn: Interface(name=ifn, description=f"LINK:{h}:{ifn}-{peer}") for ifn, peer in ps}) for h, ps in ports.items()})
+
+
+def test_capacity_findings_recommend_detours_with_headroom():
+    topo = _ring()
+    hot = (('R1', 'Gi0'), ('R2', 'Gi0'))
+    loads = {hot: 250000, (('R1', 'Gi2'), ('R2', 'Gi2')): 90000,
+             (('R1', 'Gi1'), ('R4', 'Gi1')): 40000, (('R3', 'Gi1'), ('R4', 'Gi0')): 20000}
+    [f] = capacity_analysis(topo, loads, k=3)
+    assert f['edge'] == hot and f['excess_kbps'] == 150000
+    assert f['alternatives'] == [{'path': ['R1', 'R4', 'R3', 'R2'], 'headroom_kbps': 60000},
+                                 {'path': ['R1', 'R2'], 'via': 'parallel links', 'headroom_kbps': 10000}]
+    assert 'Move up to 60000 kbps to R1 -> R4 -> R3 -> R2' in f['recommendation']
+
+    # Detours are cached per device pair and refreshed with the topology.
+    engine = engine_for(topo)
+    assert engine.detours('R2', 'R1', 3) == [['R2', 'R3', 'R4', 'R1']]
+    inject_link_fault(topo, 'R3-Gi1-R4-Gi0')
+    [f] = capacity_analysis(topo, {hot: 250000}, k=3)
+    assert f['alternatives'][0]['via'] == 'parallel links'
+    assert f['recommendation'].startswith('Move up to 100000 kbps')
+    assert capacity_analysis(topo, {hot: 250000}, max_rerouted=0)[0]['recommendation'].startswith('No detour')
+
+
+def test_k_shortest_paths_in_cost_order():
+    topo = build_from_devices(ingest_configs(SAMPLE_DIR).devices)
+    engine = engine_for(topo)
+    paths = engine.k_shortest_paths('R1', 'SW1', 3)
+    assert paths[0] == ['R1', 'R2', 'SW1']
+    assert [engine.path_cost(p) for p in paths] == sorted(engine.path_cost(p) for p in paths)
+    assert len({tuple(p) for p in paths}) == len(paths)
+
+
+def test_load_series_follows_hourly_profiles():
+    topo = build_from_devices(ingest_configs(SAMPLE_DIR).devices)
+    endpoints = {
+        'hostA': Endpoint(name='hostA', vlan=10, ip='192.168.10.10/24', gw='192.168.10.1/24', app_profile='HTTP'),
+        'hostB': Endpoint(name='hostB', vlan=10, ip='192.168.10.11/24', gw='192.168.10.1/24', app_profile='VoIP'),
+    }
+    curve = [0.0] * 24
+    curve[14] = 1.0
+    profiles = parse_profiles({'profiles': {'HTTP': {'regular_kbps': 500, 'peak_kbps': 1000, 'hourly': curve}}})
+    ls = compute_load_series(topo, endpoints, profiles, bucket_minutes=60)
+    assert ls.series.shape == (2, 24)
+    by_link = {tuple(sorted(e)): row for e, row in zip(ls.links, ls.series)}
+    row = by_link[R1_R2]
+    # VoIP has no curve: peak 200 kbps in business hours, regular 100 otherwise; HTTP only at 14:00.
+    assert row[3] == 100 and row[10] == 200 and row[14] == 1200
+    assert ls.busiest_hour()[0] == 14
+    assert [(tuple(sorted(e)), kbps, minute) for e, kbps, minute in ls.link_peaks()][0][1:] == (1200, 840)
+    assert ls.at(14 * 60 + 30)[ls.links[0]] == 1200
+
+    # Peak/regular link loads come from the same profiles.
+    loads = compute_link_loads(topo, endpoints, peak=True, include_access=False, profiles=profiles)
+    assert {tuple(sorted(k)): v for k, v in loads.items()} == {R1_R2: 1200, R2_SW1: 1200}
+
+    # 5-minute buckets interpolate between hourly values.
+    fine = compute_load_series(topo, endpoints, profiles).series
+    assert fine.shape == (2, 288) and fine.max() == pytest.approx(200 + 1000 * 23 / 24)
+    # Buckets longer than an hour spread over the hours they cover.
+    coarse = compute_load_series(topo, endpoints, profiles, bucket_minutes=120)
+    assert coarse.series.shape == (2, 12) and coarse.hourly_total().shape == (24,)
+    hour, kbps = coarse.busiest_hour()
+    assert hour == 14 and kbps == pytest.approx(coarse.total().max())
+    with pytest.raises(ValueError):
+        parse_profiles({'profiles': {'HTTP': {'hourly': [1.0] * 12}}})
@@ -0,0 +1,93 @@
+import random
+from cisco_vip_network_tool.benchmarks.synth import generate
+from cisco_vip_network_tool.src.control.ospf import OspfDomain, route_changes
+from cisco_vip_network_tool.src.model.devices import Device, Interface
+from cisco_vip_network_tool.src.parsers.ingest import ingest_configs
+from cisco_vip_network_tool.src.topology.builder import build_from_devices
+from conftest import SAMPLE_DIR
+
+
+def _router(name, ifaces, networks):
+    dev = Device(hostname=name, type='router')
+    for ifn, ip, peer, bw in ifaces:
+        dev.interfaces[ifn] = Interface(name=ifn, ip=ip, bandwidth_kbps=bw,
+                                        description=f'LINK:{name}:{ifn}-{peer}' if peer else None)
+    dev.routing['ospf'] = {'process': '1', 'networks': [{'ip': ip, 'wildcard': wc, 'area': area}
+                                                        for ip, wc, area in networks]}
+    return dev
+
+
+def _two_areas():
+    # R1-R2-R3 triangle in area 0; R2 is the ABR towards R4 in area 1 over a 10 Mbps link (cost 10)
+    devs = [
+        _router('R1', [('Gi0/0', '10.0.12.1/30', 'R2:Gi0/0', 100000), ('Gi0/1', '10.0.13.1/30', 'R3:Gi0/0', 100000),
+                       ('Loopback0', '1.1.1.1/32', None, None)],
+                [('10.0.0.0', '0.0.255.255', '0'), ('1.1.1.1', '0.0.0.0', '0')]),
+        _router('R2', [('Gi0/0', '10.0.12.2/30', None, 100000), ('Gi0/1', '10.0.23.1/30', 'R3:Gi0/1', 100000),
+                       ('Gi0/2', '10.1.24.1/30', 'R4:Gi0/0', 10000)],
+                [('10.0.0.0', '0.0.255.255', '0'), ('10.1.24.0', '0.0.0.3', '1')]),
+        _router('R3', [('Gi0/0', '10.0.13.2/30', None, 100000), ('Gi0/1', '10.0.23.2/30', None, 100000)],
+                [('0.0.0.0', '255.255.255.255', '0.0.0.0')]),
+        _router('R4', [('Gi0/0', '10.1.24.2/30', None, 10000), ('Loopback0', '4.4.4.4/32', None, None)],
+                [('10.1.24.0', '0.0.0.3', '1'), ('4.4.4.4', '0.0.0.0', '1')]),
+    ]
+    return build_from_devices({d.hostname: d for d in devs})
+
+
+def test_lsdb_and_routes_across_areas():
+    topo = _two_areas()
+    dom = OspfDomain(topo)
+    assert sorted(dom.areas) == ['0', '1'] and dom.abrs('1') == ['R2'] and not dom.issues
+    assert dom.lsdb('0')['R2'].links == [('R1', 1), ('R3', 1)]
+    r1 = dom.routes('R1')
+    assert r1['1.1.1.1/32'].kind == 'connected'
+    # 10.0.23.0/30 is two hops away over R2 and over R3
+    assert r1['10.0.23.0/30'].cost == 2 and r1['10.0.23.0/30'].next_hops == (('R2', 'Gi0/0'), ('R3', 'Gi0/1'))
+    route = r1['4.4.4.4/32']
+    assert (route.kind, route.cost, route.next_hops) == ('inter', 1 + 10 + 1, (('R2', 'Gi0/0'),))
+    r4 = dom.routes('R4')
+    assert (r4['1.1.1.1/32'].kind, r4['1.1.1.1/32'].cost) == ('inter', 10 + 1 + 1)
+
+
+def test_link_fault_updates_only_affected_trees():
+    topo = _two_areas()
+    dom = OspfDomain(topo)
+    dom.compute_all()
+    before = {r: dom.routes(r) for r in dom.router_areas}
+    stats = dom.fail_link('R1-Gi0/0-R2-Gi0/0')
+    assert [c[:3] for c in stats['changed']] == [('0', 'R1', 'R2')]
+    # R3's tree never used R1-R2, and area 1 trees cannot
+    assert stats['trees_updated'] == 2 and stats['trees_untouched'] == 3
+    after = {r: dom.routes(r) for r in dom.router_areas}
+    assert after['R1']['4.4.4.4/32'].next_hops == (('R3', 'Gi0/1'),) and after['R1']['4.4.4.4/32'].cost == 13
+    assert set(route_changes(before, after)) == {'R1', 'R2', 'R3', 'R4'}
+    fresh = OspfDomain(topo)
+    assert {r: dom.routes(r) for r in dom.router_areas} == {r: fresh.routes(r) for r in fresh.router_areas}
+    topo.set_link_state(('R1', 'Gi0/0'), ('R2', 'Gi0/0'), True)
+    dom.sync()
+    assert {r: dom.routes(r) for r in dom.router_areas} == before
+
+
+def test_mtu_mismatch_blocks_adjacency():
+    topo = build_from_devices(ingest_configs(SAMPLE_DIR).devices)
+    dom = OspfDomain(topo)
+    assert dom.adjacency_count() == 0 and 'MTU mismatch' in dom.issues[0]['reason']
+    assert OspfDomain(topo, check_mtu=False).distance('R1', 'R2') == 1
+
+
+def test_incremental_spf_matches_full_recompute(tmp_path):
+    generate(str(tmp_path), routers=30, switches=20, links_per_device=4, vlans=10, endpoints=0, seed=5)
+    topo = build_from_devices(ingest_configs(str(tmp_path)).devices)
+    dom = OspfDomain(topo, check_mtu=False)
+    dom.compute_all()
+    links = [k for a in dom.areas.values() for m in a.members.values() for k in m]
+    rng = random.Random(1)
+    for _ in range(25):
+        link = rng.choice(links)
+        topo.set_link_state(*link, up=not dom.up[link])
+        dom.sync()
+        for area in dom.areas.values():
+            for root, tree in area.trees.items():
+                ref = area._full_spf(root)
+                assert list(tree.dist) == list(ref.dist)
+                assert all(sorted(tree.parents(x)) == sorted(ref.parents(x)) for x in range(len(area.routers)))
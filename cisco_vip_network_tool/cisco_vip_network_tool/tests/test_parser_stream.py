@@ -0,0 +1,74 @@
+import glob
+import io
+import os
+from cisco_vip_network_tool.src.parsers.cisco_parser import parse_config_regex, parse_config_file
+from conftest import SAMPLE_DIR
+
+EDGE_CASES = """hostname EDGE1
+!
+vlan 20
+ name Voice
+vlan 30
+!
+interface GigabitEthernet0/0.100
+ description LINK:EDGE1:Gi0/0.100-R9:Gi0/1
+ ip address 10.9.0.1 255.255.255.252
+ ip address 10.9.9.1 255.255.255.0 secondary
+ mtu 9000
+interface Loopback0
+ ip address 1.1.1.1/32
+!
+interface FastEthernet0/1
+ switchport access vlan 30
+ switchport mode access
+ bandwidth 10000
+interface GigabitEthernet0/2
+ switchport mode trunk
+ switchport trunk allowed vlan 20,30-32
+ switchport trunk allowed vlan add 40
+ switchport trunk allowed vlan remove 31
+router ospf 7
+ network 10.9.0.0 0.0.0.3 area 1
+!
+router bgp 65001
+ neighbor 10.9.0.2 remote-as 65002
+ neighbor 10.9.0.6 remote-as 65003
+!
+"""
+
+
+def test_stream_parser_matches_regex_parser_on_samples():
+    paths = sorted(glob.glob(os.path.join(SAMPLE_DIR, '*.config.dump')))
+    assert paths
+    for path in paths:
+        with open(path) as fh:
+            text = fh.read()
+        with open(path) as fh:
+            streamed = parse_config_file(fh)
+        assert streamed == parse_config_regex(text), path
+
+
+def test_stream_parser_matches_regex_parser_on_edge_cases():
+    streamed = parse_config_file(io.StringIO(EDGE_CASES))
+    assert streamed == parse_config_regex(EDGE_CASES)
+    assert streamed.interfaces['Loopback0'].ip == '1.1.1.1/32'
+    assert streamed.vlans == {20: {'name': 'Voice'}, 30: {'name': 'VLAN30'}}
+    assert len(streamed.routing['bgp']['neighbors']) == 2
+    assert streamed.interfaces['FastEthernet0/1'].mode == 'access'
+    trunk = streamed.interfaces['GigabitEthernet0/2']
+    assert (trunk.mode, trunk.trunk_vlans) == ('trunk', [20, 30, 32, 40])
+
+
+def test_trunk_add_keeps_implicit_all():
+    text = """hostname SW9
+interface GigabitEthernet0/1
+ switchport mode trunk
+ switchport trunk allowed vlan add 30
+interface GigabitEthernet0/2
+ switchport mode trunk
+ switchport trunk allowed vlan none
+ switchport trunk allowed vlan add 30
+"""
+    for dev in (parse_config_file(io.StringIO(text)), parse_config_regex(text)):
+        assert dev.interfaces['GigabitEthernet0/1'].trunk_vlans is None
+        assert dev.interfaces['GigabitEthernet0/2'].trunk_vlans == [30]
@@ -0,0 +1,45 @@
+from cisco_vip_network_tool.src.parsers.ingest import ingest_configs
+from cisco_vip_network_tool.src.topology.builder import build_from_devices
+from cisco_vip_network_tool.src.validation.validators import config_issues_report
+from cisco_vip_network_tool.src.simulation.des import run_des_simulation
+from cisco_vip_network_tool.src.profiling.profiler import Histogram, SimMetrics, StageProfiler, to_prometheus
+from conftest import SAMPLE_DIR
+
+
+def test_stage_profiler_nests_validators_and_tracks_peak():
+    devices = ingest_configs(SAMPLE_DIR).devices
+    topo = build_from_devices(devices)
+    prof = StageProfiler()
+    prof.start()
+    try:
+        with prof.stage('validate'):
+            plain = config_issues_report(devices, topo)
+            assert config_issues_report(devices, topo, profiler=prof) == plain
+        with prof.stage('alloc'):
+            block = bytearray(4 << 20)
+            del block
+    finally:
+        prof.stop()
+    assert {'validate', 'validate.mtu_mismatches', 'validate.l2_loops'} <= set(prof.stages)
+    assert prof.stages['alloc']['peak_bytes'] >= 4 << 20
+    assert all(r['calls'] == 1 and r['wall_s'] >= 0 for r in prof.stages.values())
+
+
+def test_des_metrics_and_prometheus_text():
+    h = Histogram([1, 2, 4])
+    for v in (0.5, 1.5, 3, 10):
+        h.observe(v)
+    assert (h.counts, h.quantile(0.5), h.quantile(1.0)) == ([1, 1, 1, 1], 2, 10)
+
+    devices = ingest_configs(SAMPLE_DIR).devices
+    metrics = SimMetrics()
+    stats = run_des_simulation(devices, build_from_devices(devices), duration_s=10.0, metrics=metrics)
+    summary = metrics.summary(stats, wall_s=1.0, sim_s=10.0)
+    assert summary['messages_handled'] == sum(s['recv'] for s in stats.values())
+    assert set(summary['handle_latency_s']) == {'HELLO', 'HELLO-ACK'}
+    assert summary['queue_depth']['count'] > 0
+
+    text = to_prometheus({'stages': {'parse': {'wall_s': 0.5, 'cpu_s': 0.25}}, 'simulation': summary})
+    assert 'vipnet_stage_wall_seconds{stage="parse"} 0.5' in text
+    assert f'vipnet_sim_handle_seconds_count{{type="HELLO"}} {summary["handle_latency_s"]["HELLO"]["count"]}' in text
+    assert 'vipnet_sim_queue_depth_bucket{le="+Inf"}' in text
@@ -0,0 +1,33 @@
+import csv
+import json
+from cisco_vip_network_tool.benchmarks.synth import generate
+from cisco_vip_network_tool.src.parsers.endpoints import load_endpoints
+from cisco_vip_network_tool.src.report.writer import ReportWriter, edge_label
+
+
+def test_endpoint_formats_load_identically(tmp_path):
+    loaded = []
+    for fmt in ('yaml', 'csv', 'jsonl'):
+        generate(str(tmp_path / fmt), routers=2, switches=2, vlans=3, endpoints=25, endpoint_format=fmt)
+        loaded.append(load_endpoints(str(tmp_path / fmt)))
+    assert len(loaded[0]) == 25
+    assert loaded[0] == loaded[1] == loaded[2]
+    assert load_endpoints(str(tmp_path)) == {}
+
+
+def test_report_writer_streams_jsonl_and_csv(tmp_path):
+    findings = [('mtu_mismatches', 'MTU mismatch A:x(1500) <-> B:y(1400)'), ('l2_loops', ['A:x', 'B:y', 'C:z'])]
+    edge = (('R1', 'Gi0/0'), ('R2', 'Gi0/0'))
+    for fmt in ('jsonl', 'csv'):
+        path = str(tmp_path / f'report.{fmt}')
+        with ReportWriter(path, fmt) as out:
+            assert out.write_findings(iter(findings), 'validate') == 2
+            out.write('load', edge_label(*edge), 1200)
+        assert out.counts == {'validate.mtu_mismatches': 1, 'validate.l2_loops': 1, 'load': 1}
+        with open(path, newline='') as fh:
+            rows = [json.loads(l) for l in fh] if fmt == 'jsonl' else list(csv.DictReader(fh))
+        assert [r['section'] for r in rows] == ['validate.mtu_mismatches', 'validate.l2_loops', 'load']
+        assert rows[2]['subject'] == 'R1:Gi0/0<->R2:Gi0/0'
+        assert str(rows[2]['value']) == '1200'
+        items = rows[1]['items'] if fmt == 'jsonl' else json.loads(rows[1]['detail'])['items']
+        assert items == ['A:x', 'B:y', 'C:z']
@@ -0,0 +1,89 @@
+import dataclasses
+from cisco_vip_network_tool.benchmarks.synth import generate
+from cisco_vip_network_tool.src.model.devices import Device, Interface
+from cisco_vip_network_tool.src.parsers.ingest import ingest_configs
+from cisco_vip_network_tool.src.topology.builder import build_from_devices
+from cisco_vip_network_tool.src.validation.rules import RULES, RuleCache, register, run_rules
+from cisco_vip_network_tool.src.validation.validators import CHECKS, config_issues_report
+
+
+def _bgp_pair():
+    r1 = Device(hostname='R1', type='router', interfaces={
+        'Gi0/0': Interface(name='Gi0/0', ip='10.0.12.1/30', description='LINK:R1:Gi0/0-R2:Gi0/0'),
+        'Gi0/1': Interface(name='Gi0/1', ip='10.0.13.1/30'),
+    }, routing={
+        'bgp': {'asn': '65001', 'neighbors': [{'neighbor': '10.0.12.2', 'asn': '65002'},
+                                              {'neighbor': '10.0.13.2', 'asn': '65003'},
+                                              {'neighbor': '192.0.2.1', 'asn': '64999'}]},
+        'ospf': {'process': '1', 'networks': [{'ip': '10.0.12.0', 'wildcard': '0.0.0.3', 'area': '0'},
+                                              {'ip': '10.9.0.0', 'wildcard': '0.0.255.255', 'area': '0'},
+                                              {'ip': '10.0.13.0', 'wildcard': 'bogus', 'area': '0'}]},
+    })
+    r2 = Device(hostname='R2', type='router', interfaces={'Gi0/0': Interface(name='Gi0/0', ip='10.0.12.2/30')},
+                routing={'bgp': {'asn': '65002', 'neighbors': []}})
+    r3 = Device(hostname='R3', type='router', interfaces={'Gi0/0': Interface(name='Gi0/0', ip='10.0.13.2/30')},
+                routing={'bgp': {'asn': '65030', 'neighbors': [{'neighbor': '10.0.13.1', 'asn': '65001'}]}})
+    return {'R1': r1, 'R2': r2, 'R3': r3}
+
+
+def test_bgp_symmetry_and_ospf_coverage_rules():
+    devices = _bgp_pair()
+    report = config_issues_report(devices, build_from_devices(devices))
+    assert list(report) == list(CHECKS)
+    # 192.0.2.1 is not in the inventory (an external peer), so it is not checked
+    assert report['bgp_neighbor_symmetry'] == [
+        'R1 neighbor 10.0.12.2 (R2): R2 has no neighbor statement for R1',
+        'R1 neighbor 10.0.13.2 (R3): remote-as 65003 but R3 is in AS 65030',
+    ]
+    assert report['ospf_network_coverage'] == [
+        'R1 OSPF network 10.0.13.0 bogus area 0 is malformed',
+        'R1 OSPF network 10.9.0.0 0.0.255.255 area 0 matches no interface',
+    ]
+
+
+def test_registered_rule_runs_in_scope_order_and_subset():
+    @register('test_no_description', 'device')
+    def _no_description(dev):
+        """Interfaces without a description."""
+        return [f"{dev.hostname}:{ifn}" for ifn, i in dev.interfaces.items() if not i.description]
+    try:
+        devices = _bgp_pair()
+        report = config_issues_report(devices, build_from_devices(devices), rules=['test_no_description', 'mtu_mismatches'])
+        assert report == {'test_no_description': ['R1:Gi0/1', 'R2:Gi0/0', 'R3:Gi0/0'], 'mtu_mismatches': []}
+        assert RULES['test_no_description'].description == 'Interfaces without a description.'
+    finally:
+        del RULES['test_no_description']
+
+
+def test_cache_rechecks_only_changed_devices(tmp_path):
+    generate(str(tmp_path), routers=6, switches=12, links_per_device=3, vlans=10, endpoints=0, seed=2)
+    devices = ingest_configs(str(tmp_path)).devices
+    topo = build_from_devices(devices)
+    plain = config_issues_report(devices, topo)
+    cache = RuleCache()
+    assert config_issues_report(devices, topo, cache=cache) == plain
+    assert (cache.hits, cache.misses) == (0, 18)
+    assert config_issues_report(devices, topo, cache=cache) == plain
+    assert (cache.hits, cache.misses) == (18, 18)
+
+    # One device gains an undefined access VLAN: only it is re-checked
+    host = sorted(h for h, d in devices.items() if d.type == 'switch')[0]
+    dev = devices[host]
+    ifn = next(iter(dev.interfaces))
+    changed = dataclasses.replace(dev, interfaces=dict(dev.interfaces))
+    changed.interfaces[ifn] = dataclasses.replace(dev.interfaces[ifn], vlan=999)
+    devices = dict(devices, **{host: changed})
+    topo.apply_device_update(dev, changed)
+    report = config_issues_report(devices, topo, cache=cache)
+    assert (cache.hits, cache.misses) == (35, 19)
+    assert report == config_issues_report(devices, topo)
+    assert f"{host}:{ifn} references VLAN 999 which is undefined on this device" in report['vlan_label_issues']
+
+
+def test_worker_pool_matches_in_process(tmp_path):
+    generate(str(tmp_path), routers=4, switches=8, links_per_device=3, vlans=8, endpoints=0, seed=3)
+    devices = ingest_configs(str(tmp_path)).devices
+    topo = build_from_devices(devices)
+    assert list(run_rules(devices, topo, workers=2, batch_size=4)) == list(run_rules(devices, topo))
+    once = list(run_rules(devices, topo, names=['mtu_mismatches', 'duplicate_ips']))
+    assert list(run_rules(devices, topo, names=['mtu_mismatches', 'duplicate_ips', 'mtu_mismatches'])) == once != []
@@ -0,0 +1,40 @@
+from cisco_vip_network_tool.src.model.devices import Device, Interface
+from cisco_vip_network_tool.src.model.link import Link
+from cisco_vip_network_tool.src.parsers.ingest import ingest_configs
+from cisco_vip_network_tool.src.topology.builder import Topology, build_from_devices
+from cisco_vip_network_tool.src.topology.partition import partition_devices
+from cisco_vip_network_tool.src.simulation.des import run_des_simulation
+from cisco_vip_network_tool.src.simulation.sharded import run_sharded_simulation
+from conftest import SAMPLE_DIR
+
+
+def _ring(n):
+    topo = Topology()
+    for i in range(n):
+        dev = Device(hostname=f'R{i:02d}', type='router')
+        dev.interfaces = {f'Gi0/{j}': Interface(name=f'Gi0/{j}') for j in range(2)}
+        topo.devices[dev.hostname] = dev
+        topo.add_device(dev)
+    for i in range(n):
+        topo.add_link(Link(f'R{i:02d}', 'Gi0/1', f'R{(i + 1) % n:02d}', 'Gi0/0'))
+    return topo
+
+
+def test_partition_is_balanced_with_minimal_ring_cut():
+    topo = _ring(40)
+    shard_of = partition_devices(topo, 4)
+    sizes = [list(shard_of.values()).count(s) for s in range(4)]
+    assert sizes == [10, 10, 10, 10]
+    cut = sum(1 for u, v in topo.graph.edges() if shard_of[u[0]] != shard_of[v[0]])
+    assert cut == 4
+
+
+def test_sharded_run_matches_single_process_des():
+    devices = ingest_configs(SAMPLE_DIR).devices
+    faults = [(3.5, 'R2-Gi0/1-SW1-Gi0/1')]
+    expected = run_des_simulation(devices, build_from_devices(devices), duration_s=6.0, faults=faults)
+    got = run_sharded_simulation(devices, build_from_devices(devices), duration_s=6.0, faults=faults, shards=2)
+    assert got == expected
+    topo = _ring(12)
+    assert run_sharded_simulation(topo.devices, topo, duration_s=3.0, shards=3) == \
+        run_des_simulation(topo.devices, topo, duration_s=3.0)
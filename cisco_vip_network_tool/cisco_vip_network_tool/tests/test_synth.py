@@ -0,0 +1,22 @@
+from cisco_vip_network_tool.benchmarks.synth import generate
+from cisco_vip_network_tool.src.parsers.endpoints import load_endpoints
+from cisco_vip_network_tool.src.parsers.ingest import ingest_configs
+from cisco_vip_network_tool.src.topology.builder import build_from_devices
+from cisco_vip_network_tool.src.validation.validators import config_issues_report
+from cisco_vip_network_tool.src.load.load_manager import compute_link_loads
+
+
+def test_synthetic_inventory_builds_cleanly(tmp_path):
+    info = generate(str(tmp_path), routers=5, switches=10, links_per_device=4, vlans=12, endpoints=60,
+                    mtu_mismatch=0.0)
+    devices = ingest_configs(str(tmp_path)).devices
+    assert len(devices) == 15
+    topo = build_from_devices(devices)
+    assert topo.graph.number_of_edges() == info['links'] == 5 + 5 + 20
+
+    report = config_issues_report(devices, topo)
+    assert not any(report[k] for k in ('duplicate_ips', 'gateway_issues', 'subnet_overlaps', 'mtu_mismatches'))
+    endpoints = load_endpoints(str(tmp_path))
+    assert len(endpoints) == 60
+    loads = compute_link_loads(topo, endpoints, peak=True)
+    assert sum(loads.values()) > 0
@@ -0,0 +1,94 @@
+import copy
+import pickle
+import threading
+import time
+from cisco_vip_network_tool.src.parsers.ingest import ingest_configs
+from cisco_vip_network_tool.src.topology.builder import build_from_devices
+from cisco_vip_network_tool.src.topology.ifnames import canonical_ifname, InterfaceIndex
+from conftest import SAMPLE_DIR
+
+R1_R2 = (('R1', 'GigabitEthernet0/0'), ('R2', 'GigabitEthernet0/0'))
+
+
+def _edges(topo):
+    return {tuple(sorted((u, v))): (d['mtu'], d['bandwidth_kbps'], d['up']) for u, v, d in topo.graph.edges(data=True)}
+
+
+def test_interface_name_normalization():
+    assert canonical_ifname('Gi0/0.100') == 'GigabitEthernet0/0.100'
+    assert canonical_ifname('Po12') == 'Port-channel12'
+    index = InterfaceIndex(['GigabitEthernet0/1', 'TenGigabitEthernet1/1'])
+    assert index.resolve('gi0/1') == 'GigabitEthernet0/1'
+    assert index.resolve('Te1/1') == 'TenGigabitEthernet1/1'
+    assert index.resolve('Gi0/2') is None
+
+
+def test_apply_device_update_matches_full_rebuild():
+    devices = ingest_configs(SAMPLE_DIR).devices
+    topo = build_from_devices(devices)
+    assert topo.graph.edges[R1_R2]['mtu'] == 1400
+    topo.set_link_state(*R1_R2, False)
+
+    new_r2 = copy.deepcopy(devices['R2'])
+    new_r2.interfaces['GigabitEthernet0/0'].mtu = 1500
+    topo.apply_device_update(devices['R2'], new_r2)
+    assert topo.graph.edges[R1_R2]['mtu'] == 1500
+    assert topo.graph.edges[R1_R2]['up'] is False
+
+    topo.apply_device_update(devices['SW1'], None)
+    rebuilt = build_from_devices({'R1': devices['R1'], 'R2': new_r2})
+    rebuilt.set_link_state(*R1_R2, False)
+    assert _edges(topo) == _edges(rebuilt)
+    assert ('SW1', 'GigabitEthernet0/1') not in topo.graph
+
+    topo.apply_device_update(None, devices['SW1'])
+    assert topo.graph.has_edge(('R2', 'GigabitEthernet0/1'), ('SW1', 'GigabitEthernet0/1'))
+
+
+def test_port_table_tracks_link_state_and_updates():
+    devices = ingest_configs(SAMPLE_DIR).devices
+    topo = build_from_devices(devices)
+    peers = {(p.local_if, p.peer) for p in topo.ports('R2')}
+    assert peers == {('GigabitEthernet0/0', R1_R2[0]), ('GigabitEthernet0/1', ('SW1', 'GigabitEthernet0/1'))}
+    assert topo.port('R1', 'GigabitEthernet0/0', R1_R2[1]).mtu == 1400
+
+    topo.set_link_state(*R1_R2, False)
+    assert topo.port('R2', 'GigabitEthernet0/0', R1_R2[0]).up is False
+
+    new_r2 = copy.deepcopy(devices['R2'])
+    new_r2.interfaces['GigabitEthernet0/0'].mtu = 1500
+    topo.apply_device_update(devices['R2'], new_r2)
+    port = topo.port('R1', 'GigabitEthernet0/0', R1_R2[1])
+    assert (port.mtu, port.up) == (1500, False)
+
+
+def test_port_tables_are_built_once_under_concurrent_first_use():
+    topo = build_from_devices(ingest_configs(SAMPLE_DIR).devices)
+    builds = []
+    tables = topo._port_tables
+
+    def slow_tables():
+        builds.append(1)
+        time.sleep(0.05)                # widen the window between the two published tables
+        return tables()
+
+    topo._port_tables = slow_tables
+    start = threading.Barrier(8)
+    seen = []
+
+    def first_use():
+        start.wait()
+        seen.append(topo.port('R1', 'GigabitEthernet0/0', R1_R2[1]))
+
+    threads = [threading.Thread(target=first_use) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(builds) == 1 and seen[0] is not None and all(p is seen[0] for p in seen)
+    topo.set_link_state(*R1_R2, False)
+    assert seen[0].up is False
+
+    del topo._port_tables
+    clone = pickle.loads(pickle.dumps(topo))
+    assert clone.port('R1', 'GigabitEthernet0/0', R1_R2[1]).up is False
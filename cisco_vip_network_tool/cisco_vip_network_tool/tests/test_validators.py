@@ -0,0 +1,80 @@
+from cisco_vip_network_tool.src.model.devices import Device, Interface
+from cisco_vip_network_tool.src.validation.addr_index import AddressIndex
+from cisco_vip_network_tool.src.topology.builder import build_from_devices
+from cisco_vip_network_tool.src.validation.validators import (
+    find_duplicate_ips, check_wrong_gateways, find_overlapping_subnets, check_address_format, detect_layer2_loops)
+
+
+def _devices():
+    r1 = Device(hostname='R1', type='router', interfaces={
+        'Gi0/0': Interface(name='Gi0/0', ip='10.0.12.1/24'),
+        'Vlan10': Interface(name='Vlan10', ip='192.168.10.1/24'),
+        'Lo0': Interface(name='Lo0', ip='10.1.0.1/16'),
+    }, default_gateways={10: '192.168.10.254', 20: '10.0.0.1'})
+    r2 = Device(hostname='R2', type='router', interfaces={
+        'Gi0/0': Interface(name='Gi0/0', ip='10.0.12.2/24'),
+        'Gi0/1': Interface(name='Gi0/1', ip='10.1.5.1/24'),
+        'Gi0/2': Interface(name='Gi0/2', ip='10.0.12.1/24'),
+        'Gi0/3': Interface(name='Gi0/3', ip='bogus'),
+        'Vlan30': Interface(name='Vlan30', ip='172.16.0.1/24'),
+    }, default_gateways={30: '172.16.1.1'})
+    return {'R1': r1, 'R2': r2}
+
+
+def test_address_index_checks():
+    devices = _devices()
+    index = AddressIndex.from_devices(devices)
+    assert find_duplicate_ips(devices, index) == [('10.0.12.1', 'R1:Gi0/0', 'R2:Gi0/2')]
+    assert check_wrong_gateways(devices, index) == [
+        'R1 sets default-gw for VLAN 20 but has no SVI',
+        'R2 gateway 172.16.1.1 not in VLAN30 subnet 172.16.0.0/24',
+    ]
+    assert find_overlapping_subnets(devices, index) == ['10.1.0.0/16 (R1:Lo0) overlaps 10.1.5.0/24 (R2:Gi0/1)']
+    assert check_address_format(devices, index) == ['R2:Gi0/3 has invalid address bogus']
+    assert [index.owner(e) for e in index.lookup('10.1.5.9')] == ['R2:Gi0/1']
+    assert [index.owner(e) for e in index.lookup('10.1.200.9')] == ['R1:Lo0']
+
+
+def _l2_topology():
+    """SW1-SW2-SW3 triangle of unrestricted trunks, a VLAN 20-only trunk pair SW3=SW4, an
+    access-VLAN-10 chain SW4-SW5-SW1 and a routed R1 attached twice (no L2 loop)."""
+    def sw(name, ports):
+        ifs = {}
+        for ifn, peer, kind in ports:
+            iface = Interface(name=ifn, description=f"LINK:{name}:{ifn}-{peer}")
+            if kind == 'trunk':
+                iface.mode = 'trunk'
+            elif kind == 'trunk20':
+                iface.mode, iface.trunk_vlans = 'trunk', [20]
+            elif kind == 'ip':
+                iface.ip = f"10.0.{len(ifs)}.1/30"
+            else:
+                iface.vlan = kind
+            ifs[ifn] = iface
+        return Device(hostname=name, type='router' if name.startswith('R') else 'switch', interfaces=ifs)
+    return build_from_devices({
+        'SW1': sw('SW1', [('Gi1', 'SW2:Gi1', 'trunk'), ('Gi2', 'SW3:Gi1', 'trunk'), ('Gi3', 'SW5:Gi2', 10),
+                          ('Gi4', 'R1:Gi1', 'trunk')]),
+        'SW2': sw('SW2', [('Gi1', 'SW1:Gi1', 'trunk'), ('Gi2', 'SW3:Gi2', 'trunk'), ('Gi3', 'R1:Gi2', 'trunk')]),
+        'SW3': sw('SW3', [('Gi1', 'SW1:Gi2', 'trunk'), ('Gi2', 'SW2:Gi2', 'trunk'), ('Gi3', 'SW4:Gi1', 'trunk20'),
+                          ('Gi4', 'SW4:Gi2', 'trunk20')]),
+        'SW4': sw('SW4', [('Gi1', 'SW3:Gi3', 'trunk20'), ('Gi2', 'SW3:Gi4', 'trunk'), ('Gi3', 'SW5:Gi1', 10)]),
+        'SW5': sw('SW5', [('Gi1', 'SW4:Gi3', 10), ('Gi2', 'SW1:Gi3', 10)]),
+        'R1': sw('R1', [('Gi1', 'SW1:Gi4', 'ip'), ('Gi2', 'SW2:Gi3', 'ip')]),
+    })
+
+
+def test_vlan_aware_l2_loops():
+    topo = _l2_topology()
+    loops = {s['vlan']: s for s in detect_layer2_loops(topo)}
+    assert set(loops) == {'all', 20}
+    assert loops['all']['loop_links'] == 1
+    cycle = loops['all']['witnesses'][0]
+    assert len(cycle) == 4 and cycle[0] == cycle[-1] and set(cycle) == {'SW1', 'SW2', 'SW3'}
+    # Parallel VLAN 20 trunks SW3=SW4; VLAN 10 runs SW1-SW5-SW4 but SW4 only reaches the
+    # triangle over VLAN 20, so VLAN 10 has no loop
+    assert loops[20]['loop_links'] == 1
+    cycle = loops[20]['witnesses'][0]
+    assert len(cycle) == 3 and cycle[0] == cycle[-1] and set(cycle) == {'SW3', 'SW4'}
+    topo.set_link_state(('SW3', 'Gi3'), ('SW4', 'Gi1'), False)
+    assert [s['vlan'] for s in detect_layer2_loops(topo, max_witnesses=0)] == ['all']
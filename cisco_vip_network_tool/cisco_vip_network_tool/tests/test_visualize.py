@@ -0,0 +1,42 @@
+import json
+from cisco_vip_network_tool.benchmarks.synth import generate
+from cisco_vip_network_tool.src.parsers.ingest import ingest_configs
+from cisco_vip_network_tool.src.topology.builder import build_from_devices
+from cisco_vip_network_tool.src.visualize.layout import collapse, hierarchical_layout, layout_cache_path, tiers
+from cisco_vip_network_tool.src.visualize.web import link_color, render_topology
+
+
+def test_collapse_and_hierarchical_layout(tmp_path):
+    generate(str(tmp_path), routers=3, switches=6, vlans=0, endpoints=0)
+    topo = build_from_devices(ingest_configs(str(tmp_path)).devices)
+    a, b = next((a, b) for a, b in topo.graph.edges() if a[0].startswith('SW'))
+    topo.set_link_state(a, b, False)
+    nodes, links = collapse(topo)
+    assert len(nodes) == 9 and len(links) == 3 + 12
+    key = tuple(sorted((a[0], b[0])))
+    assert links[key]['down'] == 1 and link_color(links[key]) == ('#9e9e9e', True)
+    t = tiers(nodes, links)
+    assert {t[h] for h in nodes if h.startswith('R')} == {0} and {t[h] for h in nodes if h.startswith('SW')} == {1}
+    pos = hierarchical_layout(nodes, links)
+    assert len(set(pos.values())) == 9
+    assert all(pos[h][1] > pos['R1'][1] for h in nodes if h.startswith('SW'))
+
+
+def test_layout_cache_keeps_positions(tmp_path):
+    conf, cache = tmp_path / 'conf', str(tmp_path / 'layout.json')
+    gen = generate(str(conf), routers=4, switches=40, vlans=0, endpoints=0)
+    devices = ingest_configs(str(conf)).devices
+    out = str(tmp_path / 'topo.html')
+    info = render_topology(build_from_devices(devices), out, 'html', layout_cache=cache)
+    assert (info['devices'], info['links']) == (44, gen['links'])
+    html = open(out).read()
+    assert 'class="overview"' in html and html.count('<circle') >= 40
+    first = json.load(open(cache))['positions']
+
+    del devices['SW3']
+    render_topology(build_from_devices(devices), str(tmp_path / 'topo.svg'), 'svg', layout_cache=cache)
+    second = json.load(open(cache))['positions']
+    assert 'SW3' not in second and all(second[h] == first[h] for h in second)
+    # The default cache is per configs directory, never shared between inventories
+    assert layout_cache_path(str(conf), str(tmp_path)) != layout_cache_path(str(tmp_path / 'other'), str(tmp_path))
+    assert layout_cache_path(str(conf), str(tmp_path)).startswith(str(tmp_path))